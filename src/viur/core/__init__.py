@@ -222,6 +222,7 @@ def __build_app(modules: ModuleType | object, renderers: ModuleType | object, de
 
     conf.main_resolver = resolver
     conf.main_app = index
+    request.compile_routes(resolver)
 
 
 def setup(modules:  ModuleType | object, render:  ModuleType | object = None, default: str = "html"):
@@ -1,5 +1,9 @@
 import logging
 import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import timedelta
 from functools import wraps
 from hashlib import sha512
@@ -20,6 +24,14 @@ from viur.core.config import conf
         - A Datastore entity that has been accessed using db.Get() from within the cached function has been modified
         - The wrapped function has run a query over a kind in which an entity has been added/edited/deleted
 
+    Cached responses are additionally held in an in-process cache tier (see :class:`CacheBackend`), so a cache hit
+    usually doesn't require a datastore round-trip.
+
+    Invalidation by key or kind works with generation counters stored in the datastore: Every cache entry records the
+    generations of all keys and kinds it accessed, and flushing a key or kind just increments its counter. Instances
+    re-check the counters they know at most once per `conf.cache_generation_check_interval`, so a hit of the
+    in-process tier usually doesn't require any datastore access at all. Stale entries are removed periodically.
+
     ..Warning: As this cache is intended to be used with exposed functions, it will not only store the result of the
         wrapped function, but will also store and restore the Content-Type http header. This can cause unexpected
         behaviour if it's used to cache the result of non top-level functions, as calls to these functions now may
@@ -27,6 +39,269 @@ from viur.core.config import conf
 """
 
 viurCacheName = "viur-cache"
+viurCacheGenerationName = "viur-cache-generation"
+
+
+class CacheBackend:
+    """
+        Interface for an in-process cache tier that is consulted by :meth:`enableCache` before the
+        "viur-cache" kind is read from the datastore.
+
+        Custom implementations can be plugged in by setting `conf.cache_backend`.
+    """
+
+    def get(self, key: str) -> dict[str, t.Any] | None:
+        """
+            Returns the entry stored under *key*, or None if it doesn't exist or has expired.
+        """
+        raise NotImplementedError()
+
+    def set(self, key: str, entry: dict[str, t.Any]) -> None:
+        """
+            Stores *entry* under *key*.
+        """
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        """
+            Removes the entry stored under *key*, if any.
+        """
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        """
+            Removes all entries from this cache tier.
+        """
+        raise NotImplementedError()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+        Size-bounded LRU cache held in the memory of the current instance.
+
+        :param max_size: Maximum accumulated size of all entries in bytes. Least recently used entries are evicted
+            when it is exceeded.
+        :param ttl: Maximum time in seconds an entry is held.
+    """
+
+    def __init__(self, max_size: int, ttl: float | int | timedelta):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = utils.parse.timedelta(ttl).total_seconds()
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[float, int, dict[str, t.Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def sizeof(entry: dict[str, t.Any]) -> int:
+        """
+            Estimates the size of *entry* in bytes; the response data dominates this by far.
+        """
+        data = entry.get("data")
+        if isinstance(data, (str, bytes)):
+            return len(data) + 256
+
+        return sys.getsizeof(data) + 256
+
+    def get(self, key: str) -> dict[str, t.Any] | None:
+        with self._lock:
+            if not (item := self._entries.get(key)):
+                return None
+
+            expires, size, entry = item
+            if expires < time.monotonic():
+                del self._entries[key]
+                self.size -= size
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: dict[str, t.Any]) -> None:
+        size = self.sizeof(entry)
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            if old := self._entries.pop(key, None):
+                self.size -= old[1]
+
+            self._entries[key] = (time.monotonic() + self.ttl, size, entry)
+            self.size += size
+
+            while self.size > self.max_size:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if old := self._entries.pop(key, None):
+                self.size -= old[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class GenerationCache:
+    """
+        Generation counters stored as entities of *kind* in the datastore, which allow to detect whether
+        data held by an instance has been invalidated by another instance.
+
+        The values of the counters are held in memory and only re-fetched from the datastore (with one multi-key
+        lookup) when they are older than `conf.cache_generation_check_interval`. So every counter used costs
+        at most one lookup per instance and interval.
+
+        :param kind: Kind of the counter entities.
+        :param max_size: Maximum number of counter values held in memory; The least recently used ones are dropped.
+    """
+
+    def __init__(self, kind: str, max_size: int = 10_000):
+        super().__init__()
+        self.kind = kind
+        self.max_size = max_size
+        self._values: OrderedDict[str, tuple[int, float]] = OrderedDict()  # name -> (generation, time of retrieval)
+        self._lock = threading.Lock()
+
+    def get(self, names: t.Iterable[str]) -> dict[str, int]:
+        """
+            Returns the current value of the generation counters *names*.
+        """
+        now = time.monotonic()
+        interval = utils.parse.timedelta(conf.cache_generation_check_interval).total_seconds()
+        res = {}
+        missing = []
+
+        with self._lock:
+            for name in names:
+                if (known := self._values.get(name)) and now - known[1] < interval:
+                    res[name] = known[0]
+                    self._values.move_to_end(name)
+                else:
+                    missing.append(name)
+
+        if missing:
+            entities = db.Get([db.Key(self.kind, name) for name in missing])
+
+            with self._lock:
+                for name, entity in zip(missing, entities):
+                    res[name] = entity["generation"] if entity else 0
+                    self._values[name] = (res[name], now)
+                    self._values.move_to_end(name)
+
+                while len(self._values) > self.max_size:
+                    self._values.popitem(last=False)
+
+        return res
+
+    def increment(self, names: list[str]) -> None:
+        """
+            Increments the generation counters *names* in one transaction.
+            Anything that recorded an older value of one of these counters is stale from now on.
+        """
+        def txn():
+            keys = [db.Key(self.kind, name) for name in names]
+            entities = [entity or db.Entity(key) for key, entity in zip(keys, db.Get(keys))]
+
+            for entity in entities:
+                entity["generation"] = (entity.get("generation") or 0) + 1
+                entity["changedate"] = utils.utcNow()
+
+            db.Put(entities)
+
+        db.RunInTransaction(txn)
+
+        # The current instance doesn't need to wait for the next generation check
+        with self._lock:
+            for name in names:
+                self._values.pop(name, None)
+
+    def __len__(self):
+        return len(self._values)
+
+
+_memory_backend: CacheBackend | None = None
+_generations = GenerationCache(viurCacheGenerationName)
+_global_generation: int | None = None
+
+GLOBAL_GENERATION = "__global__"
+"""Name of the generation counter that is incremented by path-based flushes to drop all in-process entries."""
+
+
+def get_backend() -> CacheBackend | None:
+    """
+        Returns the in-process cache tier, which is either `conf.cache_backend` or a lazily created
+        :class:`MemoryCacheBackend`. Returns None when the in-process cache tier is disabled.
+    """
+    global _memory_backend
+
+    if conf.cache_backend is not None:
+        return conf.cache_backend
+
+    if not conf.cache_memory_max_size:
+        return None
+
+    if _memory_backend is None:
+        _memory_backend = MemoryCacheBackend(conf.cache_memory_max_size, conf.cache_memory_ttl)
+
+    return _memory_backend
+
+
+def generation_name(entry: db.Key | str) -> str:
+    """
+        Returns the name of the generation counter for an entry of the data access log,
+        which is either a key or the name of a kind a query has been run on.
+    """
+    if isinstance(entry, db.Key):
+        return f"key:{entry}"
+
+    return f"kind:{entry}"
+
+
+def get_generations(names: t.Iterable[str]) -> dict[str, int]:
+    """
+        Returns the current value of the generation counters *names* of the cache.
+
+        .. seealso:: :meth:`GenerationCache.get`
+    """
+    return _generations.get(names)
+
+
+def _increment_generations(names: list[str]) -> None:
+    """
+        Increments the generation counters *names* of the cache in one transaction.
+        Any cache entry that recorded an older value of one of these counters is stale from now on.
+    """
+    _generations.increment(names)
+
+
+def _check_global_generation() -> None:
+    """
+        Drops the in-process cache tier when another instance has run a path-based flush in the meantime.
+    """
+    global _global_generation
+
+    generation = get_generations((GLOBAL_GENERATION,))[GLOBAL_GENERATION]
+    if generation != _global_generation:
+        if _global_generation is not None and (backend := get_backend()):
+            logging.debug(f"Global cache generation changed to {generation}, dropping in-process cache")
+            backend.clear()
+
+        _global_generation = generation
+
+
+def _is_current(entry: dict[str, t.Any]) -> bool:
+    """
+        Checks if none of the generation counters recorded by a cache entry has been incremented since.
+    """
+    if not (generations := entry.get("generations")):
+        return generations is not None  # entries from before generations were recorded are stale
+
+    return get_generations(generations.keys()) == dict(generations)
 
 
 def keyFromArgs(f: t.Callable, userSensitive: int, languageSensitive: bool, evaluatedArgs: list[str], path: str,
@@ -142,30 +417,70 @@ def wrapCallable(f, urls: list[str], userSensitive: int, languageSensitive: bool
             # Something is wrong (possibly the parameter-count)
             # Let's call f, but we knew already that this will clash
             return f(self, *args, **kwargs)
+        if backend := get_backend():
+            _check_global_generation()
+            if (entry := backend.get(key)) is not None:
+                if (
+                        (not maxCacheTime or entry["creationtime"] > utils.utcNow()
+                         - utils.parse.timedelta(maxCacheTime))
+                        and _is_current(entry)
+                ):
+                    logging.debug("This request was served from in-process cache.")
+                    currReq.response.headers['Content-Type'] = entry["content-type"]
+                    return entry["data"]
+
+                backend.delete(key)
+
         dbRes = db.Get(db.Key(viurCacheName, key))
         if dbRes is not None:
             if (
-                    not maxCacheTime or dbRes["creationtime"] > utils.utcNow()
-                    - utils.parse.timedelta(maxCacheTime)
+                    (not maxCacheTime or dbRes["creationtime"] > utils.utcNow()
+                     - utils.parse.timedelta(maxCacheTime))
+                    and _is_current(dbRes)
             ):
                 # We store it unlimited or the cache is fresh enough
                 logging.debug("This request was served from cache.")
+                if backend:
+                    backend.set(key, {
+                        "data": dbRes["data"],
+                        "creationtime": dbRes["creationtime"],
+                        "content-type": dbRes["content-type"],
+                        "generations": dict(dbRes["generations"]),
+                    })
+
                 currReq.response.headers['Content-Type'] = dbRes["content-type"]
                 return dbRes["data"]
         # If we made it this far, the request wasn't cached or too old; we need to rebuild it
         oldAccessLog = db.startDataAccessLog()
         try:
             res = f(self, *args, **kwargs)
+            if isinstance(res, t.Iterator):  # Streamed responses can't be cached, consume them at once
+                res = b"".join(res)
         finally:
             accessedEntries = db.endDataAccessLog(oldAccessLog)
+        # Don't depend on our own bookkeeping kinds, which are logged in case of nested cached functions
+        accessedEntries = [
+            entry for entry in accessedEntries
+            if not (isinstance(entry, db.Key) and entry.kind.startswith(viurCacheName))
+        ]
+        generations = get_generations([generation_name(entry) for entry in accessedEntries])
         dbEntity = db.Entity(db.Key(viurCacheName, key))
         dbEntity["data"] = res
         dbEntity["creationtime"] = utils.utcNow()
         dbEntity["path"] = path
         dbEntity["content-type"] = currReq.response.headers['Content-Type']
-        dbEntity["accessedEntries"] = list(accessedEntries)
-        dbEntity.exclude_from_indexes = {"data", "content-type"}  # save two DB-writes.
+        dbEntity["accessedEntries"] = accessedEntries
+        dbEntity["generations"] = generations
+        dbEntity.exclude_from_indexes = {"data", "content-type", "generations"}  # save some DB-writes.
         db.Put(dbEntity)
+        if backend:
+            backend.set(key, {
+                "data": res,
+                "creationtime": dbEntity["creationtime"],
+                "content-type": dbEntity["content-type"],
+                "generations": generations,
+            })
+
         logging.debug("This request was a cache-miss. Cache has been updated.")
         return res
 
@@ -219,6 +534,9 @@ def flushCache(prefix: str = None, key: db.Key | None = None, kind:  str | None
         the path-prefix. The path is equal to the url that caused it to be cached (eg /page/view) and must be one
         listed in the 'url' param of :meth:`viur.core.cache.enableCache`.
 
+        Flushing by *key* or *kind* just increments the related generation counters, which renders every
+        cache entry that depends on them stale. Stale entries are removed later on by :func:`start_purge_cache`.
+
         :param prefix: Path or prefix that should be flushed.
         :param key: Flush all cache entries which may contain this key. Also flushes entries
             which executed a query over that kind.
@@ -232,33 +550,102 @@ def flushCache(prefix: str = None, key: db.Key | None = None, kind:  str | None
     if prefix is None and key is None and kind is None:
         prefix = "/*"
     if prefix is not None:
+        _increment_generations([GLOBAL_GENERATION])
         items = db.Query(viurCacheName).filter("path =", prefix.rstrip("*")).iter()
-        for item in items:
-            db.Delete(item)
+        db.delete_multi(item.key for item in items)
         if prefix.endswith("*"):
             items = db.Query(viurCacheName) \
                 .filter("path >", prefix.rstrip("*")) \
                 .filter("path <", prefix.rstrip("*") + u"\ufffd") \
                 .iter()
-            for item in items:
-                db.Delete(item)
+            db.delete_multi(item.key for item in items)
         logging.debug(f"Flushing cache succeeded. Everything matching {prefix=} is gone.")
+
+    names = []
     if key is not None:
-        items = db.Query(viurCacheName).filter("accessedEntries =", key).iter()
-        for item in items:
-            logging.info(f"""Deleted cache entry {item["path"]!r}""")
-            db.Delete(item.key)
         if not isinstance(key, db.Key):
             key = db.Key.from_legacy_urlsafe(key)  # hopefully is a string
-        items = db.Query(viurCacheName).filter("accessedEntries =", key.kind).iter()
-        for item in items:
-            logging.info(f"""Deleted cache entry {item["path"]!r}""")
-            db.Delete(item.key)
+        names += [generation_name(key), generation_name(key.kind)]
     if kind is not None:
-        items = db.Query(viurCacheName).filter("accessedEntries =", kind).iter()
-        for item in items:
-            logging.info(f"""Deleted cache entry {item["path"]!r}""")
-            db.Delete(item.key)
+        names.append(generation_name(kind))
+    if names:
+        _increment_generations(names)
+        logging.debug(f"Flushing cache succeeded. Incremented generations {names!r}")
+
+
+class PurgeCacheIter(tasks.QueryIter):
+    """
+        Removes cache entries which are stale, because a generation counter they depend on has been incremented.
+
+        Afterward, the generation counters which haven't been incremented for `conf.cache_generation_retention`
+        before the purge has been started are removed by :class:`PurgeGenerationsIter`.
+        Removing a counter resets it to 0, so this is only safe when all entries that recorded an older value
+        are gone. The start time of the purge is passed as *customData*.
+    """
+    batchSize = 100
+
+    @classmethod
+    def handleBatch(cls, entries: list, customData) -> bool:
+        # Fetch all generations involved at once, _is_current() then works on the known values
+        get_generations({name for entry in entries for name in (entry.get("generations") or ())})
+        db.delete_multi([entry.key for entry in entries if not _is_current(entry)])
+        return True
+
+    @classmethod
+    def handleEntry(cls, entry, customData):
+        if not _is_current(entry):
+            db.Delete(entry.key)
+
+    @classmethod
+    def handleFinish(cls, totalCount: int, customData):
+        super().handleFinish(totalCount, customData)
+
+        if not customData:  # started without a start time
+            return
+
+        # Entries might have recorded an outdated counter until they expired from the in-process tiers,
+        # or until the instances re-checked the counter
+        retention = max(
+            utils.parse.timedelta(conf.cache_generation_retention),
+            utils.parse.timedelta(conf.cache_memory_ttl)
+            + utils.parse.timedelta(conf.cache_generation_check_interval),
+        )
+        cutoff = customData - retention
+
+        PurgeGenerationsIter.startIterOnQuery(db.Query(viurCacheGenerationName).filter("changedate <", cutoff), cutoff)
+
+
+class PurgeGenerationsIter(tasks.QueryIter):
+    """
+        Removes generation counters which haven't been incremented since the date passed as *customData*.
+
+        The changedate is checked again within a transaction, so a counter incremented in the meantime is kept.
+    """
+    batchSize = 100
+
+    @classmethod
+    def handleBatch(cls, entries: list, customData) -> bool:
+        def txn():
+            keys = [entry.key for entry in entries]
+            db.Delete([
+                entity.key for entity in db.Get(keys)
+                if entity and entity["changedate"] < customData
+            ])
+
+        db.RunInTransaction(txn)
+        return True
+
+    @classmethod
+    def handleEntry(cls, entry, customData):
+        cls.handleBatch([entry], customData)
+
+
+@tasks.PeriodicTask(interval=timedelta(hours=4))
+def start_purge_cache():
+    """
+        Starts the removal of stale cache entries, followed by the removal of outdated generation counters.
+    """
+    PurgeCacheIter.startIterOnQuery(db.Query(viurCacheName), utils.utcNow())
 
 
-__all__ = ["enableCache", "flushCache"]
+__all__ = ["CacheBackend", "MemoryCacheBackend", "enableCache", "flushCache"]
@@ -13,10 +13,13 @@ from viur.core.version import __version__
 from viur.core.current import user as current_user
 
 if t.TYPE_CHECKING:  # pragma: no cover
+    from viur.core.cache import CacheBackend
     from viur.core.bones.text import HtmlBoneConfiguration
     from viur.core.email import EmailTransport
     from viur.core.skeleton import SkeletonInstance
     from viur.core.module import Module
+    from viur.core.ratelimit import RateLimitBackend
+    from viur.core.session import SessionBackend
     from viur.core.tasks import CustomEnvironmentHandler
     from viur.core import i18n
 
@@ -50,6 +53,9 @@ class ConfigType:
     _parent = None
     """Parent config instance"""
 
+    _resolved_paths = None
+    """Cache of keys in dot-notation already resolved by :meth:`_resolve_path`"""
+
     def __init__(self, *,
                  strict_mode: bool = None,
                  parent: t.Union["ConfigType", None] = None):
@@ -93,20 +99,56 @@ class ConfigType:
             raise TypeError(f"Invalid {value=} for strict mode!")
         self._strict_mode = value
 
+    def _map_key(self, key: str) -> str:
+        """Map an old dict-key to the new attribute name, without any warning.
+
+        It can be overwritten to apply additional mapping.
+        """
+        return self._mapping.get(key, key)
+
     def _resolve_mapping(self, key: str) -> str:
         """Resolve the mapping old dict -> new attribute.
 
         This method must not be called in strict mode!
-        It can be overwritten to apply additional mapping.
         """
-        if key in self._mapping:
-            old, key = key, self._mapping[key]
+        if (new_key := self._map_key(key)) != key:
             warnings.warn(
-                f"Conf member {self._path}{old} is now {self._path}{key}!",
+                f"Conf member {self._path}{key} is now {self._path}{new_key}!",
                 DeprecationWarning,
                 stacklevel=3,
             )
-        return key
+        return new_key
+
+    def _resolve_path(self, key: str) -> tuple[str, ...]:
+        """Resolve an old dict-key in dot-notation into the names of the attributes to walk.
+
+        The mapping of all nested configs is applied. Resolved keys are cached,
+        setting an attribute of this config or one of its children invalidates the cache.
+        """
+        if self._resolved_paths is not None and (path := self._resolved_paths.get(key)):
+            return path
+
+        first, *remaining = self._map_key(key).split(".", 1)
+        path = (first,)
+        if remaining:
+            if isinstance(child := super().__getattribute__(first), ConfigType):
+                path += child._resolve_path(remaining[0])
+            else:
+                path += (remaining[0],)
+
+        if self._resolved_paths is None:
+            super().__setattr__("_resolved_paths", {})
+
+        self._resolved_paths[key] = path
+        return path
+
+    def _invalidate_paths(self) -> None:
+        """Drop the cache of resolved keys of this config and all its parents."""
+        config = self
+        while config is not None:
+            if config._resolved_paths:
+                config._resolved_paths.clear()
+            config = config._parent
 
     def items(self,
               full_path: bool = False,
@@ -153,7 +195,7 @@ class ConfigType:
 
         Not allowed in strict mode.
         """
-        new_path = f"{self._path}{self._resolve_mapping(key)}"
+        new_path = f"{self._path}{self._map_key(key)}"
         warnings.warn(f"conf uses now attributes! "
                       f"Use conf.{new_path} to access your option",
                       DeprecationWarning,
@@ -181,14 +223,21 @@ class ConfigType:
                 f" attribute '{key}' (strict mode is enabled)"
             )
 
-        key = self._resolve_mapping(key)
+        # Resolved keys are cached, so the deprecation is only reported once per key
+        if self._resolved_paths is None or not (path := self._resolved_paths.get(key)):
+            path = self._resolve_path(key)
+            if (new_key := ".".join(path)) != key:
+                warnings.warn(
+                    f"Conf member {self._path}{key} is now {self._path}{new_key}!",
+                    DeprecationWarning,
+                    stacklevel=2,
+                )
 
-        # Got an old dict-key and resolve the segment to the first dot (.) as attribute.
-        if "." in key:
-            first, remaining = key.split(".", 1)
-            return getattr(getattr(self, first), remaining)
+        value = super().__getattribute__(path[0])
+        for name in path[1:]:
+            value = getattr(value, name)
 
-        return super().__getattribute__(key)
+        return value
 
     def __setitem__(self, key: str, value: t.Any) -> None:
         """Support the old dict-like syntax (setter).
@@ -232,6 +281,8 @@ class ConfigType:
         In strict mode it does nothing except a super call
         for the default object behavior.
         """
+        self._invalidate_paths()
+
         if self.strict_mode:
             return super().__setattr__(key, value)
 
@@ -416,6 +467,17 @@ class Security(ConfigType):
     password_recovery_key_length: int = 42
     """Length of the Password recovery key"""
 
+    ratelimit_backend: t.Optional["RateLimitBackend"] = None
+    """Storage of the hits counted by RateLimits; If not set, they're counted in the datastore.
+    See :class:`viur.core.ratelimit.MemoryRateLimitBackend` for counting them in memory instead."""
+
+    skey_stateless: bool = False
+    """Issue security keys without custom data as HMAC signatures over the session, their expiry and a nonce,
+    instead of storing every key in the datastore"""
+
+    skey_replay_cache_size: int = 10_000
+    """Number of redeemed stateless security keys each instance remembers to reject their reuse; 0 disables it"""
+
     closed_system: bool = False
     """If `True` it activates a mode in which only authenticated users can access all routes."""
 
@@ -677,6 +739,20 @@ class User(ConfigType):
     session_life_time: int = 60 * 60
     """Default is 60 minutes lifetime for ViUR sessions"""
 
+    session_backend: t.Optional["SessionBackend"] = None
+    """Storage of the sessions; If not set, sessions are stored in the datastore.
+    See :class:`viur.core.session.TieredSessionBackend` for holding sessions in a cache tier in front of it."""
+
+    session_stateless: bool = False
+    """Keep the sessions of guests in a signed cookie instead of the session backend, as long as they fit into
+    `session_stateless_max_size` and can be serialized as JSON. Such sessions can't be invalidated server-side."""
+
+    session_stateless_max_size: int = 3072
+    """Maximum size in bytes of the cookie value of a stateless session"""
+
+    session_stateless_encrypt: bool = False
+    """Encrypt stateless sessions, instead of only signing them; Requires the `cryptography` package"""
+
     session_persistent_fields_on_login: Multiple[str] = ["language"]
     """If set, these Fields will survive the session.reset() called on user/login"""
 
@@ -814,6 +890,23 @@ class Conf(ConfigType):
     """If set, this function will be called for each cache-attempt
     and the result will be included in the computed cache-key"""
 
+    cache_backend: t.Optional["CacheBackend"] = None
+    """In-process cache tier used by @enableCache in front of the "viur-cache" kind.
+    If not set, a :class:`viur.core.cache.MemoryCacheBackend` limited by `cache_memory_max_size` is used."""
+
+    cache_memory_max_size: int = 16 * 1024 * 1024
+    """Maximum size in bytes of the default in-process cache tier; Set to 0 to disable it."""
+
+    cache_memory_ttl: datetime.timedelta = datetime.timedelta(minutes=5)
+    """Maximum time an entry is served from the in-process cache tier"""
+
+    cache_generation_check_interval: datetime.timedelta = datetime.timedelta(seconds=5)
+    """Interval in which an instance checks the datastore for cache flushes issued by other instances"""
+
+    cache_generation_retention: datetime.timedelta = datetime.timedelta(days=1)
+    """Generation counters of the cache which haven't been incremented for this time are removed,
+    after the stale cache entries have been purged"""
+
     # FIXME VIUR4: REMOVE ALL COMPATIBILITY MODES!
     compatibility: Multiple[str] = [
         "json.bone.structure.camelcasenames",  # use camelCase attribute names (see #637 for details)
@@ -825,9 +918,18 @@ class Conf(ConfigType):
     ]
     """Backward compatibility flags; Remove to enforce new style."""
 
+    conditional_requests: bool = True
+    """Answer repeated GET requests to view and list actions of json renderers with 304 Not Modified,
+    when the entries haven't changed. Responses are validated by ETags computed from the keys of the entries,
+    their changedate and delayedUpdateTag, and by the time of their last change."""
+
     db_engine: str = "viur.datastore"
     """Database engine module"""
 
+    db_request_cache: bool = False
+    """Serve repeated reads of the same entity within a request from a request-scoped identity map.
+    Entries are invalidated by db.Put and db.Delete within the request; Transactions always bypass it."""
+
     error_handler: t.Callable[[Exception], str] | None = None
     """If set, ViUR calls this function instead of rendering the viur.errorTemplate if an exception occurs"""
 
@@ -853,6 +955,9 @@ class Conf(ConfigType):
     main_resolver: dict[str, dict] = None
     """Dictionary for Resolving functions for URLs"""
 
+    routing_cache_size: int = 1024
+    """Maximum number of resolved paths kept by the routing trie compiled from :attr:`main_resolver`"""
+
     max_post_params_count: int = 250
     """Upper limit of the amount of parameters we accept per request. Prevents Hash-Collision-Attacks"""
 
@@ -880,6 +985,27 @@ class Conf(ConfigType):
     render_json_download_url_expiration: t.Optional[float | int] = None
     """The default duration, for which downloadURLs generated by the json renderer will stay valid"""
 
+    render_json_fast_encoder: bool = False
+    """Encode the output of the json renderer with orjson, when it's installed (``pip install viur-core[orjson]``).
+
+    The output is equivalent to the default encoder, but orjson doesn't emit any whitespace
+    and doesn't escape non-ASCII characters.
+    """
+
+    render_json_structure_cache: bool = True
+    """Cache the rendered structures of skeletons by skeleton class, bones, language and compatibility flags.
+
+    Skeletons with cloned bones or with dynamic select values are never cached. It can be disabled
+    when custom bones render a structure which depends on the request or the current user.
+    """
+
+    render_json_stream_lists: bool = False
+    """Stream lists rendered by the json renderer entry by entry, instead of building the entire response at once.
+
+    This keeps the memory usage of large lists (like exports) constant, but errors which occur while streaming
+    can't be reported with a proper status code anymore, as the response has already been started.
+    """
+
     request_preprocessor: t.Optional[t.Callable[[str], str]] = None
     """Allows the application to register a function that's called before the request gets routed"""
 
@@ -893,6 +1019,14 @@ class Conf(ConfigType):
     ]
     """Priority, in which skeletons are loaded"""
 
+    skeleton_update_relations_debounce: datetime.timedelta | None = None
+    """
+    Time to wait before updating the relations of an edited entity.
+    Further edits within this time are coalesced into the same update, so an entity edited many times in a row
+    triggers only one cascade, e.g. `datetime.timedelta(seconds=10)`.
+    Referencing entities are then updated only after this delay. If None, an update is scheduled on every edit.
+    """
+
     _tasks_custom_environment_handler: t.Optional["CustomEnvironmentHandler"] = None
 
     @property
@@ -944,6 +1078,17 @@ class Conf(ConfigType):
     The default queue can be changed by overwriting `"__default__"`.
     """
 
+    tasks_local_workers: int = 0
+    """
+    Number of worker threads per queue of the in-process task queue emulation.
+    When no Cloud Tasks queue is available (e.g. on the local development server), deferred tasks and QueryIter steps
+    are run by these workers concurrently, honouring queues, countdowns and retries.
+    If set to 0, deferred tasks are run serially at the end of the request instead.
+    """
+
+    tasks_local_max_retries: int = 3
+    """Number of retries of a failed task in the in-process task queue emulation"""
+
     valid_application_ids: list[str] = []
     """Which application-ids we're supposed to run on"""
 
@@ -1022,11 +1167,11 @@ class Conf(ConfigType):
         "viur.viur2import.blobsource": "viur2import_blobsource",
     }
 
-    def _resolve_mapping(self, key: str) -> str:
+    def _map_key(self, key: str) -> str:
         """Additional mapping for new sub confs."""
         if key.startswith("viur.") and key not in self._mapping:
             key = key.removeprefix("viur.")
-        return super()._resolve_mapping(key)
+        return super()._map_key(key)
 
 
 conf = Conf(
@@ -1,4 +1,7 @@
+import contextvars
+import copy
 import importlib
+from viur.core import current
 from viur.core.config import conf
 
 if conf.db_engine == "viur.datastore":
@@ -8,6 +11,99 @@ else:
 
 KeyClass = Key
 
+_Get, _Put, _Delete, _GetOrInsert = Get, Put, Delete, GetOrInsert
+
+
+request_cache: contextvars.ContextVar[dict | None] = contextvars.ContextVar("request_cache", default=None)
+"""Identity map of the current request, set by the Router when :attr:`conf.db_request_cache` is enabled"""
+
+
+def _request_cache() -> dict | None:
+    """
+        Returns the identity map of the current request, or None when it is not enabled.
+    """
+    if (req := current.request.get()) is None or getattr(req, "disableCache", False):
+        return None
+
+    return request_cache.get()
+
+
+def _invalidate(keys: Key | Entity | list[Key | Entity]) -> None:
+    """
+        Removes the given keys or entities from the identity map of the current request.
+    """
+    if not (cache := _request_cache()):
+        return
+
+    for key in keys if isinstance(keys, (list, tuple)) else [keys]:
+        cache.pop(key.key if isinstance(key, Entity) else key, None)
+
+
+def Get(keys: Key | list[Key]) -> Entity | None | list[Entity | None]:
+    """
+        Fetches the entities stored under the given keys, returning None for entities that don't exist.
+
+        When :attr:`viur.core.config.Conf.db_request_cache` is enabled, entities that have already been fetched
+        within the current request are served from memory. Transactions always read from the datastore.
+
+        :param keys: A Key or a list of Keys to fetch.
+        :return: The entity or None for the given key, a list of entities or None if a list was given.
+    """
+    if (cache := _request_cache()) is None or IsInTransaction():
+        return _Get(keys)
+
+    is_multi = not isinstance(keys, Key)
+    keys = list(keys) if is_multi else [keys]
+
+    # Keys served from memory must be logged as well, so cached responses depending on them are invalidated
+    if isinstance(access_log := currentDbAccessLog.get(), set):
+        access_log.update(keys)
+
+    if missing := list(dict.fromkeys(key for key in keys if key not in cache)):
+        for key, entity in zip(missing, _Get(missing)):
+            cache[key] = copy.deepcopy(entity)
+
+    # Always hand out copies, so modifications by the caller don't leak into the identity map
+    res = [copy.deepcopy(cache[key]) for key in keys]
+    return res if is_multi else res[0]
+
+
+def Put(entities: Entity | list[Entity]) -> Entity | list[Entity] | None:
+    """
+        Writes the given entities into the datastore, and removes them from the identity map of the current request.
+    """
+    _invalidate(entities)
+    return _Put(entities)
+
+
+def Delete(keys: Key | Entity | list[Key | Entity]) -> None:
+    """
+        Deletes the given entities from the datastore, and removes them from the identity map of the current request.
+    """
+    _invalidate(keys)
+    return _Delete(keys)
+
+
+def GetOrInsert(key: Key, **kwargs) -> Entity:
+    """
+        Returns the entity stored under *key*, or creates it with the values from *kwargs* if it does not exist.
+    """
+    _invalidate(key)
+    return _GetOrInsert(key, **kwargs)
+
+
+def delete_multi(keys: list[Key | Entity], chunk_size: int = 300) -> None:
+    """
+        Deletes the entities stored under the given keys with as few calls to :func:`Delete` as possible.
+
+        :param keys: A list of Keys or Entities.
+        :param chunk_size: Maximum number of keys deleted by one call.
+    """
+    keys = list(keys)
+    for i in range(0, len(keys), chunk_size):
+        Delete(keys[i:i + chunk_size])
+
+
 __all__ = [KEY_SPECIAL_PROPERTY, DATASTORE_BASE_TYPES, SortOrder, Entity, Key, KeyClass, Put, Get, Delete, AllocateIDs,
            CollisionError, keyHelper, fixUnindexableProperties, GetOrInsert, Query, QueryDefinition, IsInTransaction,
            acquireTransactionSuccessMarker, RunInTransaction, config, startDataAccessLog, endDataAccessLog, Count,
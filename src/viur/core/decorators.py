@@ -1,3 +1,4 @@
+import datetime
 import typing as t
 import logging
 from viur.core import current, errors
@@ -12,6 +13,7 @@ __all__ = [
     "internal_exposed",
     "skey",
     "cors",
+    "cache_control",
 ]
 
 
@@ -252,3 +254,57 @@ def cors(
         return meth
 
     return decorator
+
+
+def cache_control(
+    max_age: int | datetime.timedelta | None = None,
+    *,
+    public: bool = False,
+    no_cache: bool = False,
+    no_store: bool = False,
+    must_revalidate: bool = False,
+    stale_while_revalidate: int | datetime.timedelta | None = None,
+) -> t.Callable:
+    """
+    Sets the Cache-Control header of GET and HEAD requests to a decorated :meth:`exposed` method.
+
+    Responses are cacheable by the client only (private), unless `public` is set.
+
+    .. code-block:: python
+
+        @exposed
+        @cache_control(max_age=datetime.timedelta(minutes=5), public=True)
+        def news(self):
+            ...
+
+    :param max_age: Time the response is considered fresh.
+    :param public: Allow shared caches (like proxies or a CDN) to store the response.
+    :param no_cache: The client must revalidate the response (e.g. by its ETag) on every use.
+    :param no_store: The response must not be stored at all.
+    :param must_revalidate: A stale response must not be used without revalidation.
+    :param stale_while_revalidate: Time a stale response can still be used, while it's revalidated in background.
+    """
+    def seconds(value: int | datetime.timedelta) -> int:
+        return int(value.total_seconds()) if isinstance(value, datetime.timedelta) else int(value)
+
+    directives = ["public" if public else "private"]
+
+    if no_store:
+        directives.append("no-store")
+    if no_cache:
+        directives.append("no-cache")
+    if max_age is not None:
+        directives.append(f"max-age={seconds(max_age)}")
+    if must_revalidate:
+        directives.append("must-revalidate")
+    if stale_while_revalidate is not None:
+        directives.append(f"stale-while-revalidate={seconds(stale_while_revalidate)}")
+
+    value = ", ".join(directives)
+
+    def decorator(func):
+        meth = Method.ensure(func)
+        meth.cache_control = value
+        return meth
+
+    return decorator
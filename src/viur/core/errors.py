@@ -42,6 +42,15 @@ class Redirect(HTTPException):
         self.url = url
 
 
+class NotModified(HTTPException):
+    """
+        Causes a 304 - Not Modified response without a body, as the client already has the current version
+    """
+
+    def __init__(self, descr: str = "Not Modified"):
+        super().__init__(status=304, name="Not Modified", descr=descr)
+
+
 class Unauthorized(HTTPException):
     """
         Unauthorized
@@ -38,6 +38,7 @@ class Method:
         self.methods = ("GET", "POST", "HEAD", "OPTIONS")
         self.seo_language_map = None
         self.cors_allow_headers = None
+        self.cache_control = None
         self.additional_descr = {}
         self.skey = None
 
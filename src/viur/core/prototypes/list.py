@@ -176,6 +176,7 @@ class List(SkelModule):
             raise errors.Forbidden()
 
         self.onView(skel)
+        self._conditional_get(skel)
         return self.render.view(skel)
 
     @exposed
@@ -202,7 +203,9 @@ class List(SkelModule):
             raise errors.Unauthorized()
 
         self._apply_default_order(query)
-        return self.render.list(query.fetch())
+        skellist = query.fetch()
+        self._conditional_get(skellist)
+        return self.render.list(skellist)
 
     @force_ssl
     @exposed
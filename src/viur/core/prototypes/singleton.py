@@ -129,6 +129,7 @@ class Singleton(SkelModule):
             raise errors.NotFound()
 
         self.onView(skel)
+        self._conditional_get(skel)
         return self.render.view(skel)
 
     @exposed
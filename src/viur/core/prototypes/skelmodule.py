@@ -1,10 +1,12 @@
+import hashlib
 import os
 import yaml
 import logging
-from viur.core import Module, db, current, errors
+from viur.core import Module, db, current, errors, utils
+from viur.core.bones.base import ComputeMethod
 from viur.core.decorators import *
 from viur.core.config import conf
-from viur.core.skeleton import skeletonByKind, Skeleton, SkeletonInstance
+from viur.core.skeleton import skeletonByKind, Skeleton, SkeletonInstance, SkelList
 import typing as t
 
 
@@ -204,6 +206,59 @@ class SkelModule(Module):
                 else:
                     query.order(*default_order)
 
+    def _conditional_get(self, skels: SkeletonInstance | SkelList) -> None:
+        """
+        Answers a request for viewing an entry or a list of entries with 304 Not Modified,
+        when the client already has the current version of the response. It must be called before rendering.
+
+        The ETag is computed from the keys of the entities and their changedate and delayedUpdateTag, the cursor
+        of a list, the bones, the language and the current user. Values of relational bones are mirrored into the
+        entities, and updating them changes the changedate as well, so these are covered.
+        It's only used by json renderers, and not for skeletons with bones computed on every read,
+        as their values can change without a write.
+
+        .. seealso:: :attr:`viur.core.config.Conf.conditional_requests`
+        """
+        if (
+            not conf.conditional_requests
+            or not utils.string.is_prefix(self.render.kind, "json")
+            or not (request := current.request.get())
+        ):
+            return
+
+        if isinstance(skels, SkeletonInstance):
+            cursor = None
+            skels = (skels, )
+        else:
+            cursor = skels.getCursor()
+
+        if skels and any(
+            bone.compute and bone.compute.interval.method in (ComputeMethod.Always, ComputeMethod.Lifetime)
+            for bone in skels[0].boneMap.values() if bone
+        ):
+            return
+
+        user = current.user.get()
+        etag = hashlib.sha256(repr((
+            self.render.kind,
+            current.language.get(),
+            (str(user["key"]), user["changedate"]) if user else None,
+            conf.instance.version_hash,
+            tuple(skels[0].keys()) if skels else None,
+            cursor,
+        )).encode())
+
+        last_modified = None
+        for skel in skels:
+            changedate = skel.dbEntity.get("changedate")
+            delayed_update_tag = (skel.dbEntity.get("viur") or {}).get("delayedUpdateTag")
+            etag.update(repr((str(skel.dbEntity.key), changedate, delayed_update_tag)).encode())
+
+            if changedate and (not last_modified or changedate > last_modified):
+                last_modified = changedate
+
+        request.conditional(etag.hexdigest(), last_modified)
+
     @force_ssl
     @force_post
     @exposed
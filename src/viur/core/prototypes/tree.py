@@ -337,7 +337,9 @@ class Tree(SkelModule):
             raise errors.Unauthorized()
 
         self._apply_default_order(query)
-        return self.render.list(query.fetch())
+        skellist = query.fetch()
+        self._conditional_get(skellist)
+        return self.render.list(skellist)
 
     @exposed
     def structure(self, skelType: SkelType, action: t.Optional[str] = "view") -> t.Any:
@@ -405,6 +407,7 @@ class Tree(SkelModule):
             raise errors.Unauthorized()
 
         self.onView(skelType, skel)
+        self._conditional_get(skel)
         return self.render.view(skel)
 
     @exposed
@@ -1,11 +1,285 @@
+import collections
 import datetime
+import random
+import threading
+import time
 
-from viur.core import current, db, errors, utils
+from viur.core import conf, current, db, errors, utils
 from viur.core.tasks import PeriodicTask, DeleteEntitiesIter
 import typing as t
 from datetime import timedelta
 
 
+class RateLimitBackend:
+    """
+        Interface for the storage of the hits counted by a :class:`RateLimit`.
+
+        Custom implementations can be plugged in by setting `conf.security.ratelimit_backend`,
+        or per RateLimit by its *backend* parameter.
+    """
+
+    def decrement_quota(self, rate_limit: "RateLimit", endpoint: str) -> None:
+        """
+            Counts one hit of *endpoint* on *rate_limit*.
+        """
+        raise NotImplementedError()
+
+    def hits(self, rate_limit: "RateLimit", endpoint: str) -> int:
+        """
+            Returns the number of hits of *endpoint* on *rate_limit* within its time-span.
+        """
+        raise NotImplementedError()
+
+
+class DatastoreRateLimitBackend(RateLimitBackend):
+    """
+        Counts the hits per time step of a RateLimit in entities of the kind "viur-ratelimit".
+
+        All hits of an endpoint within a time step are counted by the same entity, so bursts of hits cause transaction
+        collisions. With *shards* > 1, every hit is counted by one of that many entities picked at random instead,
+        and all of them are summed up with a single multi-get.
+
+        :param shards: Number of entities counting the hits of an endpoint per time step.
+    """
+
+    def __init__(self, shards: int = 1):
+        super().__init__()
+        self.shards = shards
+
+    @staticmethod
+    def _shard_name(name: str, shard: int) -> str:
+        # The first shard keeps the name used without sharding
+        return f"{name}-{shard}" if shard else name
+
+    def decrement_quota(self, rate_limit: "RateLimit", endpoint: str) -> None:
+        def updateTxn(cacheKey: str) -> None:
+            key = db.Key(rate_limit.rateLimitKind, cacheKey)
+            obj = db.Get(key)
+            if obj is None:
+                obj = db.Entity(key)
+                obj["value"] = 0
+            obj["value"] += 1
+            obj["expires"] = utils.utcNow() + timedelta(minutes=2 * rate_limit.minutes)
+            db.Put(obj)
+
+        lockKey = f"{rate_limit.resource}-{endpoint}-{rate_limit._getCurrentTimeKey()}"
+        db.RunInTransaction(updateTxn, self._shard_name(lockKey, random.randrange(self.shards)))
+
+    def hits(self, rate_limit: "RateLimit", endpoint: str) -> int:
+        currentDateTime = utils.utcNow()
+        secSinceMidnight = (currentDateTime - currentDateTime.replace(hour=0, minute=0, second=0,
+                                                                      microsecond=0)).total_seconds()
+        currentStep = int(secSinceMidnight / rate_limit.secondsPerStep)
+        keyBase = currentDateTime.strftime("%Y-%m-%d-%%s")
+        cacheKeys = []
+        for x in range(0, rate_limit.steps):
+            lockKey = f"{rate_limit.resource}-{endpoint}-{keyBase % (currentStep - x)}"
+            for shard in range(self.shards):
+                cacheKeys.append(db.Key(rate_limit.rateLimitKind, self._shard_name(lockKey, shard)))
+        tmpRes = db.Get(cacheKeys)
+        return sum([x["value"] for x in tmpRes if x and currentDateTime < x["expires"]])
+
+
+class RateLimitStore:
+    """
+        Interface for a store shared by all instances, which :class:`MemoryRateLimitBackend` synchronizes with.
+
+        It holds plain counters, which expire after a given time; This maps directly onto the INCRBY, EXPIRE and
+        MGET commands of a Redis server, for example.
+    """
+
+    def add(self, counters: dict[str, int], ttl: float) -> None:
+        """
+            Increments the given counters by the given amounts, and lets them expire in *ttl* seconds.
+        """
+        raise NotImplementedError()
+
+    def get_multi(self, names: list[str]) -> list[int]:
+        """
+            Returns the values of the given counters, 0 for those not existing.
+        """
+        raise NotImplementedError()
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+        RateLimitStore held in the memory of the current process, e.g. to be used for testing.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._counters: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, counters: dict[str, int], ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for name, amount in counters.items():
+                value, expires = self._counters.get(name, (0, 0))
+                self._counters[name] = ((value if expires > now else 0) + amount, now + ttl)
+
+    def get_multi(self, names: list[str]) -> list[int]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                value if expires > now else 0
+                for value, expires in (self._counters.get(name, (0, 0)) for name in names)
+            ]
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+        Counts the hits of RateLimits in the memory of the current instance, using a sliding-window log.
+
+        Per endpoint, only the timestamps of the last `maxRate + 1` hits are kept, which is enough to decide whether
+        the quota is exceeded. The number of endpoints held is bounded by *max_entries*; The least recently used
+        ones are dropped first, and endpoints without hits within their time-span are compacted away periodically.
+
+        As every instance counts on its own, the hits can optionally be synchronized with other instances through a
+        shared *store*. Then, the hits are additionally counted per time step of the RateLimit in the store,
+        which is written and read at most once per *sync_interval* and endpoint.
+
+        :param max_entries: Maximum number of endpoints held in memory.
+        :param compact_interval: Seconds between compactions of the endpoints without recent hits.
+        :param store: Optional store shared by all instances.
+        :param sync_interval: Seconds between synchronizations of an endpoint with the *store*.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        compact_interval: float = 60,
+        store: RateLimitStore | None = None,
+        sync_interval: float = 1,
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.compact_interval = compact_interval
+        self.store = store
+        self.sync_interval = sync_interval
+        # Maps the endpoints to their time-span and the log of the most recent hits
+        self._entries: collections.OrderedDict[str, tuple[float, collections.deque]] = collections.OrderedDict()
+        # Maps the endpoints to the time of their last synchronization, their hits counted in the store,
+        # and their pending hits per time step not yet written to the store
+        self._synced: dict[str, tuple[float, int, collections.Counter]] = {}
+        self._last_compaction = time.monotonic()
+        self._lock = threading.Lock()
+
+    def decrement_quota(self, rate_limit: "RateLimit", endpoint: str) -> None:
+        now = time.monotonic()
+        name = self._name(rate_limit, endpoint)
+
+        with self._lock:
+            if (entry := self._entries.get(name)) is None:
+                log = collections.deque(maxlen=rate_limit.maxRate + 1)
+                entry = self._entries[name] = (rate_limit.minutes * 60, log)
+
+            entry[1].append(now)
+            self._entries.move_to_end(name)
+
+            if self.store:
+                synced = self._synced.setdefault(name, (0, 0, collections.Counter()))
+                synced[2][f"{name}-{rate_limit._getCurrentTimeKey()}"] += 1
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._synced.pop(evicted, None)
+
+        if self.store:
+            self._sync(rate_limit, name)
+
+        self._compact()
+
+    def hits(self, rate_limit: "RateLimit", endpoint: str) -> int:
+        now = time.monotonic()
+        name = self._name(rate_limit, endpoint)
+
+        with self._lock:
+            if entry := self._entries.get(name):
+                count = sum(1 for timestamp in entry[1] if timestamp > now - entry[0])
+            else:
+                count = 0
+
+        if self.store:
+            self._sync(rate_limit, name)
+
+            with self._lock:
+                if synced := self._synced.get(name):
+                    count = max(count, synced[1] + sum(synced[2].values()))
+
+        return count
+
+    @staticmethod
+    def _name(rate_limit: "RateLimit", endpoint: str) -> str:
+        """
+            Returns the name under which the hits of *endpoint* are counted for *rate_limit*.
+
+            RateLimits on the same resource with a different rate or time-span are counted separately,
+            as the log of the hits is bounded by the rate, and evaluated within the time-span.
+        """
+        return f"{rate_limit.resource}-{rate_limit.maxRate}-{rate_limit.minutes}-{endpoint}"
+
+    def _sync(self, rate_limit: "RateLimit", name: str) -> None:
+        """
+            Writes the pending hits of *name* into the store and reads the hits of all instances,
+            unless this has been done within the last *sync_interval* seconds.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            last_sync, store_hits, pending = self._synced.get(name, (0, 0, collections.Counter()))
+            if last_sync > now - self.sync_interval:
+                return
+
+            # Claim this synchronization and take over the pending hits
+            self._synced[name] = (now, store_hits, collections.Counter())
+
+        if pending:
+            self.store.add(dict(pending), ttl=2 * rate_limit.minutes * 60)
+
+        current_step = rate_limit._getCurrentStep()
+        key_base = utils.utcNow().strftime("%Y-%m-%d-%%s")
+        counters = self.store.get_multi([f"{name}-{key_base % (current_step - x)}" for x in range(rate_limit.steps)])
+
+        with self._lock:
+            _, _, pending = self._synced.get(name, (now, 0, collections.Counter()))  # hits meanwhile
+            self._synced[name] = (now, sum(counters), pending)
+
+    def _compact(self) -> None:
+        """
+            Drops the endpoints without any hits within their time-span, at most once per *compact_interval*.
+        """
+        now = time.monotonic()
+        if self._last_compaction > now - self.compact_interval:
+            return
+
+        with self._lock:
+            self._last_compaction = now
+
+            for name, (window, log) in list(self._entries.items()):
+                if not log or log[-1] <= now - window:
+                    del self._entries[name]
+                    self._synced.pop(name, None)
+
+
+_datastore_backend = None
+
+
+def get_backend() -> RateLimitBackend:
+    """
+        Returns the default rate limit backend, which is either `conf.security.ratelimit_backend` or the datastore.
+    """
+    global _datastore_backend
+
+    if conf.security.ratelimit_backend is not None:
+        return conf.security.ratelimit_backend
+
+    if _datastore_backend is None:
+        _datastore_backend = DatastoreRateLimitBackend()
+
+    return _datastore_backend
+
+
 class RateLimit(object):
     """
         This class is used to restrict access to certain functions to *maxRate* calls per minute.
@@ -17,7 +291,14 @@ class RateLimit(object):
     """
     rateLimitKind = "viur-ratelimit"
 
-    def __init__(self, resource: str, maxRate: int, minutes: int, method: t.Literal["ip", "user"]):
+    def __init__(
+        self,
+        resource: str,
+        maxRate: int,
+        minutes: int,
+        method: t.Literal["ip", "user"],
+        backend: RateLimitBackend | None = None,
+    ):
         """
         Initializes a new RateLimit gate.
 
@@ -25,6 +306,7 @@ class RateLimit(object):
         :param maxRate: Amount of tries allowed in the give time-span
         :param minutes: Length of the time-span in minutes
         :param method: Lock by IP or by the current user
+        :param backend: Storage of the hits; Defaults to `conf.security.ratelimit_backend` or the datastore
         """
         super(RateLimit, self).__init__()
         self.resource = resource
@@ -34,6 +316,7 @@ class RateLimit(object):
         self.secondsPerStep = 60 * (float(minutes) / float(self.steps))
         assert method in ["ip", "user"], "method must be 'ip' or 'user'"
         self.useUser = method == "user"
+        self.backend = backend
 
     def _getEndpointKey(self) -> db.Key | str:
         """
@@ -60,51 +343,36 @@ class RateLimit(object):
             else:  # It's IPv4, simply return that address
                 return remoteAddr
 
-    def _getCurrentTimeKey(self) -> str:
+    def _getCurrentStep(self) -> int:
         """
-        :return: the current lockperiod used in second position of the memcache key
+        :return: the number of the current time step since midnight
         """
         dateTime = utils.utcNow()
-        key = dateTime.strftime("%Y-%m-%d-%%s")
         secsinceMidnight = (dateTime - dateTime.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
-        currentStep = int(secsinceMidnight / self.secondsPerStep)
-        return key % currentStep
+        return int(secsinceMidnight / self.secondsPerStep)
 
-    def decrementQuota(self) -> None:
+    def _getCurrentTimeKey(self) -> str:
         """
-        Removes one attempt from the pool of available Quota for that user/ip
+        :return: the current lockperiod used in second position of the memcache key
         """
+        key = utils.utcNow().strftime("%Y-%m-%d-%%s")
+        return key % self._getCurrentStep()
 
-        def updateTxn(cacheKey: str) -> None:
-            key = db.Key(self.rateLimitKind, cacheKey)
-            obj = db.Get(key)
-            if obj is None:
-                obj = db.Entity(key)
-                obj["value"] = 0
-            obj["value"] += 1
-            obj["expires"] = utils.utcNow() + timedelta(minutes=2 * self.minutes)
-            db.Put(obj)
+    def _getBackend(self) -> RateLimitBackend:
+        return self.backend or get_backend()
 
-        lockKey = f"{self.resource}-{self._getEndpointKey()}-{self._getCurrentTimeKey()}"
-        db.RunInTransaction(updateTxn, lockKey)
+    def decrementQuota(self) -> None:
+        """
+        Removes one attempt from the pool of available Quota for that user/ip
+        """
+        self._getBackend().decrement_quota(self, str(self._getEndpointKey()))
 
     def isQuotaAvailable(self) -> bool:
         """
         Checks if there's currently quota available for the current user/ip
         :return: True if there's quota available, False otherwise
         """
-        endPoint = self._getEndpointKey()
-        currentDateTime = utils.utcNow()
-        secSinceMidnight = (currentDateTime - currentDateTime.replace(hour=0, minute=0, second=0,
-                                                                      microsecond=0)).total_seconds()
-        currentStep = int(secSinceMidnight / self.secondsPerStep)
-        keyBase = currentDateTime.strftime("%Y-%m-%d-%%s")
-        cacheKeys = []
-        for x in range(0, self.steps):
-            cacheKeys.append(
-                db.Key(self.rateLimitKind, f"{self.resource}-{endPoint}-{keyBase % (currentStep - x)}"))
-        tmpRes = db.Get(cacheKeys)
-        return sum([x["value"] for x in tmpRes if x and currentDateTime < x["expires"]]) <= self.maxRate
+        return self._getBackend().hits(self, str(self._getEndpointKey())) <= self.maxRate
 
     def assertQuotaIsAvailable(self, setRetryAfterHeader: bool = True) -> bool:
         """Assert quota is available.
@@ -219,6 +219,68 @@ def getSkel(
     return skel
 
 
+@jinjaGlobalFunction
+def getSkels(
+    render: Render,
+    module: str,
+    keys: t.Iterable[str],
+    skel: str = "viewSkel",
+    skel_args: tuple[t.Any] = (),
+) -> list[SkeletonInstance]:
+    """
+    Jinja2 global: Fetch several entries from a given module at once, and return them as a list,
+    prepared for direct use in the output.
+
+    Unlike multiple calls to :func:`getSkel`, the entries are read with only one database request.
+    Entries which don't exist, or which the current user is not allowed to view, are left out.
+
+    :param module: Name of the module, from which the data should be fetched.
+    :param keys: Requested entity-keys in an urlsafe-format.
+    :param skel: Specifies and optionally different data-model
+    :param skel_arg: Optional skeleton arguments to be passed to the skel-function (e.g. for Tree-Modules)
+
+    :returns: List of the entries found, in the order of *keys*.
+    """
+    if not (obj := getattr(conf.main_app, module, None)):
+        raise ValueError(f"getSkels: Can't read skeletons from unknown module {module!r}")
+
+    if not getattr(obj, "html", False):
+        raise PermissionError(f"getSkels: module {module!r} is not allowed to be accessed")
+
+    if not hasattr(obj, "canView") and hasattr(obj, "listFilter"):
+        # Access is checked by a query for each entry; this can't be done at once
+        return [entry for key in keys if (entry := getSkel(render, module, key, skel, skel_args))]
+
+    # Retrieve a skeleton
+    base_skel = getattr(obj, skel)(*skel_args)
+    if not isinstance(base_skel, SkeletonInstance):
+        raise RuntimeError("getSkels: Invalid skel name provided")
+
+    res = []
+    for entry in base_skel.read_multi(keys):
+        if hasattr(obj, "canView"):
+            if isinstance(obj, prototypes.singleton.Singleton):
+                is_allowed = obj.canView()
+
+            elif isinstance(obj, prototypes.tree.Tree):
+                if entry["key"].kind == obj.nodeSkelCls.kindName:
+                    is_allowed = obj.canView("node", entry)
+                else:
+                    is_allowed = obj.canView("leaf", entry)
+
+            else:
+                is_allowed = obj.canView(entry)
+
+            if not is_allowed:
+                logging.error(f"""getSkels: Access to {entry["key"]} denied from canView""")
+                continue
+
+        entry.renderPreparation = render.renderBoneValue
+        res.append(entry)
+
+    return res
+
+
 @jinjaGlobalFunction
 def getHostUrl(render: Render, forceSSL=False, *args, **kwargs):
     """
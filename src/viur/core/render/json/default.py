@@ -1,6 +1,8 @@
+import hashlib
 import json
+import operator
 import typing as t
-from enum import Enum
+from enum import Enum, EnumMeta
 
 from viur.core import bones, db, current
 from viur.core.render.abstract import AbstractRenderer
@@ -9,6 +11,12 @@ from viur.core.i18n import translate
 from viur.core.config import conf
 from datetime import datetime
 
+orjson_dependencies = True
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson_dependencies = False
+
 
 class CustomJsonEncoder(json.JSONEncoder):
     """
@@ -32,9 +40,97 @@ class CustomJsonEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+# Types which are converted by :class:`CustomJsonEncoder`, as a fast lookup for orjson
+_ORJSON_CONVERTERS: dict[type, t.Callable[[t.Any], t.Any]] = {
+    translate: str,
+    db.Key: str,
+    set: tuple,
+}
+
+
+def _orjson_default(o: t.Any) -> t.Any:
+    if convert := _ORJSON_CONVERTERS.get(type(o)):
+        return convert(o)
+
+    return CustomJsonEncoder().default(o)
+
+
+def dumps(o: t.Any) -> str:
+    """
+        Encodes ``o`` into JSON, like ``json.dumps(o, cls=CustomJsonEncoder)`` does.
+
+        When :attr:`conf.render_json_fast_encoder` is set and orjson is installed, it's used for encoding.
+    """
+    if conf.render_json_fast_encoder and orjson_dependencies:
+        return orjson.dumps(o, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    return json.dumps(o, cls=CustomJsonEncoder)
+
+
+class RenderedStructure(t.NamedTuple):
+    """The rendered structure of a skeleton, as returned by :meth:`DefaultRender.render_skel_structure`"""
+
+    structure: dict | list
+    """The structure, with compatibility rewrites applied and translations resolved"""
+
+    etag: str
+    """Identifies this version of the structure"""
+
+
+# Rendered structures by skeleton class, bones, language and compatibility flags
+_structure_cache: dict[tuple, RenderedStructure] = {}
+
+
+def _is_structure_static(bone_map: dict[str, bones.BaseBone]) -> bool:
+    """
+        Checks if the structure of the bones in ``bone_map`` is the same on every call,
+        so it can be cached. Bones modified at runtime are cloned instances, and select values can be dynamic.
+    """
+    for bone in bone_map.values():
+        if not bone:
+            continue
+
+        if bone.isClonedInstance:
+            return False
+
+        if isinstance(bone, bones.SelectBone) and callable(bone._values) and not isinstance(bone._values, EnumMeta):
+            return False
+
+        if (
+            isinstance(bone, (bones.RecordBone, bones.RelationalBone))
+            and bone.using
+            and not _is_structure_static(bone.using.__boneMap__)
+        ):
+            return False
+
+    return True
+
+
+def _resolve_translations(value: t.Any) -> t.Any:
+    """
+        Returns a copy of a rendered structure with all translations resolved into the current language.
+    """
+    if isinstance(value, translate):
+        return str(value)
+    elif isinstance(value, dict):
+        return {key: _resolve_translations(item) for key, item in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_resolve_translations(item) for item in value]
+
+    return value
+
+
 class DefaultRender(AbstractRenderer):
     kind = "json"
 
+    stream_chunk_size = 64 * 1024
+    """Minimum size in bytes of the chunks emitted by a streamed list"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Render plans by skeleton class and bone names, see _get_render_plan()
+        self._render_plans: dict[tuple, tuple[tuple[bones.BaseBone, ...], tuple[tuple[str, t.Callable], ...]]] = {}
+
     @staticmethod
     def render_structure(structure: dict):
         """
@@ -70,6 +166,40 @@ class DefaultRender(AbstractRenderer):
 
         return structure
 
+    @staticmethod
+    def render_skel_structure(skel: SkeletonInstance) -> RenderedStructure:
+        """
+        Renders the structure of a skeleton by :meth:`render_structure` and resolves its translations.
+
+        The result is cached by skeleton class, bone subset, language and compatibility flags, unless the
+        skeleton is cloned, or :attr:`conf.render_json_structure_cache` is disabled. It must not be modified.
+        Bones of a skeleton class can't be modified after the system is initialized, and runtime modifications
+        by subskel() or clone() produce other bone instances, so they don't share a cached structure.
+        """
+        cache_key = None
+        if conf.render_json_structure_cache and not skel.is_cloned:
+            key = (
+                skel.skeletonCls,
+                tuple(skel.boneMap.items()),
+                current.language.get(),
+                tuple(conf.compatibility),
+            )
+
+            if rendered := _structure_cache.get(key):
+                return rendered
+
+            if _is_structure_static(skel.boneMap):
+                cache_key = key
+
+        structure = _resolve_translations(DefaultRender.render_structure(skel.structure()))
+        etag = hashlib.sha256(json.dumps(structure, cls=CustomJsonEncoder).encode("UTF-8")).hexdigest()
+        rendered = RenderedStructure(structure, etag)
+
+        if cache_key:
+            _structure_cache[cache_key] = rendered
+
+        return rendered
+
     def renderSingleBoneValue(self, value: t.Any,
                               bone: bones.BaseBone,
                               skel: SkeletonInstance,
@@ -122,6 +252,112 @@ class DefaultRender(AbstractRenderer):
             res = self.renderSingleBoneValue(boneVal, bone, skel, key)
         return res
 
+    def _get_render_plan(self, skel: SkeletonInstance) -> tuple[tuple[str, t.Callable[[SkeletonInstance], t.Any]], ...]:
+        """
+        Returns the render plan for the bones of ``skel``, which renders the value of each bone by a function
+        specialised to the bone's type and cardinality.
+
+        Plans are compiled once per skeleton class and bone subset, and are re-compiled when the bones of a
+        skeleton differ from the ones the plan was compiled for (e.g. cloned or modified at runtime).
+        """
+        bone_map = skel.boneMap
+        key = (skel.skeletonCls, tuple(bone_map))
+        bone_instances = tuple(bone_map.values())
+
+        if (plan := self._render_plans.get(key)) and plan[0] == bone_instances:
+            return plan[1]
+
+        steps = tuple((name, self._compile_bone_renderer(name, bone)) for name, bone in bone_map.items())
+        self._render_plans[key] = (bone_instances, steps)
+        return steps
+
+    def _compile_bone_renderer(self, name: str, bone: bones.BaseBone) -> t.Callable[[SkeletonInstance], t.Any]:
+        """
+        Compiles a function rendering the value of the bone ``name`` of a skeleton,
+        equivalent to :meth:`renderBoneValue`.
+        """
+        # Custom renderers overriding the value rendering are called as they are
+        if (
+            type(self).renderBoneValue is not DefaultRender.renderBoneValue
+            or type(self).renderSingleBoneValue is not DefaultRender.renderSingleBoneValue
+        ):
+            render_bone_value = self.renderBoneValue
+            return lambda skel: render_bone_value(bone, skel, name)
+
+        languages = bone.languages
+
+        if isinstance(bone, (bones.RelationalBone, bones.RecordBone, bones.PasswordBone)):
+            if isinstance(bone, bones.RelationalBone):
+                render_skel_values = self.renderSkelValues
+                inject_download_url = isinstance(bone, bones.FileBone)
+
+                def render(value):
+                    if isinstance(value, dict):
+                        return {
+                            "dest": render_skel_values(value["dest"], injectDownloadURL=inject_download_url),
+                            "rel": (render_skel_values(value["rel"], injectDownloadURL=inject_download_url)
+                                    if value["rel"] else None),
+                        }
+
+                    return None
+
+            elif isinstance(bone, bones.RecordBone):
+                render = self.renderSkelValues
+            else:
+                def render(value):
+                    return ""
+
+            if languages and bone.multiple:
+                def render_bone(skel):
+                    value = skel[name]
+                    return {
+                        language: [render(v) for v in value[language]]
+                        if value and language in value and value[language] else []
+                        for language in languages
+                    }
+
+            elif languages:
+                def render_bone(skel):
+                    value = skel[name]
+                    return {
+                        language: render(value[language])
+                        if value and language in value and value[language] is not None else None
+                        for language in languages
+                    }
+
+            elif bone.multiple:
+                def render_bone(skel):
+                    return [render(v) for v in value] if (value := skel[name]) else None
+
+            else:
+                def render_bone(skel):
+                    return render(skel[name])
+
+            return render_bone
+
+        # Values of any other bone are rendered as they are
+        if languages and bone.multiple:
+            def render_bone(skel):
+                value = skel[name]
+                return {
+                    language: list(value[language]) if value and language in value and value[language] else []
+                    for language in languages
+                }
+
+        elif languages:
+            def render_bone(skel):
+                value = skel[name]
+                return {language: value[language] if value and language in value else None for language in languages}
+
+        elif bone.multiple:
+            def render_bone(skel):
+                return list(value) if (value := skel[name]) else None
+
+        else:
+            render_bone = operator.itemgetter(name)
+
+        return render_bone
+
     def renderSkelValues(self, skel: SkeletonInstance, injectDownloadURL: bool = False) -> t.Optional[dict]:
         """
         Prepares values of one :class:`viur.core.skeleton.Skeleton` or a list of skeletons for output.
@@ -133,10 +369,7 @@ class DefaultRender(AbstractRenderer):
         elif isinstance(skel, dict):
             return skel
 
-        res = {}
-
-        for key, bone in skel.items():
-            res[key] = self.renderBoneValue(bone, skel, key)
+        res = {name: render(skel) for name, render in self._get_render_plan(skel)}
 
         if (
             injectDownloadURL
@@ -158,11 +391,11 @@ class DefaultRender(AbstractRenderer):
         if isinstance(skel, list):
             vals = [self.renderSkelValues(x) for x in skel]
             if isinstance(skel[0], SkeletonInstance):
-                structure = DefaultRender.render_structure(skel[0].structure())
+                structure = DefaultRender.render_skel_structure(skel[0]).structure
 
         elif isinstance(skel, SkeletonInstance):
             vals = self.renderSkelValues(skel)
-            structure = DefaultRender.render_structure(skel.structure())
+            structure = DefaultRender.render_skel_structure(skel).structure
             errors = [{"severity": x.severity.value, "fieldPath": x.fieldPath, "errorMessage": x.errorMessage,
                        "invalidatedFields": x.invalidatedFields} for x in skel.errors]
 
@@ -178,7 +411,7 @@ class DefaultRender(AbstractRenderer):
         }
 
         current.request.get().response.headers["Content-Type"] = "application/json"
-        return json.dumps(res, cls=CustomJsonEncoder)
+        return dumps(res)
 
     def view(self, skel: SkeletonInstance, action: str = "view", params=None, **kwargs):
         return self.renderEntry(skel, action, params)
@@ -192,11 +425,21 @@ class DefaultRender(AbstractRenderer):
         if skellist:
             if isinstance(skellist[0], SkeletonInstance):
                 if "json.bone.structure.inlists" in conf.compatibility:
-                    structure = DefaultRender.render_structure(skellist[0].structure())
+                    structure = DefaultRender.render_skel_structure(skellist[0]).structure
 
                 cursor = skellist.getCursor()
                 orders = skellist.get_orders()
 
+            if conf.render_json_stream_lists:
+                current.request.get().response.headers["Content-Type"] = "application/json"
+                return self.stream_list(skellist, {
+                    "action": action,
+                    "cursor": cursor,
+                    "params": params,
+                    "structure": structure,
+                    "orders": orders,
+                })
+
             skellist = [self.renderSkelValues(skel) for skel in skellist]
         else:
             skellist = []
@@ -215,7 +458,37 @@ class DefaultRender(AbstractRenderer):
         }
 
         current.request.get().response.headers["Content-Type"] = "application/json"
-        return json.dumps(res, cls=CustomJsonEncoder)
+        return dumps(res)
+
+    def stream_list(self, skellist: t.Iterable[SkeletonInstance], envelope: dict) -> t.Iterator[bytes]:
+        """
+        Renders a list incrementally, as the body of a streamed response.
+
+        The envelope is emitted first, then each skeleton is rendered and encoded just when it's reached,
+        so the entire response never exists in memory at once.
+
+        :param skellist: The skeletons to render, can be any iterable.
+        :param envelope: The remaining members of the response, like the cursor and the structure.
+        """
+        head = dumps(envelope)
+
+        chunk = [f"""{head[:-1]}, "skellist": ["""]
+        size = 0
+        separator = ""
+
+        for skel in skellist:
+            value = separator + dumps(self.renderSkelValues(skel))
+            separator = ", "
+            chunk.append(value)
+            size += len(value)
+
+            if size >= self.stream_chunk_size:
+                yield "".join(chunk).encode("UTF-8")
+                chunk.clear()
+                size = 0
+
+        chunk.append("]}")
+        yield "".join(chunk).encode("UTF-8")
 
     def add(self, skel: SkeletonInstance, action: str = "add", params=None, **kwargs):
         return self.renderEntry(skel, action, params)
@@ -234,7 +507,7 @@ class DefaultRender(AbstractRenderer):
 
     def listRootNodes(self, rootNodes, *args, **kwargs):
         current.request.get().response.headers["Content-Type"] = "application/json"
-        return json.dumps(rootNodes, cls=CustomJsonEncoder)
+        return dumps(rootNodes)
 
     def render(self, action: str, skel: t.Optional[SkeletonInstance] = None, **kwargs):
         """
@@ -242,4 +515,10 @@ class DefaultRender(AbstractRenderer):
 
         Handles an action and a skeleton. It shall be used by any action, in future.
         """
-        return self.renderEntry(skel, action, params=kwargs)
+        res = self.renderEntry(skel, action, params=kwargs)
+
+        # Structures are requested constantly by clients, which can revalidate them by their ETag
+        if action.startswith("structure."):
+            current.request.get().conditional(hashlib.sha256(res.encode("UTF-8")).hexdigest())
+
+        return res
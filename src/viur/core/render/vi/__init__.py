@@ -1,5 +1,6 @@
 import datetime
 import fnmatch
+import hashlib
 import json
 import logging
 from viur.core import Module, conf, current, errors
@@ -54,7 +55,7 @@ def getStructure(module):
 
                     if isinstance(skel, SkeletonInstance):
                         storeType = stype.replace("Skel", "") + ("LeafSkel" if treeType == "leaf" else "NodeSkel")
-                        res[storeType] = DefaultRender.render_structure(skel.structure())
+                        res[storeType] = DefaultRender.render_skel_structure(skel)
     else:
         # every other prototype
         for stype in ("viewSkel", "editSkel", "addSkel"):  # Unknown skel type
@@ -64,10 +65,14 @@ def getStructure(module):
                 except (TypeError, ValueError):
                     continue
                 if isinstance(skel, SkeletonInstance):
-                    res[stype] = DefaultRender.render_structure(skel.structure())
+                    res[stype] = DefaultRender.render_skel_structure(skel)
+
+    # The response is identified by the versions of the structures it contains
+    etag = hashlib.sha256(" ".join(f"{stype}:{rendered.etag}" for stype, rendered in res.items()).encode())
+    current.request.get().conditional(etag.hexdigest())
 
     current.request.get().response.headers["Content-Type"] = "application/json"
-    return json.dumps(res or None, cls=CustomJsonEncoder)
+    return json.dumps({stype: rendered.structure for stype, rendered in res.items()} or None, cls=CustomJsonEncoder)
 
 
 @exposed
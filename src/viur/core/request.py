@@ -5,14 +5,17 @@
     Additionally, this module defines the RequestValidator interface which provides a very early hook into the
     request processing (useful for global ratelimiting, DDoS prevention or access control).
 """
+import contextvars
 import datetime
 import fnmatch
+import functools
 import json
 import logging
 import os
 import re
 import time
 import traceback
+import types
 import typing as t
 from abc import ABC, abstractmethod
 from urllib import parse
@@ -25,7 +28,7 @@ from viur.core import current, db, errors, session, utils
 from viur.core.config import conf
 from viur.core.logging import client as loggingClient, requestLogger, requestLoggingRessource
 from viur.core.module import Method
-from viur.core.securityheaders import extendCsp
+from viur.core.securityheaders import extendCsp, get_security_headers
 from viur.core.tasks import _appengineServiceIPs
 
 TEMPLATE_STYLE_KEY = "style"
@@ -80,6 +83,178 @@ class FetchMetaDataValidator(RequestValidator):
         return 403, "Forbidden", "Request rejected due to fetch metadata"
 
 
+class Route(t.NamedTuple):
+    """
+        Result of resolving a path with the :class:`RoutingTrie`.
+    """
+    method: Method | None
+    """The resolved method, None when the path couldn't be resolved"""
+
+    offset: int
+    """Number of path parts consumed by the resolution, the remaining parts are the positional arguments"""
+
+    guards: tuple[t.Callable[[], bool], ...]
+    """canAccess-functions of all nodes passed, which must be evaluated on every request"""
+
+    error: type[errors.HTTPException] | None = None
+    """The error to raise after all guards passed, when no method was found"""
+
+    allow: str = ""
+    """Precomputed value for the Allow header of OPTIONS requests"""
+
+    cors_headers: tuple[str, ...] = ()
+    """Precomputed, lower-cased CORS headers allowed by the method"""
+
+    cache_control: str | None = None
+    """The Cache-Control header for GET and HEAD requests, as set by :func:`viur.core.decorators.cache_control`"""
+
+
+class RouteNode:
+    """
+        Immutable node of the :class:`RoutingTrie`, compiled from one level of :attr:`conf.main_resolver`.
+    """
+    __slots__ = ("children", "can_access", "index")
+
+    def __init__(self, resolver: dict[str, t.Any], metadata: dict[Method, tuple[str, tuple[str, ...], str | None]]):
+        """
+            :param resolver: The resolver level to compile.
+            :param metadata: Collects the Allow header, the CORS headers and the Cache-Control header
+                of all methods found.
+        """
+        children = {}
+        for name, value in resolver.items():
+            if isinstance(value, dict):
+                # Empty modules can't be routed to, they are kept as None to end up in a NotFound
+                children[name] = RouteNode(value, metadata) if value else None
+            elif isinstance(value, Method):
+                children[name] = value
+                if value not in metadata:
+                    metadata[value] = (
+                        ", ".join(sorted(value.methods)).upper(),
+                        tuple(str(header).lower() for header in value.cors_allow_headers or ()),
+                        value.cache_control,
+                    )
+
+        self.children: t.Mapping[str, "RouteNode | Method | None"] = types.MappingProxyType(children)
+        self.can_access: t.Callable[[], bool] | None = resolver.get("canAccess")
+        self.index: Method | None = index if isinstance(index := resolver.get("index"), Method) else None
+
+    def __setattr__(self, name: str, value: t.Any):
+        if hasattr(self, "index"):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+
+        super().__setattr__(name, value)
+
+
+class RoutingTrie:
+    """
+        Routing trie compiled from :attr:`conf.main_resolver` once at :meth:`viur.core.setup` time.
+
+        Resolved paths are kept in a LRU cache of ``cache_size`` entries, so that the dispatch of recurring paths
+        doesn't require a walk through the trie. The canAccess-guards are never cached, they are part of the
+        returned :class:`Route` and must be evaluated by the caller on each request.
+    """
+
+    def __init__(self, resolver: dict[str, t.Any], cache_size: int = 1024):
+        """
+            :param resolver: The resolver to compile, usually :attr:`conf.main_resolver`.
+            :param cache_size: Maximum number of resolved paths to keep.
+        """
+        self.resolver = resolver
+        self.metadata = {}
+        self.root = RouteNode(resolver, self.metadata)
+        self.resolve = functools.lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, path_list: tuple[str, ...]) -> Route:
+        """
+            Resolves a path, following the same rules as :meth:`Router._route` always did.
+
+            :param path_list: The already unquoted and normalized parts of the path.
+        """
+        node = self.root
+        guards = []
+        idx = 0  # Count how may items from *args we'd have consumed (so the rest can go into *args of the called func
+
+        for part in path_list:
+            if node.can_access is not None:
+                guards.append(node.can_access)
+
+            idx += 1
+
+            if part not in node.children:
+                part = "index"
+
+            if child := node.children.get(part):
+                if isinstance(child, Method):
+                    if part == "index":
+                        idx -= 1
+
+                    return self._route(child, idx, guards)
+
+                elif part == "index":
+                    break
+
+                node = child
+
+            else:
+                break
+
+        else:
+            if node.index:
+                return self._route(node.index, idx, guards)
+
+            return Route(None, idx, tuple(guards), errors.MethodNotAllowed)
+
+        return Route(None, idx, tuple(guards), errors.NotFound)
+
+    def _route(self, method: Method, offset: int, guards: list[t.Callable[[], bool]]) -> Route:
+        allow, cors_headers, cache_control = self.metadata[method]
+        return Route(method, offset, tuple(guards), allow=allow, cors_headers=cors_headers, cache_control=cache_control)
+
+
+_routing_trie: RoutingTrie | None = None
+
+
+def compile_routes(resolver: dict[str, t.Any]) -> RoutingTrie:
+    """
+        Compiles the given resolver into the :class:`RoutingTrie` used by the :class:`Router`.
+
+        This is done by :meth:`viur.core.setup`; when :attr:`conf.main_resolver` is replaced afterwards,
+        the trie is recompiled on the next request.
+    """
+    global _routing_trie
+    _routing_trie = RoutingTrie(resolver, conf.routing_cache_size)
+    return _routing_trie
+
+
+def _iter_in_context(iterator: t.Iterator[bytes]) -> t.Iterator[bytes]:
+    """
+        Consumes a streamed response body within the context of the request which created it.
+
+        Streamed bodies are consumed by the WSGI server after the Router has finished and reset its
+        context variables, so the context (current.request, current.language, ...) is preserved here.
+    """
+    context = contextvars.copy_context()  # must be copied immediately, not on the first iteration
+    # The identity map of the request must not be used after it has ended, nor from another thread
+    context.run(db.request_cache.set, None)
+
+    def consume():
+        try:
+            while True:
+                try:
+                    chunk = context.run(next, iterator)
+                except StopIteration:
+                    return
+
+                yield chunk
+
+        finally:
+            if close := getattr(iterator, "close", None):
+                context.run(close)
+
+    return consume()
+
+
 class Router:
     """
         This class accepts the requests, collect its parameters and routes the request
@@ -134,6 +309,7 @@ class Router:
         self.isSSLConnection = self.request.host_url.lower().startswith("https://")  # We have an encrypted channel
 
         db.currentDbAccessLog.set(set())
+        db.request_cache.set({} if conf.db_request_cache else None)
 
         # Set context variables
         current.language.set(conf.i18n.default_language)
@@ -147,6 +323,7 @@ class Router:
         self._cors()
 
         # Unset context variables
+        db.request_cache.set(None)
         current.language.set(None)
         current.request_data.set(None)
         current.session.set(None)
@@ -271,39 +448,8 @@ class Router:
 
         path = self.request.path
 
-        # Add CSP headers early (if any)
-        if conf.security.content_security_policy and conf.security.content_security_policy["_headerCache"]:
-            for k, v in conf.security.content_security_policy["_headerCache"].items():
-                self.response.headers[k] = v
-        if self.isSSLConnection:  # Check for HTST and PKP headers only if we have a secure channel.
-            if conf.security.strict_transport_security:
-                self.response.headers["Strict-Transport-Security"] = conf.security.strict_transport_security
-        # Check for X-Security-Headers we shall emit
-        if conf.security.x_content_type_options:
-            self.response.headers["X-Content-Type-Options"] = "nosniff"
-        if conf.security.x_xss_protection is not None:
-            if conf.security.x_xss_protection:
-                self.response.headers["X-XSS-Protection"] = "1; mode=block"
-            elif conf.security.x_xss_protection is False:
-                self.response.headers["X-XSS-Protection"] = "0"
-        if conf.security.x_frame_options is not None and isinstance(conf.security.x_frame_options, tuple):
-            mode, uri = conf.security.x_frame_options
-            if mode in ["deny", "sameorigin"]:
-                self.response.headers["X-Frame-Options"] = mode
-            elif mode == "allow-from":
-                self.response.headers["X-Frame-Options"] = f"allow-from {uri}"
-        if conf.security.x_permitted_cross_domain_policies is not None:
-            self.response.headers["X-Permitted-Cross-Domain-Policies"] = conf.security.x_permitted_cross_domain_policies
-        if conf.security.referrer_policy:
-            self.response.headers["Referrer-Policy"] = conf.security.referrer_policy
-        if conf.security.permissions_policy.get("_headerCache"):
-            self.response.headers["Permissions-Policy"] = conf.security.permissions_policy["_headerCache"]
-        if conf.security.enable_coep:
-            self.response.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
-        if conf.security.enable_coop:
-            self.response.headers["Cross-Origin-Opener-Policy"] = conf.security.enable_coop
-        if conf.security.enable_corp:
-            self.response.headers["Cross-Origin-Resource-Policy"] = conf.security.enable_corp
+        # Add the security headers early, they are precomputed from conf.security
+        self.response.headerlist.extend(get_security_headers(self.isSSLConnection))
 
         # Ensure that TLS is used if required
         if conf.security.force_ssl and not self.isSSLConnection and not conf.instance.is_dev_server:
@@ -349,6 +495,10 @@ class Router:
 
             self._route(path)
 
+        except errors.NotModified as e:
+            self.response.status = f"{e.status} {e.name}"
+            self.response.body = b""
+
         except errors.Redirect as e:
             if conf.debug.trace_exceptions:
                 logging.warning("""conf.debug.trace_exceptions is set, won't handle this exception""")
@@ -475,6 +625,7 @@ class Router:
 
         if conf.instance.is_dev_server:
             self.is_deferred = True
+            db.request_cache.set(None)  # deferred tasks must not read from the identity map of the request
 
             while self.pendingTasks:
                 task = self.pendingTasks.pop()
@@ -534,48 +685,27 @@ class Router:
         if "self" in self.kwargs or "return" in self.kwargs:  # self or return is reserved for bound methods
             raise errors.BadRequest()
 
-        caller = conf.main_resolver
-        idx = 0  # Count how may items from *args we'd have consumed (so the rest can go into *args of the called func
-        path_found = True
+        trie = _routing_trie
+        if trie is None or trie.resolver is not conf.main_resolver:
+            trie = compile_routes(conf.main_resolver)
+
+        route = trie.resolve(self.path_list)
 
-        for part in self.path_list:
-            # TODO: Remove canAccess guards... solve differently.
-            if "canAccess" in caller and not caller["canAccess"]():
+        # TODO: Remove canAccess guards... solve differently.
+        for guard in route.guards:
+            if not guard():
                 # We have a canAccess function guarding that object,
                 # and it returns False...
                 raise errors.Unauthorized()
 
-            idx += 1
-
-            if part not in caller:
-                part = "index"
-
-            if caller := caller.get(part):
-                if isinstance(caller, Method):
-                    if part == "index":
-                        idx -= 1
-
-                    self.args = tuple(self.path_list[idx:])
-                    break
-
-                elif part == "index":
-                    path_found = False
-                    break
-
-            else:
-                path_found = False
-                break
-
-        if not path_found:
+        if route.error is errors.NotFound:
             raise errors.NotFound(
-                f"""The path {utils.string.escape("/".join(self.path_list[:idx]))} could not be found""")
+                f"""The path {utils.string.escape("/".join(self.path_list[:route.offset]))} could not be found""")
+        elif route.error:
+            raise route.error()
 
-        if not isinstance(caller, Method):
-            # try to find "index" function
-            if (index := caller.get("index")) and isinstance(index, Method):
-                caller = index
-            else:
-                raise errors.MethodNotAllowed()
+        caller = route.method
+        self.args = self.path_list[route.offset:]
 
         # Check for internal exposed
         if caller.exposed is False and not self.internalRequest:
@@ -583,10 +713,14 @@ class Router:
 
         # Fill the Allow header of the response with the allowed HTTP methods
         if self.method == "options":
-            self.response.headers["Allow"] = ", ".join(sorted(caller.methods)).upper()
+            self.response.headers["Allow"] = route.allow
 
         # Register caller specific CORS headers
-        self.cors_headers = [str(header).lower() for header in caller.cors_allow_headers or ()]
+        self.cors_headers = route.cors_headers
+
+        # Apply the caller specific caching policy, it can still be changed by the caller
+        if route.cache_control and self.method in ("get", "head"):
+            self.response.headers["Cache-Control"] = route.cache_control
 
         # Check for @force_ssl flag
         if not self.internalRequest \
@@ -638,6 +772,10 @@ class Router:
             self.response.status = "204 No Content"
             return
 
+        if isinstance(res, t.Iterator):  # Stream iterators (e.g. generators) as the response body
+            self.response.app_iter = _iter_in_context(res)
+            return
+
         if not isinstance(res, bytes):  # Convert the result to bytes if it is not already!
             res = str(res).encode("UTF-8")
         self.response.write(res)
@@ -753,6 +891,52 @@ class Router:
                     f"Don't append CORS-preflight request headers"
                 )
 
+    def conditional(self, etag: str | None = None, last_modified: datetime.datetime | None = None) -> None:
+        """
+        Sets the validators of the response, and answers a GET or HEAD request with 304 Not Modified
+        when the client already has this version of the response.
+
+        The client's version is compared by its If-None-Match header against the ETag, or, when it doesn't send
+        any ETag, by its If-Modified-Since header against the time of the last modification.
+        Unless a caching policy is set, the client is told to revalidate its version on every use.
+
+        It should be called as early as possible, to skip any work for rendering the response.
+        Internal requests are ignored.
+
+        :param etag: An identifier of the current version of the response.
+        :param last_modified: The time of the last modification of the response's content.
+
+        :raises: :exc:`viur.core.errors.NotModified`, if the client has this version.
+        """
+        if self.internalRequest:  # validators only apply to the response of the outer request
+            return
+
+        if etag:
+            self.response.etag = etag
+
+        if last_modified:
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+
+            self.response.last_modified = last_modified
+
+        if "Cache-Control" not in self.response.headers:
+            self.response.headers["Cache-Control"] = "private, no-cache"
+
+        if self.method not in ("get", "head"):
+            return
+
+        if self.request.if_none_match:
+            if etag and etag in self.request.if_none_match:
+                raise errors.NotModified()
+
+        elif (
+            last_modified
+            and (modified_since := self.request.if_modified_since)
+            and last_modified.replace(microsecond=0) <= modified_since
+        ):
+            raise errors.NotModified()
+
     def saveSession(self) -> None:
         current.session.get().save()
 
@@ -44,6 +44,9 @@ from viur.core import current
 import logging
 import typing as t
 
+_header_cache: dict[bool, tuple[tuple[str, str], ...]] = {}
+"""Precomputed security headers, for secure and insecure connections"""
+
 
 def addCspRule(objectType: str, srcOrDirective: str, enforceMode: str = "monitor"):
     """
@@ -99,6 +102,7 @@ def addCspRule(objectType: str, srcOrDirective: str, enforceMode: str = "monitor
             conf.security.content_security_policy[enforceMode][objectType] = []
         if srcOrDirective not in conf.security.content_security_policy[enforceMode][objectType]:
             conf.security.content_security_policy[enforceMode][objectType].append(srcOrDirective)
+    _header_cache.clear()
 
 
 def _rebuildCspHeaderCache():
@@ -128,6 +132,7 @@ def _rebuildCspHeaderCache():
                 "Content-Security-Policy-Report-Only"] = resStr
         else:
             conf.security.content_security_policy["_headerCache"]["Content-Security-Policy"] = resStr
+    _header_cache.clear()
 
 
 def extendCsp(additionalRules: dict = None, overrideRules: dict = None) -> None:
@@ -187,6 +192,7 @@ def enableStrictTransportSecurity(maxAge: int = 365 * 24 * 60 * 60,
         conf.security.strict_transport_security += "; includeSubDomains"
     if preload:
         conf.security.strict_transport_security += "; preload"
+    _header_cache.clear()
 
 
 def setXFrameOptions(action: str, uri: t.Optional[str] = None) -> None:
@@ -203,6 +209,7 @@ def setXFrameOptions(action: str, uri: t.Optional[str] = None) -> None:
         if uri is None or not (uri.lower().startswith("https://") or uri.lower().startswith("http://")):
             raise ValueError("If action is allow-from, an uri MUST be given and start with http(s)://")
         conf.security.x_frame_options = (action, uri)
+    _header_cache.clear()
 
 
 def setXXssProtection(enable: t.Optional[bool]) -> None:
@@ -214,6 +221,7 @@ def setXXssProtection(enable: t.Optional[bool]) -> None:
         conf.security.x_xss_protection = enable
     else:
         raise ValueError("enable must be exactly one of None | True | False")
+    _header_cache.clear()
 
 
 def setXContentTypeNoSniff(enable: bool) -> None:
@@ -225,12 +233,14 @@ def setXContentTypeNoSniff(enable: bool) -> None:
         conf.security.x_content_type_options = enable
     else:
         raise ValueError("enable must be one of True | False")
+    _header_cache.clear()
 
 
 def setXPermittedCrossDomainPolicies(value: str) -> None:
     if value not in [None, "none", "master-only", "by-content-type", "all"]:
         raise ValueError("value [None, \"none\", \"master-only\", \"by-content-type\", \"all\"]")
     conf.security.x_permitted_cross_domain_policies = value
+    _header_cache.clear()
 
 
 # Valid values for the referrer-header as per https://www.w3.org/TR/referrer-policy/#referrer-policies
@@ -252,6 +262,7 @@ def setReferrerPolicy(policy: str):  # fixme: replace str with literal[validrefe
     """
     assert policy in validReferrerPolicies, f"Policy must be one of {validReferrerPolicies}"
     conf.security.referrer_policy = policy
+    _header_cache.clear()
 
 
 def _rebuildPermissionHeaderCache() -> None:
@@ -263,6 +274,7 @@ def _rebuildPermissionHeaderCache() -> None:
         "%s=(%s)" % (k, " ".join([("\"%s\"" % x if x != "self" else x) for x in v]))
         for k, v in conf.security.permissions_policy.items() if k != "_headerCache"
     ])
+    _header_cache.clear()
 
 
 def setPermissionPolicyDirective(directive: str, allowList: t.Optional[list[str]]) -> None:
@@ -275,6 +287,7 @@ def setPermissionPolicyDirective(directive: str, allowList: t.Optional[list[str]
                 Empty list means the feature will be disabled by the browser (it's not accessible by javascript)
     """
     conf.security.permissions_policy[directive] = allowList
+    _header_cache.clear()
 
 
 def setCrossOriginIsolation(coep: bool, coop: str, corp: str) -> None:
@@ -298,3 +311,61 @@ def setCrossOriginIsolation(coep: bool, coop: str, corp: str) -> None:
     conf.security.enable_coep = bool(coep)
     conf.security.enable_coop = coop
     conf.security.enable_corp = corp
+    _header_cache.clear()
+
+
+def get_security_headers(is_ssl: bool) -> tuple[tuple[str, str], ...]:
+    """
+        Returns the security headers to emit with every response, as configured in :attr:`conf.security`.
+
+        The headers are computed once and kept until they are invalidated by one of the setters of this module.
+        Changes made directly to :attr:`conf.security` after :meth:`viur.core.setup` must be followed by a
+        call to :meth:`invalidate_security_headers`.
+
+        :param is_ssl: Whether the headers are emitted on a secure channel, which adds Strict-Transport-Security.
+        :return: The (name, value)-pairs of the headers, in the order they should be emitted.
+    """
+    if (headers := _header_cache.get(is_ssl)) is not None:
+        return headers
+
+    security = conf.security
+    headers = []
+
+    if security.content_security_policy and security.content_security_policy["_headerCache"]:
+        headers.extend(security.content_security_policy["_headerCache"].items())
+    if is_ssl and security.strict_transport_security:  # Emit HTST headers only if we have a secure channel.
+        headers.append(("Strict-Transport-Security", security.strict_transport_security))
+    if security.x_content_type_options:
+        headers.append(("X-Content-Type-Options", "nosniff"))
+    if security.x_xss_protection:
+        headers.append(("X-XSS-Protection", "1; mode=block"))
+    elif security.x_xss_protection is False:
+        headers.append(("X-XSS-Protection", "0"))
+    if security.x_frame_options is not None and isinstance(security.x_frame_options, tuple):
+        mode, uri = security.x_frame_options
+        if mode in ["deny", "sameorigin"]:
+            headers.append(("X-Frame-Options", mode))
+        elif mode == "allow-from":
+            headers.append(("X-Frame-Options", f"allow-from {uri}"))
+    if security.x_permitted_cross_domain_policies is not None:
+        headers.append(("X-Permitted-Cross-Domain-Policies", security.x_permitted_cross_domain_policies))
+    if security.referrer_policy:
+        headers.append(("Referrer-Policy", security.referrer_policy))
+    if security.permissions_policy.get("_headerCache"):
+        headers.append(("Permissions-Policy", security.permissions_policy["_headerCache"]))
+    if security.enable_coep:
+        headers.append(("Cross-Origin-Embedder-Policy", "require-corp"))
+    if security.enable_coop:
+        headers.append(("Cross-Origin-Opener-Policy", security.enable_coop))
+    if security.enable_corp:
+        headers.append(("Cross-Origin-Resource-Policy", security.enable_corp))
+
+    headers = _header_cache[is_ssl] = tuple(headers)
+    return headers
+
+
+def invalidate_security_headers() -> None:
+    """
+        Drops the precomputed security headers, so they are rebuilt from :attr:`conf.security` on the next request.
+    """
+    _header_cache.clear()
@@ -16,10 +16,21 @@
         programmatic access (admin tools, import tools etc.) where CSRF attacks are not applicable.
 
         Therefor that header is prefixed with "Sec-" - so it cannot be read or set using JavaScript.
+
+    ..note:
+        With `conf.security.skey_stateless` enabled, security keys without custom data aren't stored in the datastore.
+        They are HMAC signatures over the session, their expiry and a nonce instead, which are validated without any
+        datastore access. As they can't be deleted on use, every instance remembers the stateless keys redeemed
+        recently in a bounded :class:`ReplayCache`.
 """
+import base64
+import collections
 import typing as t
 import datetime
+import hashlib
 import hmac
+import threading
+import time
 from viur.core import conf, utils, current, db, tasks
 
 SECURITYKEY_KINDNAME = "viur-securitykey"
@@ -32,6 +43,63 @@ SECURITYKEY_STATIC_SKEY: t.Final[str] = "STATIC_SESSION_KEY"
 that the session key from the headers should be used."""
 
 
+class ReplayCache:
+    """
+        Bounded in-memory set of the stateless security keys redeemed on this instance.
+
+        :param max_entries: Maximum number of keys remembered; The oldest ones are forgotten first.
+    """
+
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[str, float] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def redeem(self, key: str, until: float) -> bool:
+        """
+            Marks *key*, which is valid until the timestamp *until*, as redeemed.
+
+            :returns: False, if *key* has already been redeemed before.
+        """
+        with self._lock:
+            if (expires := self._entries.get(key)) is not None and expires >= time.time():
+                return False
+
+            self._entries[key] = until
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            return True
+
+
+_replay_cache = None
+
+
+def _get_replay_cache() -> ReplayCache | None:
+    global _replay_cache
+
+    if not conf.security.skey_replay_cache_size:
+        return None
+
+    if _replay_cache is None:
+        _replay_cache = ReplayCache(conf.security.skey_replay_cache_size)
+
+    return _replay_cache
+
+
+def _sign(session_key: str | None, until: int, nonce: str) -> str:
+    """
+        Computes the signature of a stateless security key.
+    """
+    assert conf.file_hmac_key is not None, "No hmac-key set!"
+    secret = hmac.new(conf.file_hmac_key, b"viur-securitykey", hashlib.sha256).digest()
+    digest = hmac.new(secret, f"{session_key or ''}|{until}|{nonce}".encode("UTF-8"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ASCII")
+
+
 def create(
         duration: None | int | datetime.timedelta = None,
         session_bound: bool = True,
@@ -49,22 +117,33 @@ def create(
         :param indexed: Indexes all values stored with the security-key (default), set False to not index.
         :param custom_data: Any other data is stored with the CSRF-token, for later re-use.
 
-        :returns: The new one-time key, which is a randomized string.
+        :returns: The new one-time key, which is a randomized string,
+            or a signature when stateless security keys are enabled and no custom data is given.
     """
     if any(k.startswith("viur_") for k in custom_data):
         raise ValueError("custom_data keys with a 'viur_'-prefix are reserved.")
 
     if not duration:
         duration = conf.user.session_life_time if session_bound else SECURITYKEY_DURATION
-    key = utils.string.random(key_length)
 
-    entity = db.Entity(db.Key(SECURITYKEY_KINDNAME, key))
-    entity |= custom_data
+    session_key = None
     if session_bound:
         session = current.session.get()
         if not session.loaded:
             session.reset()
-        entity["viur_session"] = session.cookie_key
+        session_key = session.cookie_key
+
+    if conf.security.skey_stateless and not custom_data:
+        until = int(time.time() + utils.parse.timedelta(duration).total_seconds())
+        nonce = utils.string.random(8)
+        return f"{until}.{nonce}.{_sign(session_key, until, nonce)}"
+
+    key = utils.string.random(key_length)
+
+    entity = db.Entity(db.Key(SECURITYKEY_KINDNAME, key))
+    entity |= custom_data
+    if session_bound:
+        entity["viur_session"] = session_key
 
     else:
         entity["viur_session"] = None
@@ -95,6 +174,9 @@ def validate(key: str, session_bound: bool = True) -> bool | db.Entity:
 
         return False
 
+    if key and "." in key:  # Random keys never contain dots, stateless keys always do
+        return _validate_stateless(key, session_bound)
+
     if not key or not (entity := db.Get(db.Key(SECURITYKEY_KINDNAME, key))):
         return False
 
@@ -119,6 +201,30 @@ def validate(key: str, session_bound: bool = True) -> bool | db.Entity:
     return entity or True
 
 
+def _validate_stateless(key: str, session_bound: bool) -> bool:
+    """
+        Validates a stateless CSRF-security-key, see :func:`validate`.
+    """
+    try:
+        until, nonce, signature = key.split(".")
+        until = int(until)
+    except ValueError:
+        return False
+
+    # Key has expired?
+    if until < time.time():
+        return False
+
+    session_key = current.session.get().cookie_key if session_bound else None
+    if not hmac.compare_digest(_sign(session_key, until, nonce), signature):
+        return False
+
+    if (replay_cache := _get_replay_cache()) and not replay_cache.redeem(key, until):
+        return False
+
+    return True
+
+
 @tasks.PeriodicTask(interval=datetime.timedelta(hours=4))
 def periodic_clear_skeys():
     from viur.core import tasks
@@ -1,4 +1,9 @@
+import base64
+import copy
 import datetime
+import hashlib
+import hmac
+import json
 import logging
 import time
 import typing as t
@@ -7,6 +12,15 @@ from viur.core import current, db, tasks, utils
 from viur.core.config import conf  # this import has to stay alone due partial import
 from viur.core.tasks import DeleteEntitiesIter
 
+if t.TYPE_CHECKING:  # pragma: no cover
+    from viur.core.cache import CacheBackend
+
+cryptography_dependencies = True
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ModuleNotFoundError:
+    cryptography_dependencies = False
+
 """
     Provides the session implementation for the Google AppEngine™ based on the datastore.
     To access the current session,  and call current.session.get()
@@ -29,6 +43,238 @@ _SENTINEL: t.Final[object] = object()
 TObserver = t.TypeVar("TObserver", bound=t.Callable[[db.Entity], None])
 """Type of the observer for :meth:`Session.on_delete`"""
 
+LASTSEEN_REFRESH_INTERVAL: t.Final[int] = 5 * 60
+"""Seconds after which the lastseen timestamp of an otherwise unchanged session is written again"""
+
+
+class SessionBackend:
+    """
+        Interface for the storage of sessions.
+
+        A session is stored as a dict with the keys `data`, `static_security_key`, `lastseen` and `user`
+        under the key provided by the session cookie.
+
+        Custom implementations can be plugged in by setting `conf.user.session_backend`.
+    """
+
+    def load(self, cookie_key: str) -> dict[str, t.Any] | None:
+        """
+            Returns the session stored under *cookie_key*, or None if it doesn't exist.
+        """
+        raise NotImplementedError()
+
+    def save(self, cookie_key: str, entry: dict[str, t.Any]) -> None:
+        """
+            Stores the session *entry* under *cookie_key*.
+        """
+        raise NotImplementedError()
+
+    def delete(self, cookie_key: str) -> None:
+        """
+            Removes the session stored under *cookie_key*.
+        """
+        raise NotImplementedError()
+
+    def evict(self, cookie_key: str) -> None:
+        """
+            Drops any copy of the session *cookie_key* held in front of the datastore by the current instance,
+            after it has been deleted from the datastore directly.
+        """
+        pass
+
+    def revoke(self, cookie_keys: list[str]) -> None:
+        """
+            Drops any copy of the sessions *cookie_keys* held in front of the datastore by any instance,
+            after they have been deleted from the datastore directly.
+        """
+        for cookie_key in cookie_keys:
+            self.evict(cookie_key)
+
+
+class DatastoreSessionBackend(SessionBackend):
+    """
+        Stores sessions as entities of the kind "viur-session" in the datastore.
+    """
+
+    def load(self, cookie_key: str) -> dict[str, t.Any] | None:
+        return db.Get(db.Key(Session.kindName, cookie_key))
+
+    def save(self, cookie_key: str, entry: dict[str, t.Any]) -> None:
+        db_session = db.Entity(db.Key(Session.kindName, cookie_key))
+        db_session.update(entry)
+        db_session.exclude_from_indexes = {"data"}
+        db.Put(db_session)
+
+    def delete(self, cookie_key: str) -> None:
+        db.Delete(db.Key(Session.kindName, cookie_key))
+
+
+SESSION_GENERATION_KIND: t.Final[str] = "viur-session-generation"
+"""Kind of the generation counters of revoked sessions, see :class:`TieredSessionBackend`"""
+
+
+class TieredSessionBackend(SessionBackend):
+    """
+        Holds sessions in a cache tier in front of another session backend, which stays the source of truth.
+
+        Sessions are written through to *backend*, and loaded from the cache tier as long as they are held there.
+        A :class:`viur.core.cache.MemoryCacheBackend` keeps sessions in the memory of the current instance;
+        As other instances don't notice when a session is deleted there, e.g. on logout or by
+        :func:`killSessionByUser`, revoking a session increments its generation counter in the datastore
+        (see :class:`viur.core.cache.GenerationCache`). A session is only served from such a tier while its counter
+        is unchanged. The counter is re-checked at most once per `conf.cache_generation_check_interval`, so
+        loading a session costs one datastore lookup per interval instead of one per request.
+        Modifications made elsewhere are still only noticed after the `ttl` of the tier.
+        Expired sessions aren't revoked, as they are rejected anyway.
+
+        Any other :class:`viur.core.cache.CacheBackend`, e.g. one based on a shared Redis server, is considered
+        to be shared by all instances and doesn't require these checks.
+
+        :param cache: The cache tier.
+        :param backend: The backend behind the cache tier, defaults to the datastore.
+        :param shared: Is the cache tier shared by all instances?
+            Defaults to True for any cache tier except a :class:`viur.core.cache.MemoryCacheBackend`.
+        :param max_generations: Maximum number of generation counters held in memory.
+    """
+
+    def __init__(
+        self,
+        cache: "CacheBackend",
+        backend: SessionBackend | None = None,
+        *,
+        shared: bool | None = None,
+        max_generations: int = 10_000,
+    ):
+        from viur.core.cache import GenerationCache, MemoryCacheBackend
+
+        super().__init__()
+        self.cache = cache
+        self.backend = backend or DatastoreSessionBackend()
+        self.shared = not isinstance(cache, MemoryCacheBackend) if shared is None else shared
+        self.generations = GenerationCache(SESSION_GENERATION_KIND, max_size=max_generations)
+
+    def _generation(self, cookie_key: str) -> int | None:
+        """
+            Returns the current generation of the session *cookie_key*, or None if the cache tier is shared.
+        """
+        if self.shared:
+            return None
+
+        return self.generations.get((cookie_key, ))[cookie_key]
+
+    def load(self, cookie_key: str) -> dict[str, t.Any] | None:
+        generation = self._generation(cookie_key)
+
+        if entry := self.cache.get(cookie_key):
+            entry = copy.deepcopy(entry)
+            if entry.pop("generation", None) == generation:
+                return entry
+
+            self.cache.delete(cookie_key)  # revoked by another instance in the meantime
+
+        if entry := self.backend.load(cookie_key):
+            self.cache.set(cookie_key, copy.deepcopy(dict(entry)) | {"generation": generation})
+
+        return entry
+
+    def save(self, cookie_key: str, entry: dict[str, t.Any]) -> None:
+        self.backend.save(cookie_key, entry)
+        self.cache.set(cookie_key, copy.deepcopy(dict(entry)) | {"generation": self._generation(cookie_key)})
+
+    def delete(self, cookie_key: str) -> None:
+        self.cache.delete(cookie_key)
+        self.backend.delete(cookie_key)
+
+        if not self.shared:
+            self.generations.increment([cookie_key])
+
+    def evict(self, cookie_key: str) -> None:
+        self.cache.delete(cookie_key)
+        self.backend.evict(cookie_key)
+
+    def revoke(self, cookie_keys: list[str]) -> None:
+        for cookie_key in cookie_keys:
+            self.cache.delete(cookie_key)
+
+        self.backend.revoke(cookie_keys)
+
+        if not self.shared and cookie_keys:
+            self.generations.increment(cookie_keys)
+
+
+def _stateless_secret() -> bytes:
+    """
+        Derives the key for signing and encrypting stateless sessions from the instance's hmac-key.
+    """
+    assert conf.file_hmac_key is not None, "No hmac-key set!"
+    return hashlib.sha256(b"viur-session:" + conf.file_hmac_key).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ASCII")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def seal(raw: bytes) -> str:
+    """
+        Turns *raw* into a cookie value, which is signed with HMAC-SHA256,
+        or encrypted when `conf.user.session_stateless_encrypt` is set.
+    """
+    if conf.user.session_stateless_encrypt:
+        if not cryptography_dependencies:
+            raise ImportError("conf.user.session_stateless_encrypt requires the 'cryptography' package")
+
+        return "e." + Fernet(base64.urlsafe_b64encode(_stateless_secret())).encrypt(raw).decode("ASCII")
+
+    signature = hmac.new(_stateless_secret(), raw, hashlib.sha256).digest()
+    return f"s.{_b64encode(raw)}.{_b64encode(signature)}"
+
+
+def unseal(value: str) -> bytes | None:
+    """
+        Returns the data sealed into the cookie *value* by :func:`seal`, or None if it has been tampered with.
+    """
+    mode, _, sealed = value.partition(".")
+
+    if mode == "e" and cryptography_dependencies:
+        try:
+            return Fernet(base64.urlsafe_b64encode(_stateless_secret())).decrypt(sealed.encode("ASCII"))
+        except (InvalidToken, UnicodeError):
+            return None
+
+    if mode == "s":
+        try:
+            payload, signature = sealed.split(".")
+            raw, signature = _b64decode(payload), _b64decode(signature)
+        except ValueError:  # includes binascii.Error and UnicodeError
+            return None
+
+        if hmac.compare_digest(hmac.new(_stateless_secret(), raw, hashlib.sha256).digest(), signature):
+            return raw
+
+    return None
+
+
+_datastore_backend = None
+
+
+def get_backend() -> SessionBackend:
+    """
+        Returns the session backend, which is either `conf.user.session_backend` or the datastore.
+    """
+    global _datastore_backend
+
+    if conf.user.session_backend is not None:
+        return conf.user.session_backend
+
+    if _datastore_backend is None:
+        _datastore_backend = DatastoreSessionBackend()
+
+    return _datastore_backend
+
 
 class Session(db.Entity):
     """
@@ -43,6 +289,11 @@ class Session(db.Entity):
         - The config variable conf.user.session_life_time: Determines, how long (in seconds) a session is valid.
             Even if :prop:use_session_cookie is set to True, the session is voided server-side after no request has been
             made within the configured lifetime.
+        - The config variable conf.user.session_backend allows to replace the storage of the sessions,
+            e.g. by a :class:`TieredSessionBackend` which holds sessions in a cache tier in front of the datastore.
+        - The config variable conf.user.session_stateless keeps the sessions of guests in a signed cookie instead,
+            as long as they fit into conf.user.session_stateless_max_size bytes and can be serialized as JSON.
+            Such sessions can't be invalidated server-side before they expire.
         - The config variables conf.user.session_persistent_fields_on_login and
             conf.user.session_persistent_fields_on_logout lists fields, that may survive a login/logout action.
             For security reasons, we completely destroy a session on login/logout (it will be deleted, a new empty
@@ -64,41 +315,102 @@ class Session(db.Entity):
         self.cookie_key = None
         self.static_security_key = None
         self.loaded = False
+        self.stateless = False  # Is this session kept in the cookie only?
+        self._forced = False
+        self._stored = None  # The session as it was loaded, to skip writes when only the timestamp has moved
 
     def load(self):
         """
             Initializes the Session.
 
-            If the client supplied a valid Cookie, the session is read from the datastore, otherwise a new,
+            If the client supplied a valid Cookie, the session is read from the session backend, otherwise a new,
             empty session will be initialized.
         """
 
         if cookie_key := current.request.get().request.cookies.get(self.cookie_name):
             cookie_key = str(cookie_key)
-            if data := db.Get(db.Key(self.kindName, cookie_key)):  # Loaded successfully
+            if stateless := "." in cookie_key:  # Session keys never contain dots, sealed sessions always do
+                cookie_key, data = self._load_stateless(cookie_key)
+            else:
+                data = get_backend().load(cookie_key)
+
+            if data:  # Loaded successfully
                 if data["lastseen"] < time.time() - conf.user.session_life_time:
                     # This session is too old
                     self.reset()
                     return False
 
                 self.loaded = True
+                self.stateless = stateless
                 self.cookie_key = cookie_key
 
                 super().clear()
                 super().update(data["data"])
 
                 self.static_security_key = data.get("static_security_key") or data.get("staticSecurityKey")
-                if data["lastseen"] < time.time() - 5 * 60:  # Refresh every 5 Minutes
+                self._stored = {
+                    "data": copy.deepcopy(dict(data["data"])),
+                    "static_security_key": self.static_security_key,
+                    "lastseen": data["lastseen"],
+                    "user": data.get("user"),
+                }
+
+                if data["lastseen"] < time.time() - LASTSEEN_REFRESH_INTERVAL:
                     self.changed = True
 
             else:
                 self.reset()
 
+    @staticmethod
+    def _load_stateless(value: str) -> tuple[str | None, dict[str, t.Any] | None]:
+        """
+            Unseals the stateless session from the cookie *value*.
+
+            :returns: The session's key and its entry, or None for both if the cookie is invalid.
+        """
+        if not (raw := unseal(value)):
+            logging.warning("Received a stateless session cookie with an invalid signature")
+            return None, None
+
+        payload = json.loads(raw)
+        return payload["key"], {
+            "data": payload["data"],
+            "static_security_key": payload["static_security_key"],
+            "lastseen": payload["lastseen"],
+            "user": Session.GUEST_USER,
+        }
+
+    def _seal_stateless(self, entry: dict[str, t.Any]) -> str | None:
+        """
+            Returns the session *entry* sealed into a cookie value,
+            or None if it can't be kept in a cookie and must be stored in the session backend.
+        """
+        payload = {
+            "key": self.cookie_key,
+            "data": dict(entry["data"]),
+            "static_security_key": entry["static_security_key"],
+            "lastseen": entry["lastseen"],
+        }
+
+        try:
+            raw = json.dumps(payload, separators=(",", ":")).encode("UTF-8")
+        except (TypeError, ValueError):  # Not serializable as JSON
+            return None
+
+        if json.loads(raw) != payload:  # Not losslessly serializable, e.g. tuples or non-string keys
+            return None
+
+        if len(value := seal(raw)) > conf.user.session_stateless_max_size:
+            return None
+
+        return value
+
     def save(self):
         """
-            Writes the session into the database.
+            Writes the session into the session backend.
 
-            Does nothing, in case the session hasn't been changed in the current request.
+            Does nothing, in case the session hasn't been changed in the current request,
+            or only its lastseen timestamp moved within the last 5 minutes.
         """
 
         if not self.changed:
@@ -119,15 +431,32 @@ class Session(db.Entity):
             self.cookie_key = utils.string.random(42)
             self.static_security_key = utils.string.random(13)
 
-        dbSession = db.Entity(db.Key(self.kindName, self.cookie_key))
-
-        dbSession["data"] = db.fixUnindexableProperties(self)
-        dbSession["static_security_key"] = self.static_security_key
-        dbSession["lastseen"] = time.time()
-        dbSession["user"] = str(user_key)  # allow filtering for users
-        dbSession.exclude_from_indexes = {"data"}
-
-        db.Put(dbSession)
+        entry = {
+            "data": db.fixUnindexableProperties(self),
+            "static_security_key": self.static_security_key,
+            "lastseen": time.time(),
+            "user": str(user_key),  # allow filtering for users
+        }
+
+        if (
+            not self._forced
+            and (stored := self._stored)
+            and stored["lastseen"] >= entry["lastseen"] - LASTSEEN_REFRESH_INTERVAL
+            and all(stored[k] == entry[k] for k in ("data", "static_security_key", "user"))
+        ):
+            return  # Nothing but the timestamp has moved
+
+        if (
+            conf.user.session_stateless
+            and entry["user"] == Session.GUEST_USER
+            and (self.stateless or not self._stored)  # Once stored in the backend, a session stays there
+            and (cookie_value := self._seal_stateless(entry))
+        ):
+            self.stateless = True
+        else:
+            self.stateless = False
+            get_backend().save(self.cookie_key, entry)
+            cookie_value = self.cookie_key
 
         # Provide Set-Cookie header entry with configured properties
         flags = (
@@ -139,7 +468,7 @@ class Session(db.Entity):
         )
 
         current_request.response.headerlist.append(
-            ("Set-Cookie", f"{self.cookie_name}={self.cookie_key};{';'.join([f for f in flags if f])}")
+            ("Set-Cookie", f"{self.cookie_name}={cookie_value};{';'.join([f for f in flags if f])}")
         )
 
     def __setitem__(self, key: str, item: t.Any):
@@ -159,6 +488,7 @@ class Session(db.Entity):
             even if it believes that this session hasn't changed.
         """
         self.changed = True
+        self._forced = True
 
     def reset(self) -> None:
         """
@@ -215,12 +545,16 @@ class Session(db.Entity):
 
     def clear(self) -> None:
         if self.cookie_key:
-            db.Delete(db.Key(self.kindName, self.cookie_key))
+            if not self.stateless:
+                get_backend().delete(self.cookie_key)
+
             from viur.core import securitykey
             securitykey.clear_session_skeys(self.cookie_key)
         current.request.get().response.delete_cookie(self.cookie_name)
         self.loaded = False
+        self.stateless = False
         self.cookie_key = None
+        self._stored = None
         super().clear()
 
     def popitem(self) -> t.Tuple[t.Any, t.Any]:
@@ -251,13 +585,37 @@ class DeleteSessionsIter(DeleteEntitiesIter):
 
     Each deleted entity triggers a _session delete event_
     which is dispatched by :meth:`Session.dispatch_on_delete`.
+
+    If *customData* contains `{"revoke": True}`, the sessions are revoked on all instances,
+    see :meth:`SessionBackend.revoke`; Otherwise, they are only evicted on the current one.
     """
 
+    @classmethod
+    def handleBatch(cls, entries: list[db.Entity], customData: t.Any) -> bool:
+        db.delete_multi([entry.key for entry in entries])
+        cls._evict([str(entry.key.id_or_name) for entry in entries], customData)
+
+        for entry in entries:
+            Session.dispatch_on_delete(entry)
+
+        return True
+
     @classmethod
     def handleEntry(cls, entry: db.Entity, customData: t.Any) -> None:
         db.Delete(entry.key)
+        cls._evict([str(entry.key.id_or_name)], customData)
         Session.dispatch_on_delete(entry)
 
+    @staticmethod
+    def _evict(cookie_keys: list[str], customData: t.Any) -> None:
+        backend = get_backend()
+
+        if customData and customData.get("revoke"):
+            backend.revoke(cookie_keys)
+        else:
+            for cookie_key in cookie_keys:
+                backend.evict(cookie_key)
+
 
 @tasks.CallDeferred
 def killSessionByUser(user: t.Optional[t.Union[str, "db.Key", None]] = None):
@@ -274,13 +632,20 @@ def killSessionByUser(user: t.Optional[t.Union[str, "db.Key", None]] = None):
     logging.info(f"Invalidating all sessions for {user=}")
 
     query = db.Query(Session.kindName).filter("user =", str(user))
-    DeleteSessionsIter.startIterOnQuery(query)
+    DeleteSessionsIter.startIterOnQuery(query, {"revoke": True})
 
 
 @tasks.PeriodicTask(interval=datetime.timedelta(hours=4))
 def start_clear_sessions():
     """
-        Removes old (expired) Sessions
+        Removes old (expired) Sessions, and the generation counters of sessions revoked before they would have expired
     """
+    from viur.core.cache import PurgeGenerationsIter
+
     query = db.Query(Session.kindName).filter("lastseen <", time.time() - (conf.user.session_life_time + 300))
     DeleteSessionsIter.startIterOnQuery(query)
+
+    # Any copy of a session revoked before this point in time is rejected by its lastseen anyway
+    cutoff = utils.utcNow() - datetime.timedelta(seconds=conf.user.session_life_time + 300)
+    query = db.Query(SESSION_GENERATION_KIND).filter("changedate <", cutoff)
+    PurgeGenerationsIter.startIterOnQuery(query, cutoff)
@@ -1,6 +1,7 @@
 from __future__ import annotations  # noqa: required for pre-defined annotations
 
 import copy
+import dataclasses
 import fnmatch
 import inspect
 import logging
@@ -42,6 +43,61 @@ ABSTRACT_SKEL_CLS_SUFFIX = "AbstractSkel"
 KeyType: t.TypeAlias = db.Key | str | int
 
 
+class BoneAccessorTable:
+    """
+        Compiled per skeleton class from its bone map, to speed up the value access of a SkeletonInstance.
+
+        Holds an unserializer for each bone and caches the attributes a SkeletonInstance loads from its
+        skeleton class. Bones which neither are multiple, nor have languages or a computation and don't
+        overwrite :meth:`BaseBone.unserialize` are unserialized by a fast path.
+    """
+    __slots__ = ("unserializers", "class_attributes")
+
+    def __init__(self, bone_map: dict[str, BaseBone]):
+        self.unserializers: dict[str, tuple[BaseBone, t.Callable[[SkeletonInstance, str], t.Any]]] = {
+            name: (bone, self._compile_unserializer(bone)) for name, bone in bone_map.items() if bone
+        }
+        self.class_attributes: dict[str, t.Any] = {}
+
+    @staticmethod
+    def _compile_unserializer(bone: BaseBone) -> t.Callable[[SkeletonInstance, str], t.Any]:
+        if (
+            type(bone).unserialize is not BaseBone.unserialize
+            or bone.multiple
+            or bone.languages
+            or bone.compute
+        ):
+            return bone.unserialize
+
+        unserialize = bone.unserialize
+        single_value_unserialize = bone.singleValueUnserialize
+
+        def unserialize_single(skel: SkeletonInstance, name: str) -> None:
+            if (value := skel.dbEntity.get(name, _UNDEFINED)) is _UNDEFINED:
+                unserialize(skel, name)  # default value or import
+            elif isinstance(value, dict) and "_viurLanguageWrapper_" in value:
+                unserialize(skel, name)  # written before languages have been removed
+            else:
+                if value and isinstance(value, list):
+                    value = value[0]
+
+                skel.accessedValues[name] = None if value is None else single_value_unserialize(value)
+
+        return unserialize_single
+
+    def unserialize(self, skel: SkeletonInstance, name: str, bone: BaseBone) -> None:
+        """
+            Unserializes the value of the bone ``name`` from the dbEntity of ``skel``.
+
+            Bones which aren't in the bone map of the skeleton class (e.g. assigned or cloned
+            at runtime) are unserialized by their own :meth:`BaseBone.unserialize`.
+        """
+        if (entry := self.unserializers.get(name)) and entry[0] is bone:
+            entry[1](skel, name)
+        else:
+            bone.unserialize(skel, name)
+
+
 class MetaBaseSkel(type):
     """
         This is the metaclass for Skeletons.
@@ -124,10 +180,30 @@ class MetaBaseSkel(type):
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
+        if key == "__boneMap__":
+            super().__setattr__("__boneAccessors__", BoneAccessorTable(value))
+        elif key != "__boneAccessors__":
+            MetaBaseSkel._invalidate_class_attributes(self)
+
         if isinstance(value, BaseBone):
             # Call BaseBone.__set_name__ manually for bones that are assigned at runtime
             value.__set_name__(self, key)
 
+    def __delattr__(self, key):
+        super().__delattr__(key)
+        MetaBaseSkel._invalidate_class_attributes(self)
+
+    @staticmethod
+    def _invalidate_class_attributes(cls):
+        """
+        Drops the class attributes cached by the BoneAccessorTable of cls and all its subclasses.
+        """
+        if accessors := cls.__dict__.get("__boneAccessors__"):
+            accessors.class_attributes.clear()
+
+        for subclass in type.__subclasses__(cls):
+            MetaBaseSkel._invalidate_class_attributes(subclass)
+
 
 class SkeletonInstance:
     """
@@ -259,11 +335,13 @@ class SkeletonInstance:
         if self.renderPreparation:
             if key in self.renderAccessedValues:
                 return self.renderAccessedValues[key]
+        elif key in self.accessedValues:
+            return self.accessedValues[key]
         if key not in self.accessedValues:
             boneInstance = self.boneMap.get(key, None)
             if boneInstance:
                 if self.dbEntity is not None:
-                    boneInstance.unserialize(self, key)
+                    self.skeletonCls.__boneAccessors__.unserialize(self, key, boneInstance)
                 else:
                     self.accessedValues[key] = boneInstance.getDefaultValue(self)
         if not self.renderPreparation:
@@ -312,6 +390,7 @@ class SkeletonInstance:
             "preProcessBlobLocks",
             "preProcessSerializedData",
             "read",
+            "read_multi",
             "refresh",
             "serialize",
             "setBoneValue",
@@ -319,7 +398,14 @@ class SkeletonInstance:
             "unserialize",
             "write",
         }:
-            return partial(getattr(self.skeletonCls, item), self)
+            # The attribute of the Skeleton class is cached, it's invalidated when the class is modified
+            class_attributes = self.skeletonCls.__boneAccessors__.class_attributes
+            if (class_value := class_attributes.get(item)) is None:
+                class_value = class_attributes[item] = getattr(self.skeletonCls, item)
+
+            # The partial is intentionally not cached per instance: It would reference the instance itself,
+            # so every SkeletonInstance would become part of a reference cycle, only freed by the garbage collector.
+            return partial(class_value, self)
 
         # Load a @property from the Skeleton class
         try:
@@ -943,6 +1029,24 @@ class SeoKeyBone(StringBone):
         return True
 
 
+WRITE_MULTI_CHUNK_SIZE = 50
+"""Default number of skeletons written within one transaction by :meth:`Skeleton.write_multi`."""
+
+
+@dataclasses.dataclass
+class _WriteOperation:
+    """
+        State of a single entity while it is written by :meth:`Skeleton.write` or :meth:`Skeleton.write_multi`.
+    """
+    write_skel: SkeletonInstance
+    skel: SkeletonInstance
+    is_add: bool
+    blob_list: set[str] = dataclasses.field(default_factory=set)
+    change_list: list[str] = dataclasses.field(default_factory=list)
+    unique_values: list[tuple[str, list, list]] = dataclasses.field(default_factory=list)
+    """Tuples of bone name, old and new unique values for all unique bones."""
+
+
 class Skeleton(BaseSkeleton, metaclass=MetaSkel):
     kindName: str = _UNDEFINED
     """
@@ -1169,6 +1273,58 @@ class Skeleton(BaseSkeleton, metaclass=MetaSkel):
 
         return skel.write()
 
+    @classmethod
+    def read_multi(cls, skel: SkeletonInstance, keys: t.Iterable[KeyType]) -> SkelList:
+        """
+            Read the entities with the given *keys* from the datastore with one multi-key lookup.
+
+            Every entity found is returned as a SkeletonInstance with the bones of *skel*, which unserializes
+            its values lazily on first access, like the results of a query. The order of *keys* is preserved,
+            and a key given several times is returned several times, but looked up only once.
+            Keys that could not be parsed or found are listed in the `missing_keys` attribute of the result.
+
+            Skeletons with a custom :meth:`read` are read one by one, to keep its behavior.
+
+            :param keys: :class:`viur.core.db.Key`, string, or int values of the entities to read.
+
+            :returns: A SkelList containing one SkeletonInstance per entity found.
+        """
+        res = SkelList(skel)
+
+        if cls.read.__func__ is not Skeleton.read.__func__ or "fromDB" in cls.__dict__:
+            for key in keys:
+                if (instance := SkeletonInstance(skel.skeletonCls, bone_map=skel.boneMap)).read(key):
+                    res.append(instance)
+                else:
+                    res.missing_keys.append(key)
+
+            return res
+
+        db_keys = []
+        for key in keys:
+            try:
+                db_keys.append(db.keyHelper(key, skel.kindName))
+            except (ValueError, NotImplementedError):  # This key did not parse
+                res.missing_keys.append(key)
+
+        if not db_keys:
+            return res
+
+        # Every key is looked up only once, even when it is requested several times
+        unique_keys = list(dict.fromkeys(db_keys))
+        entities = dict(zip(unique_keys, db.Get(unique_keys)))
+
+        for db_key in db_keys:
+            if (entity := entities[db_key]) is None:
+                res.missing_keys.append(db_key)
+                continue
+
+            instance = SkeletonInstance(skel.skeletonCls, bone_map=skel.boneMap)
+            instance.setEntity(entity)
+            res.append(instance)
+
+        return res
+
     @classmethod
     @deprecated(
         version="3.7.0",
@@ -1222,258 +1378,454 @@ class Skeleton(BaseSkeleton, metaclass=MetaSkel):
         assert skel.renderPreparation is None, "Cannot modify values while rendering"
 
         def __txn_write(write_skel):
-            db_key = write_skel["key"]
-            skel = write_skel.skeletonCls()
-
-            blob_list = set()
-            change_list = []
-            old_copy = {}
-            # Load the current values from Datastore or create a new, empty db.Entity
-            if not db_key:
-                # We'll generate the key we'll be stored under early so we can use it for locks etc
-                db_key = db.AllocateIDs(db.Key(skel.kindName))
-                skel.dbEntity = db.Entity(db_key)
-                is_add = True
+            op, = cls._write_chunk([write_skel], update_relations)
+            return op.skel.dbEntity.key, write_skel, op.change_list, op.is_add
+
+        # Parse provided key, if any, and set it to skel["key"]
+        if key:
+            skel["key"] = db.keyHelper(key, skel.kindName)
+
+        # Run transactional function
+        if db.IsInTransaction():
+            key, skel, change_list, is_add = __txn_write(skel)
+        else:
+            key, skel, change_list, is_add = db.RunInTransaction(__txn_write, skel)
+
+        cls._write_post(skel, key, change_list, is_add, update_relations)
+        return skel
+
+    @classmethod
+    def write_multi(
+        cls,
+        skels: t.Iterable[SkeletonInstance],
+        *,
+        update_relations: bool = True,
+        chunk_size: int = WRITE_MULTI_CHUNK_SIZE,
+    ) -> list[SkeletonInstance]:
+        """
+            Write several Skeletons to the datastore in batches.
+
+            Works like :meth:`write` for each of the given *skels*, but processes them in chunks of *chunk_size*
+            skeletons per transaction. For every chunk, the existing entities and the unique-value and blob locks
+            are fetched with one multi-key lookup each, and all entities and locks are written with one put.
+            SEO-keys, database adapters and postSavedHandlers are processed for every single entity, like in
+            :meth:`write`.
+
+            Skeletons with a custom :meth:`write` or a legacy `toDB` are written one by one, to keep their behavior.
+            When called inside a transaction, all skeletons are written within that transaction.
+
+            :param skels: The SkeletonInstances to write; They may be of different kinds.
+            :param update_relations: If False, the entities won't be marked dirty, see :meth:`write`.
+            :param chunk_size: Number of skeletons written per transaction. A transaction may contain at most
+                500 mutations; Each skeleton takes two of them, plus one for every changed unique value.
+
+            :returns: The written Skeletons, in the given order.
+        """
+        skels = list(skels)
+        batch = []
+
+        for skel in skels:
+            assert skel.renderPreparation is None, "Cannot modify values while rendering"
+            skel_cls = skel.skeletonCls
+
+            if "toDB" in skel_cls.__dict__ or skel_cls.write.__func__ is not Skeleton.write.__func__:
+                skel.write(update_relations=update_relations)
             else:
-                db_key = db.keyHelper(db_key, skel.kindName)
-                if db_obj := db.Get(db_key):
-                    skel.dbEntity = db_obj
-                    old_copy = {k: v for k, v in skel.dbEntity.items()}
-                    is_add = False
-                else:
-                    skel.dbEntity = db.Entity(db_key)
-                    is_add = True
+                batch.append(skel)
+
+        for i in range(0, len(batch), chunk_size):
+            chunk = batch[i:i + chunk_size]
 
-            skel.dbEntity.setdefault("viur", {})
+            if db.IsInTransaction():
+                ops = cls._write_chunk(chunk, update_relations)
+            else:
+                ops = db.RunInTransaction(cls._write_chunk, chunk, update_relations)
 
-            # Merge values and assemble unique properties
-            # Move accessed Values from srcSkel over to skel
-            skel.accessedValues = write_skel.accessedValues
+            for op in ops:
+                cls._write_post(op.write_skel, op.skel.dbEntity.key, op.change_list, op.is_add, update_relations)
 
-            write_skel["key"] = skel["key"] = db_key  # Ensure key stays set
-            write_skel.dbEntity = skel.dbEntity  # update write_skel's dbEntity
+        return skels
 
-            for bone_name, bone in skel.items():
-                if bone_name == "key":  # Explicitly skip key on top-level - this had been set above
-                    continue
+    @classmethod
+    def _write_chunk(cls, write_skels: list[SkeletonInstance], update_relations: bool) -> list[_WriteOperation]:
+        """
+            Transactional part of :meth:`write` and :meth:`write_multi`, writing one chunk of skeletons.
 
-                # Allow bones to perform outstanding "magic" operations before saving to db
-                bone.performMagic(skel, bone_name, isAdd=is_add)  # FIXME VIUR4: ANY MAGIC IN OUR CODE IS DEPRECATED!!!
-
-                if not (bone_name in skel.accessedValues or bone.compute) and bone_name not in skel.dbEntity:
-                    _ = skel[bone_name]  # Ensure the datastore is filled with the default value
-
-                if (
-                    bone_name in skel.accessedValues or bone.compute  # We can have a computed value on store
-                    or bone_name not in skel.dbEntity  # It has not been written and is not in the database
-                ):
-                    # Serialize bone into entity
-                    try:
-                        bone.serialize(skel, bone_name, True)
-                    except Exception as e:
-                        logging.error(
-                            f"Failed to serialize {bone_name=} ({bone=}): {skel.accessedValues[bone_name]=}"
-                        )
-                        raise e
+            The chunk is processed in stages: Collect all keys, fetch them with multi-key lookups,
+            decide about the changes, and finally write them with one put. This keeps the number of datastore
+            round-trips constant, regardless of the number of skeletons, unique bones and unique values.
+        """
+        # Allocate keys for new entities and fetch the existing ones with one lookup
+        db_keys = [
+            db.keyHelper(write_skel["key"], write_skel.kindName) if write_skel["key"] else None
+            for write_skel in write_skels
+        ]
 
-                # Obtain referenced blobs
-                blob_list.update(bone.getReferencedBlobs(skel, bone_name))
+        if new_idx := [idx for idx, db_key in enumerate(db_keys) if db_key is None]:
+            new_keys = db.AllocateIDs([db.Key(write_skels[idx].kindName) for idx in new_idx])
+            for idx, db_key in zip(new_idx, new_keys):
+                db_keys[idx] = db_key
 
-                # Check if the value has actually changed
-                if skel.dbEntity.get(bone_name) != old_copy.get(bone_name):
-                    change_list.append(bone_name)
+        if len(set(db_keys)) != len(db_keys):
+            raise ValueError("The same entity cannot be written twice within one chunk")
 
-                # Lock hashes from bones that must have unique values
-                if bone.unique:
-                    # Remember old hashes for bones that must have an unique value
-                    old_unique_values = []
-
-                    if f"{bone_name}_uniqueIndexValue" in skel.dbEntity["viur"]:
-                        old_unique_values = skel.dbEntity["viur"][f"{bone_name}_uniqueIndexValue"]
-                    # Check if the property is unique
-                    new_unique_values = bone.getUniquePropertyIndexValues(skel, bone_name)
-                    new_lock_kind = f"{skel.kindName}_{bone_name}_uniquePropertyIndex"
-                    for new_lock_value in new_unique_values:
-                        new_lock_key = db.Key(new_lock_kind, new_lock_value)
-                        if lock_db_obj := db.Get(new_lock_key):
-
-                            # There's already a lock for that value, check if we hold it
-                            if lock_db_obj["references"] != skel.dbEntity.key.id_or_name:
-                                # This value has already been claimed, and not by us
-                                # TODO: Use a custom exception class which is catchable with an try/except
-                                raise ValueError(
-                                    f"The unique value {skel[bone_name]!r} of bone {bone_name!r} "
-                                    f"has been recently claimed (by {new_lock_key=}).")
-                        else:
-                            # This value is locked for the first time, create a new lock-object
-                            lock_obj = db.Entity(new_lock_key)
-                            lock_obj["references"] = skel.dbEntity.key.id_or_name
-                            db.Put(lock_obj)
-                        if new_lock_value in old_unique_values:
-                            old_unique_values.remove(new_lock_value)
-                    skel.dbEntity["viur"][f"{bone_name}_uniqueIndexValue"] = new_unique_values
-
-                    # Remove any lock-object we're holding for values that we don't have anymore
-                    for old_unique_value in old_unique_values:
-                        # Try to delete the old lock
-
-                        old_lock_key = db.Key(f"{skel.kindName}_{bone_name}_uniquePropertyIndex", old_unique_value)
-                        if old_lock_obj := db.Get(old_lock_key):
-                            if old_lock_obj["references"] != skel.dbEntity.key.id_or_name:
-
-                                # We've been supposed to have that lock - but we don't.
-                                # Don't remove that lock as it now belongs to a different entry
-                                logging.critical("Detected Database corruption! A Value-Lock had been reassigned!")
-                            else:
-                                # It's our lock which we don't need anymore
-                                db.Delete(old_lock_key)
-                        else:
-                            logging.critical("Detected Database corruption! Could not delete stale lock-object!")
+        db_objs = {}
+        if existing_keys := [db_key for idx, db_key in enumerate(db_keys) if write_skels[idx]["key"]]:
+            db_objs = dict(zip(existing_keys, db.Get(existing_keys)))
+
+        ops = [
+            cls._write_prepare(write_skel, db_key, db_objs.get(db_key))
+            for write_skel, db_key in zip(write_skels, db_keys)
+        ]
+
+        # Fetch all unique-value locks and blob-locks involved with one lookup
+        lock_keys = {}  # used as an ordered set
+        for op in ops:
+            for bone_name, old_unique_values, new_unique_values in op.unique_values:
+                lock_kind = f"{op.skel.kindName}_{bone_name}_uniquePropertyIndex"
+                for value in chain(new_unique_values, old_unique_values):
+                    lock_keys[db.Key(lock_kind, value)] = None
+
+            if not op.is_add:
+                lock_keys[db.Key("viur-blob-locks", op.skel.dbEntity.key.id_or_name)] = None
+
+        locks = {}
+        if lock_keys:
+            locks = dict(zip(lock_keys, db.Get(list(lock_keys))))
+
+        lock_puts, lock_deletes = cls._write_unique_locks(ops, locks)
+
+        for op in ops:
+            cls._write_seo_keys(op.skel)
+            cls._write_finalize(op, update_relations)
+
+        # Write all entities, locks and blob-locks at once
+        entities = [op.skel.dbEntity for op in ops] + lock_puts
+        for op in ops:
+            old_blob_lock_obj = None
+            if not op.is_add:
+                old_blob_lock_obj = locks.get(db.Key("viur-blob-locks", op.skel.dbEntity.key.id_or_name))
 
-            # Delete legacy property (PR #1244)  #TODO: Remove in ViUR4
-            skel.dbEntity.pop("viur_incomming_relational_locks", None)
+            entities.append(cls._write_blob_lock(op, old_blob_lock_obj))
 
-            # Ensure the SEO-Keys are up-to-date
-            last_requested_seo_keys = skel.dbEntity["viur"].get("viurLastRequestedSeoKeys") or {}
-            last_set_seo_keys = skel.dbEntity["viur"].get("viurCurrentSeoKeys") or {}
-            # Filter garbage serialized into this field by the SeoKeyBone
-            last_set_seo_keys = {k: v for k, v in last_set_seo_keys.items() if not k.startswith("_") and v}
+        db.Put(entities)
 
-            if not isinstance(skel.dbEntity["viur"].get("viurCurrentSeoKeys"), dict):
-                skel.dbEntity["viur"]["viurCurrentSeoKeys"] = {}
+        if lock_deletes:
+            db.Delete(lock_deletes)
 
-            if current_seo_keys := skel.getCurrentSEOKeys():
-                # Convert to lower-case and remove certain characters
-                for lang, value in current_seo_keys.items():
-                    current_seo_keys[lang] = value.lower().translate(Skeleton.__seo_key_trans).strip()
+        return ops
 
-            for language in (conf.i18n.available_languages or [conf.i18n.default_language]):
-                if current_seo_keys and language in current_seo_keys:
-                    current_seo_key = current_seo_keys[language]
+    @classmethod
+    def _write_prepare(
+        cls,
+        write_skel: SkeletonInstance,
+        db_key: db.Key,
+        db_obj: db.Entity | None,
+    ) -> _WriteOperation:
+        """
+            Serializes *write_skel* into the entity *db_obj*, or a new entity for *db_key* when it does not exist yet.
+
+            Collects the referenced blobs, the changed bones and the unique values to be locked,
+            without performing any further datastore operations.
+        """
+        skel = write_skel.skeletonCls()
+
+        old_copy = {}
+        if db_obj:
+            skel.dbEntity = db_obj
+            old_copy = {k: v for k, v in skel.dbEntity.items()}
+            is_add = False
+        else:
+            skel.dbEntity = db.Entity(db_key)
+            is_add = True
+
+        skel.dbEntity.setdefault("viur", {})
+
+        # Merge values and assemble unique properties
+        # Move accessed Values from srcSkel over to skel
+        skel.accessedValues = write_skel.accessedValues
+
+        write_skel["key"] = skel["key"] = db_key  # Ensure key stays set
+        write_skel.dbEntity = skel.dbEntity  # update write_skel's dbEntity
+
+        op = _WriteOperation(write_skel, skel, is_add)
+
+        for bone_name, bone in skel.items():
+            if bone_name == "key":  # Explicitly skip key on top-level - this had been set above
+                continue
+
+            # Allow bones to perform outstanding "magic" operations before saving to db
+            bone.performMagic(skel, bone_name, isAdd=is_add)  # FIXME VIUR4: ANY MAGIC IN OUR CODE IS DEPRECATED!!!
+
+            if not (bone_name in skel.accessedValues or bone.compute) and bone_name not in skel.dbEntity:
+                _ = skel[bone_name]  # Ensure the datastore is filled with the default value
 
-                    if current_seo_key != last_requested_seo_keys.get(language):  # This one is new or has changed
-                        new_seo_key = current_seo_keys[language]
+            if (
+                bone_name in skel.accessedValues or bone.compute  # We can have a computed value on store
+                or bone_name not in skel.dbEntity  # It has not been written and is not in the database
+            ):
+                # Serialize bone into entity
+                try:
+                    bone.serialize(skel, bone_name, True)
+                except Exception as e:
+                    logging.error(
+                        f"Failed to serialize {bone_name=} ({bone=}): {skel.accessedValues[bone_name]=}"
+                    )
+                    raise e
+
+            # Obtain referenced blobs
+            op.blob_list.update(bone.getReferencedBlobs(skel, bone_name))
+
+            # Check if the value has actually changed
+            if skel.dbEntity.get(bone_name) != old_copy.get(bone_name):
+                op.change_list.append(bone_name)
+
+            # Remember old and new hashes for bones that must have an unique value
+            if bone.unique:
+                old_unique_values = skel.dbEntity["viur"].get(f"{bone_name}_uniqueIndexValue") or []
+                new_unique_values = bone.getUniquePropertyIndexValues(skel, bone_name)
+                op.unique_values.append((bone_name, old_unique_values, new_unique_values))
+                skel.dbEntity["viur"][f"{bone_name}_uniqueIndexValue"] = new_unique_values
+
+        # Delete legacy property (PR #1244)  #TODO: Remove in ViUR4
+        skel.dbEntity.pop("viur_incomming_relational_locks", None)
+
+        return op
+
+    @classmethod
+    def _write_unique_locks(
+        cls,
+        ops: list[_WriteOperation],
+        locks: dict[db.Key, db.Entity | None],
+    ) -> tuple[list[db.Entity], list[db.Key]]:
+        """
+            Decides about the unique-value locks to be created and deleted for the given write operations.
+
+            :param ops: The prepared write operations.
+            :param locks: The current lock entities, as fetched from the datastore.
 
-                        for _ in range(0, 3):
-                            entry_using_key = db.Query(skel.kindName).filter(
-                                "viur.viurActiveSeoKeys =", new_seo_key).getEntry()
+            :returns: The lock entities to be put and the keys of the lock entities to be deleted.
+        """
+        lock_puts = {}
+        lock_deletes = {}
+
+        # Release locks on values which aren't held anymore first, so they can be claimed within the same chunk
+        for op in ops:
+            skel_id = op.skel.dbEntity.key.id_or_name
 
-                            if entry_using_key and entry_using_key.key != skel.dbEntity.key:
-                                # It's not unique; append a random string and try again
-                                new_seo_key = f"{current_seo_keys[language]}-{utils.string.random(5).lower()}"
+            for bone_name, old_unique_values, new_unique_values in op.unique_values:
+                lock_kind = f"{op.skel.kindName}_{bone_name}_uniquePropertyIndex"
 
-                            else:
-                                # We found a new SeoKey
-                                break
+                for old_unique_value in old_unique_values:
+                    if old_unique_value in new_unique_values:
+                        continue
+
+                    old_lock_key = db.Key(lock_kind, old_unique_value)
+                    if old_lock_obj := locks.get(old_lock_key):
+                        if old_lock_obj["references"] != skel_id:
+                            # We've been supposed to have that lock - but we don't.
+                            # Don't remove that lock as it now belongs to a different entry
+                            logging.critical("Detected Database corruption! A Value-Lock had been reassigned!")
                         else:
-                            raise ValueError("Could not generate an unique seo key in 3 attempts")
+                            # It's our lock which we don't need anymore
+                            lock_deletes[old_lock_key] = None
+                    else:
+                        logging.critical("Detected Database corruption! Could not delete stale lock-object!")
+
+        for op in ops:
+            skel_id = op.skel.dbEntity.key.id_or_name
+
+            for bone_name, old_unique_values, new_unique_values in op.unique_values:
+                lock_kind = f"{op.skel.kindName}_{bone_name}_uniquePropertyIndex"
+
+                for new_lock_value in new_unique_values:
+                    new_lock_key = db.Key(lock_kind, new_lock_value)
+
+                    if new_lock_key in lock_puts:  # claimed within this chunk
+                        lock_db_obj = lock_puts[new_lock_key]
+                    elif new_lock_key not in lock_deletes:
+                        lock_db_obj = locks.get(new_lock_key)
+                    else:  # released within this chunk
+                        lock_db_obj = None
+
+                    if lock_db_obj:
+                        # There's already a lock for that value, check if we hold it
+                        if lock_db_obj["references"] != skel_id:
+                            # This value has already been claimed, and not by us
+                            # TODO: Use a custom exception class which is catchable with an try/except
+                            raise ValueError(
+                                f"The unique value {op.skel[bone_name]!r} of bone {bone_name!r} "
+                                f"has been recently claimed (by {new_lock_key=}).")
                     else:
-                        new_seo_key = current_seo_key
-                    last_set_seo_keys[language] = new_seo_key
+                        # This value is locked for the first time, create a new lock-object
+                        lock_obj = db.Entity(new_lock_key)
+                        lock_obj["references"] = skel_id
+                        lock_puts[new_lock_key] = lock_obj
+                        lock_deletes.pop(new_lock_key, None)
 
+        return list(lock_puts.values()), list(lock_deletes)
+
+    @classmethod
+    def _write_seo_keys(cls, skel: SkeletonInstance) -> None:
+        """
+            Ensures the SEO-Keys of *skel* are up-to-date.
+        """
+        last_requested_seo_keys = skel.dbEntity["viur"].get("viurLastRequestedSeoKeys") or {}
+        last_set_seo_keys = skel.dbEntity["viur"].get("viurCurrentSeoKeys") or {}
+        # Filter garbage serialized into this field by the SeoKeyBone
+        last_set_seo_keys = {k: v for k, v in last_set_seo_keys.items() if not k.startswith("_") and v}
+
+        if not isinstance(skel.dbEntity["viur"].get("viurCurrentSeoKeys"), dict):
+            skel.dbEntity["viur"]["viurCurrentSeoKeys"] = {}
+
+        if current_seo_keys := skel.getCurrentSEOKeys():
+            # Convert to lower-case and remove certain characters
+            for lang, value in current_seo_keys.items():
+                current_seo_keys[lang] = value.lower().translate(Skeleton.__seo_key_trans).strip()
+
+        for language in (conf.i18n.available_languages or [conf.i18n.default_language]):
+            if current_seo_keys and language in current_seo_keys:
+                current_seo_key = current_seo_keys[language]
+
+                if current_seo_key != last_requested_seo_keys.get(language):  # This one is new or has changed
+                    new_seo_key = current_seo_keys[language]
+
+                    for _ in range(0, 3):
+                        entry_using_key = db.Query(skel.kindName).filter(
+                            "viur.viurActiveSeoKeys =", new_seo_key).getEntry()
+
+                        if entry_using_key and entry_using_key.key != skel.dbEntity.key:
+                            # It's not unique; append a random string and try again
+                            new_seo_key = f"{current_seo_keys[language]}-{utils.string.random(5).lower()}"
+
+                        else:
+                            # We found a new SeoKey
+                            break
+                    else:
+                        raise ValueError("Could not generate an unique seo key in 3 attempts")
                 else:
-                    # We'll use the database-key instead
-                    last_set_seo_keys[language] = str(skel.dbEntity.key.id_or_name)
-
-                # Store the current, active key for that language
-                skel.dbEntity["viur"]["viurCurrentSeoKeys"][language] = last_set_seo_keys[language]
-
-            skel.dbEntity["viur"].setdefault("viurActiveSeoKeys", [])
-            for language, seo_key in last_set_seo_keys.items():
-                if skel.dbEntity["viur"]["viurCurrentSeoKeys"][language] not in \
-                        skel.dbEntity["viur"]["viurActiveSeoKeys"]:
-                    # Ensure the current, active seo key is in the list of all seo keys
-                    skel.dbEntity["viur"]["viurActiveSeoKeys"].insert(0, seo_key)
-            if str(skel.dbEntity.key.id_or_name) not in skel.dbEntity["viur"]["viurActiveSeoKeys"]:
-                # Ensure that key is also in there
-                skel.dbEntity["viur"]["viurActiveSeoKeys"].insert(0, str(skel.dbEntity.key.id_or_name))
-            # Trim to the last 200 used entries
-            skel.dbEntity["viur"]["viurActiveSeoKeys"] = skel.dbEntity["viur"]["viurActiveSeoKeys"][:200]
-            # Store lastRequestedKeys so further updates can run more efficient
-            skel.dbEntity["viur"]["viurLastRequestedSeoKeys"] = current_seo_keys
-
-            # mark entity as "dirty" when update_relations is set, to zero otherwise.
-            skel.dbEntity["viur"]["delayedUpdateTag"] = time.time() if update_relations else 0
-
-            skel.dbEntity = skel.preProcessSerializedData(skel.dbEntity)
-
-            # Allow the database adapter to apply last minute changes to the object
-            for adapter in skel.database_adapters:
-                adapter.prewrite(skel, is_add, change_list)
-
-            # ViUR2 import compatibility - remove properties containing. if we have a dict with the same name
-            def fixDotNames(entity):
-                for k, v in list(entity.items()):
-                    if isinstance(v, dict):
-                        for k2, v2 in list(entity.items()):
-                            if k2.startswith(f"{k}."):
-                                del entity[k2]
-                                backupKey = k2.replace(".", "__")
-                                entity[backupKey] = v2
-                                entity.exclude_from_indexes = set(entity.exclude_from_indexes) | {backupKey}
-                        fixDotNames(v)
-                    elif isinstance(v, list):
-                        for x in v:
-                            if isinstance(x, dict):
-                                fixDotNames(x)
-
-            # FIXME: REMOVE IN VIUR4
-            if conf.viur2import_blobsource:  # Try to fix these only when converting from ViUR2
-                fixDotNames(skel.dbEntity)
-
-            # Write the core entry back
-            db.Put(skel.dbEntity)
-
-            # Now write the blob-lock object
-            blob_list = skel.preProcessBlobLocks(blob_list)
-            if blob_list is None:
-                raise ValueError("Did you forget to return the blob_list somewhere inside getReferencedBlobs()?")
-            if None in blob_list:
-                msg = f"None is not valid in {blob_list=}"
-                logging.error(msg)
-                raise ValueError(msg)
-
-            if not is_add and (old_blob_lock_obj := db.Get(db.Key("viur-blob-locks", db_key.id_or_name))):
-                removed_blobs = set(old_blob_lock_obj.get("active_blob_references", [])) - blob_list
-                old_blob_lock_obj["active_blob_references"] = list(blob_list)
-                if old_blob_lock_obj["old_blob_references"] is None:
-                    old_blob_lock_obj["old_blob_references"] = list(removed_blobs)
-                else:
-                    old_blob_refs = set(old_blob_lock_obj["old_blob_references"])
-                    old_blob_refs.update(removed_blobs)  # Add removed blobs
-                    old_blob_refs -= blob_list  # Remove active blobs
-                    old_blob_lock_obj["old_blob_references"] = list(old_blob_refs)
-
-                old_blob_lock_obj["has_old_blob_references"] = bool(old_blob_lock_obj["old_blob_references"])
-                old_blob_lock_obj["is_stale"] = False
-                db.Put(old_blob_lock_obj)
-            else:  # We need to create a new blob-lock-object
-                blob_lock_obj = db.Entity(db.Key("viur-blob-locks", skel.dbEntity.key.id_or_name))
-                blob_lock_obj["active_blob_references"] = list(blob_list)
-                blob_lock_obj["old_blob_references"] = []
-                blob_lock_obj["has_old_blob_references"] = False
-                blob_lock_obj["is_stale"] = False
-                db.Put(blob_lock_obj)
-
-            return skel.dbEntity.key, write_skel, change_list, is_add
+                    new_seo_key = current_seo_key
+                last_set_seo_keys[language] = new_seo_key
 
-        # Parse provided key, if any, and set it to skel["key"]
-        if key:
-            skel["key"] = db.keyHelper(key, skel.kindName)
+            else:
+                # We'll use the database-key instead
+                last_set_seo_keys[language] = str(skel.dbEntity.key.id_or_name)
+
+            # Store the current, active key for that language
+            skel.dbEntity["viur"]["viurCurrentSeoKeys"][language] = last_set_seo_keys[language]
+
+        skel.dbEntity["viur"].setdefault("viurActiveSeoKeys", [])
+        for language, seo_key in last_set_seo_keys.items():
+            if skel.dbEntity["viur"]["viurCurrentSeoKeys"][language] not in \
+                    skel.dbEntity["viur"]["viurActiveSeoKeys"]:
+                # Ensure the current, active seo key is in the list of all seo keys
+                skel.dbEntity["viur"]["viurActiveSeoKeys"].insert(0, seo_key)
+        if str(skel.dbEntity.key.id_or_name) not in skel.dbEntity["viur"]["viurActiveSeoKeys"]:
+            # Ensure that key is also in there
+            skel.dbEntity["viur"]["viurActiveSeoKeys"].insert(0, str(skel.dbEntity.key.id_or_name))
+        # Trim to the last 200 used entries
+        skel.dbEntity["viur"]["viurActiveSeoKeys"] = skel.dbEntity["viur"]["viurActiveSeoKeys"][:200]
+        # Store lastRequestedKeys so further updates can run more efficient
+        skel.dbEntity["viur"]["viurLastRequestedSeoKeys"] = current_seo_keys
 
-        # Run transactional function
-        if db.IsInTransaction():
-            key, skel, change_list, is_add = __txn_write(skel)
-        else:
-            key, skel, change_list, is_add = db.RunInTransaction(__txn_write, skel)
+    @classmethod
+    def _write_finalize(cls, op: _WriteOperation, update_relations: bool) -> None:
+        """
+            Applies the last minute changes to the entity of *op* right before it is put,
+            and determines the final list of blobs to be locked.
+        """
+        skel = op.skel
+
+        # mark entity as "dirty" when update_relations is set, to zero otherwise.
+        skel.dbEntity["viur"]["delayedUpdateTag"] = time.time() if update_relations else 0
+
+        skel.dbEntity = skel.preProcessSerializedData(skel.dbEntity)
+
+        # Allow the database adapter to apply last minute changes to the object
+        for adapter in skel.database_adapters:
+            adapter.prewrite(skel, op.is_add, op.change_list)
+
+        # ViUR2 import compatibility - remove properties containing. if we have a dict with the same name
+        def fixDotNames(entity):
+            for k, v in list(entity.items()):
+                if isinstance(v, dict):
+                    for k2, v2 in list(entity.items()):
+                        if k2.startswith(f"{k}."):
+                            del entity[k2]
+                            backupKey = k2.replace(".", "__")
+                            entity[backupKey] = v2
+                            entity.exclude_from_indexes = set(entity.exclude_from_indexes) | {backupKey}
+                    fixDotNames(v)
+                elif isinstance(v, list):
+                    for x in v:
+                        if isinstance(x, dict):
+                            fixDotNames(x)
+
+        # FIXME: REMOVE IN VIUR4
+        if conf.viur2import_blobsource:  # Try to fix these only when converting from ViUR2
+            fixDotNames(skel.dbEntity)
+
+        blob_list = skel.preProcessBlobLocks(op.blob_list)
+        if blob_list is None:
+            raise ValueError("Did you forget to return the blob_list somewhere inside getReferencedBlobs()?")
+        if None in blob_list:
+            msg = f"None is not valid in {blob_list=}"
+            logging.error(msg)
+            raise ValueError(msg)
+
+        op.blob_list = blob_list
+
+    @classmethod
+    def _write_blob_lock(cls, op: _WriteOperation, old_blob_lock_obj: db.Entity | None) -> db.Entity:
+        """
+            Returns the updated blob-lock object for the entity of *op*, or a new one if *old_blob_lock_obj* is None.
+        """
+        blob_list = op.blob_list
+
+        if old_blob_lock_obj:
+            removed_blobs = set(old_blob_lock_obj.get("active_blob_references", [])) - blob_list
+            old_blob_lock_obj["active_blob_references"] = list(blob_list)
+            if old_blob_lock_obj["old_blob_references"] is None:
+                old_blob_lock_obj["old_blob_references"] = list(removed_blobs)
+            else:
+                old_blob_refs = set(old_blob_lock_obj["old_blob_references"])
+                old_blob_refs.update(removed_blobs)  # Add removed blobs
+                old_blob_refs -= blob_list  # Remove active blobs
+                old_blob_lock_obj["old_blob_references"] = list(old_blob_refs)
+
+            old_blob_lock_obj["has_old_blob_references"] = bool(old_blob_lock_obj["old_blob_references"])
+            old_blob_lock_obj["is_stale"] = False
+            return old_blob_lock_obj
+
+        # We need to create a new blob-lock-object
+        blob_lock_obj = db.Entity(db.Key("viur-blob-locks", op.skel.dbEntity.key.id_or_name))
+        blob_lock_obj["active_blob_references"] = list(blob_list)
+        blob_lock_obj["old_blob_references"] = []
+        blob_lock_obj["has_old_blob_references"] = False
+        blob_lock_obj["is_stale"] = False
+        return blob_lock_obj
 
+    @classmethod
+    def _write_post(
+        cls,
+        skel: SkeletonInstance,
+        key: db.Key,
+        change_list: list[str],
+        is_add: bool,
+        update_relations: bool,
+    ) -> None:
+        """
+            Runs the handlers and relation updates after *skel* has been written under *key*.
+        """
         for bone_name, bone in skel.items():
             bone.postSavedHandler(skel, bone_name, key)
 
         skel.postSavedHandler(key, skel.dbEntity)
 
         if update_relations and not is_add:
-            if change_list and len(change_list) < 5:  # Only a few bones have changed, process these individually
+            if conf.skeleton_update_relations_debounce:
+                _schedule_update_relations(key, change_list)
+            elif change_list and len(change_list) < 5:  # Only a few bones have changed, process these individually
                 for idx, changed_bone in enumerate(change_list):
                     updateRelations(key, time.time() + 1, changed_bone, _countdown=10 * idx)
             else:  # Update all inbound relations, regardless of which bones they mirror
@@ -1483,8 +1835,6 @@ class Skeleton(BaseSkeleton, metaclass=MetaSkel):
         for adapter in skel.database_adapters:
             adapter.write(skel, is_add, change_list)
 
-        return skel
-
     @classmethod
     def delete(cls, skel: SkeletonInstance, key: t.Optional[KeyType] = None) -> None:
         """
@@ -1814,6 +2164,8 @@ class SkelList(list):
 
         :ivar cursor: Holds the cursor within a query.
         :vartype cursor: str
+        :ivar missing_keys: Keys that couldn't be read, when created by :meth:`from_keys`.
+        :vartype missing_keys: list
     """
 
     __slots__ = (
@@ -1821,6 +2173,7 @@ class SkelList(list):
         "customQueryInfo",
         "getCursor",
         "get_orders",
+        "missing_keys",
         "renderPreparation",
     )
 
@@ -1832,9 +2185,19 @@ class SkelList(list):
         self.baseSkel = baseSkel or {}
         self.getCursor = lambda: None
         self.get_orders = lambda: None
+        self.missing_keys = []
         self.renderPreparation = None
         self.customQueryInfo = {}
 
+    @classmethod
+    def from_keys(cls, skel: SkeletonInstance, keys: t.Iterable[KeyType]) -> t.Self:
+        """
+            Creates a SkelList from the entities with the given *keys*, read with one multi-key lookup.
+
+            .. seealso:: :meth:`Skeleton.read_multi`
+        """
+        return skel.read_multi(keys)
+
 
 # Module functions
 
@@ -1877,10 +2240,17 @@ def processRemovedRelations(removedKey, cursor=None):
     updateListQuery = updateListQuery.setCursor(cursor)
     updateList = updateListQuery.run(limit=5)
 
-    for entry in updateList:
-        skel = skeletonByKind(entry["viur_src_kind"])()
+    # Read all referencing skeletons with one lookup per kind
+    skels = {}
+    for kind in {entry["viur_src_kind"] for entry in updateList}:
+        skels |= {
+            skel["key"]: skel for skel in skeletonByKind(kind)().read_multi(
+                [entry["src"].key for entry in updateList if entry["viur_src_kind"] == kind]
+            )
+        }
 
-        if not skel.read(entry["src"].key):
+    for entry in updateList:
+        if not (skel := skels.get(entry["src"].key)):
             raise ValueError(f"processRemovedRelations detects inconsistency on src={entry['src'].key!r}")
 
         if entry["viur_relational_consistency"] == RelationalConsistency.SetNull.value:
@@ -1927,8 +2297,8 @@ def updateRelations(destKey: db.Key, minChangeTime: int, changedBone: t.Optional
             in the meantime as they're  already up2date
         :param changedBone: If set, we'll update only entites that have a copy of that bone. Relations mirror only
             key and name by default, so we don't have to update these if only another bone has been changed.
-        :param cursor: The database cursor for the current request as we only process five entities at once and then
-            defer again.
+        :param cursor: The database cursor for the current request as we only process a page of entities at once and
+            then defer again.
     """
     logging.debug(f"Starting updateRelations for {destKey=}; {minChangeTime=}, {changedBone=}, {cursor=}")
     if request_data := current.request_data.get():
@@ -1943,7 +2313,8 @@ def updateRelations(destKey: db.Key, minChangeTime: int, changedBone: t.Optional
         updateListQuery.filter("viur_foreign_keys =", changedBone)
     if cursor:
         updateListQuery.setCursor(cursor)
-    updateList = updateListQuery.run(limit=5)
+    updateList = updateListQuery.run(limit=UPDATE_RELATIONS_PAGE_SIZE)
+    isFullPage = len(updateList) == UPDATE_RELATIONS_PAGE_SIZE
 
     def updateTxn(skel, key, srcRelKey):
         if not skel.read(key):
@@ -1953,6 +2324,10 @@ def updateRelations(destKey: db.Key, minChangeTime: int, changedBone: t.Optional
         skel.refresh()
         skel.write(update_relations=False)
 
+    # Update whatever is possible in bulk, the remaining entries require a full read, refresh and write
+    if destEntity := db.Get(destKey):
+        updateList = _update_relations_bulk(destEntity, updateList)
+
     for srcRel in updateList:
         try:
             skel = skeletonByKind(srcRel["viur_src_kind"])()
@@ -1964,10 +2339,229 @@ def updateRelations(destKey: db.Key, minChangeTime: int, changedBone: t.Optional
         else:
             db.RunInTransaction(updateTxn, skel, srcRel["src"].key, srcRel.key)
     nextCursor = updateListQuery.getCursor()
-    if len(updateList) == 5 and nextCursor:
+    if isFullPage and nextCursor:
         updateRelations(destKey, minChangeTime, changedBone, nextCursor)
 
 
+UPDATE_RELATIONS_PENDING_KIND = "viur-relations-pending"
+"""Kind of the markers that coalesce relation updates of an edited entity, see :func:`_schedule_update_relations`."""
+
+
+def _schedule_update_relations(destKey: db.Key, change_list: t.Iterable[str]) -> None:
+    """
+        Schedules the update of all entities referencing *destKey*, debounced by
+        `conf.skeleton_update_relations_debounce`.
+
+        A marker entity collects the changed bones of all edits until :func:`processPendingRelationUpdates` runs.
+        Only the first edit schedules this task; further edits are merged into the marker.
+
+        :param destKey: The database-key of the entity that has been edited
+        :param change_list: Names of the changed bones; if empty, all relations are updated.
+    """
+    debounce = utils.parse.timedelta(conf.skeleton_update_relations_debounce).total_seconds()
+    bones = list(change_list or ())
+
+    def txn() -> bool:
+        marker_key = db.Key(UPDATE_RELATIONS_PENDING_KIND, str(destKey))
+        now = time.time()
+
+        # A marker which is much older than the debounce time is orphaned (its task failed); replace it
+        if (marker := db.Get(marker_key)) and marker["scheduled"] > now - debounce - 600:
+            if not marker["all"]:
+                marker["all"] = not bones
+                marker["bones"] = sorted(set(marker["bones"] or ()) | set(bones))
+                db.Put(marker)
+
+            return False
+
+        marker = db.Entity(marker_key)
+        marker["dest"] = destKey
+        marker["all"] = not bones
+        marker["bones"] = bones
+        marker["scheduled"] = now
+        db.Put(marker)
+        return True
+
+    if db.IsInTransaction():
+        is_new = txn()
+    else:
+        is_new = db.RunInTransaction(txn)
+
+    if is_new:
+        processPendingRelationUpdates(destKey, _countdown=debounce)
+
+
+@CallDeferred
+def processPendingRelationUpdates(destKey: db.Key):
+    """
+        Starts the relation updates collected by :func:`_schedule_update_relations` for *destKey*.
+
+        :param destKey: The database-key of the entity that has been edited
+    """
+    marker_key = db.Key(UPDATE_RELATIONS_PENDING_KIND, str(destKey))
+
+    def txn() -> db.Entity | None:
+        if marker := db.Get(marker_key):
+            db.Delete(marker_key)
+
+        return marker
+
+    if not (marker := db.RunInTransaction(txn)):
+        return
+
+    # Any edit before this point is covered; later edits create a new marker
+    min_change_time = time.time() + 1
+    if marker["all"] or len(marker["bones"]) >= 5:
+        updateRelations(destKey, min_change_time, None)
+    else:  # Only a few bones have changed, process these individually
+        for idx, changed_bone in enumerate(marker["bones"]):
+            updateRelations(destKey, min_change_time, changed_bone, _countdown=10 * idx)
+
+
+UPDATE_RELATIONS_PAGE_SIZE = 100
+"""Number of viur-relations entries processed by one call of :func:`updateRelations`."""
+
+UPDATE_RELATIONS_TXN_SIZE = 25
+"""Number of source entities updated within one transaction by :func:`_update_relations_bulk`."""
+
+
+def _replace_relational_dest(value: t.Any, destKey: db.Key, dest: db.Entity) -> bool:
+    """
+        Replaces the mirrored dest-values of *destKey* within a serialized RelationalBone value,
+        which might be multiple and/or language-wrapped.
+
+        :returns: True if a value has been replaced.
+    """
+    if isinstance(value, list):
+        return any([_replace_relational_dest(entry, destKey, dest) for entry in value])
+
+    if not isinstance(value, dict):
+        return False
+
+    if value.get("_viurLanguageWrapper_"):
+        return any([
+            _replace_relational_dest(entry, destKey, dest)
+            for lang, entry in value.items() if lang != "_viurLanguageWrapper_"
+        ])
+
+    if isinstance(old_dest := value.get("dest"), db.Entity) and old_dest.key == destKey:
+        value["dest"] = dest
+        return True
+
+    return False
+
+
+def _can_update_relations_bulk(skel_cls: t.Type[Skeleton] | None, bone: BaseBone | None, dest_kind: str) -> bool:
+    """
+        Checks if the RelationalBone *bone* of *skel_cls* can be updated by :func:`_update_relations_bulk`.
+
+        This isn't possible for searchable bones, as the search index of the referencing entity depends
+        on the mirrored values, and for skeletons which hook into the write process with custom database adapters,
+        `preProcessSerializedData` or `postSavedHandler`, as these are only run by a full write.
+    """
+    from viur.core.bones import FileBone, RecordBone
+
+    if not skel_cls or not isinstance(bone, RelationalBone) or bone.searchable or bone.kind != dest_kind:
+        return False
+
+    if type(bone).postSavedHandler is not RelationalBone.postSavedHandler:
+        return False
+
+    # The default ViurTagsSearchAdapter only depends on searchable bones, which are not affected
+    if any(type(adapter) is not ViurTagsSearchAdapter for adapter in skel_cls.database_adapters):
+        return False
+
+    for name in ("preProcessSerializedData", "postSavedHandler"):
+        if getattr(skel_cls, name).__func__ is not getattr(Skeleton, name).__func__:
+            return False
+
+    # Handlers of the core bones only process the bone's own value, which is left unchanged
+    core_handlers = {
+        bone_cls.postSavedHandler for bone_cls in (BaseBone, RelationalBone, FileBone, RecordBone)
+    }
+
+    return all(type(other).postSavedHandler in core_handlers for other in skel_cls.__boneMap__.values())
+
+
+def _update_relations_bulk(destEntity: db.Entity, relations: list[db.Entity]) -> list[db.Entity]:
+    """
+        Updates the values mirrored from *destEntity* into the entities referencing it, without running
+        a full read, refresh and write on their skeletons.
+
+        The viur-relations entries are grouped by source kind and bone. For each group, the referencing entities are
+        fetched with one multi-key lookup per transaction, and only the mirrored dest-values of the RelationalBone
+        and the changedate of the referencing entity are replaced.
+
+        Entries which can't be updated this way, see :func:`_can_update_relations_bulk`,
+        are returned for a full update.
+
+        :param destEntity: The entity that has been edited.
+        :param relations: The viur-relations entries referencing *destEntity*.
+        :returns: The viur-relations entries that couldn't be updated.
+    """
+    remaining = []
+    groups = {}
+    for relation in relations:
+        groups.setdefault((relation["viur_src_kind"], relation["viur_src_property"]), []).append(relation)
+
+    for (srcKind, srcProperty), group in groups.items():
+        try:
+            skel_cls = skeletonByKind(srcKind)
+        except AssertionError:
+            skel_cls = None
+
+        bone = skel_cls.__boneMap__.get(srcProperty) if skel_cls else None
+        if not _can_update_relations_bulk(skel_cls, bone, destEntity.key.kind):
+            remaining.extend(group)
+            continue
+
+        has_changedate = "changedate" in skel_cls.__boneMap__
+
+        def serialize_dest(indexed: bool) -> db.Entity:
+            ref_skel = bone._refSkelCache()
+            ref_skel.unserialize(destEntity)
+            for bone_name in ref_skel:
+                # Unserialize all bones from refKeys, then drop dbEntity - otherwise all properties will be copied
+                _ = ref_skel[bone_name]
+            ref_skel.dbEntity = None
+            return ref_skel.serialize(parentIndexed=indexed)
+
+        src_dest = serialize_dest(bone.indexed)
+        relation_dest = serialize_dest(True)
+
+        def update_txn(chunk: list[db.Entity]):
+            entities = db.Get([relation["src"].key for relation in chunk] + [relation.key for relation in chunk])
+            changed = []
+
+            for relation, src_entity, relation_entity in zip(chunk, entities[:len(chunk)], entities[len(chunk):]):
+                if not src_entity or not relation_entity:
+                    logging.warning(f"""Cannot update stale reference to {relation["src"].key=} """
+                                    f"""(referenced from {relation.key=})""")
+                    continue
+
+                if _replace_relational_dest(src_entity.get(srcProperty), destEntity.key, src_dest):
+                    # Like a full write, this changes the entity; keep conditional requests on it valid
+                    if has_changedate:
+                        src_entity["changedate"] = utils.utcNow()
+
+                    changed.append(src_entity)
+
+                relation_entity["dest"] = relation_dest
+                relation_entity["viur_delayed_update_tag"] = time.time()
+                changed.append(relation_entity)
+
+            db.Put(changed)
+
+        for i in range(0, len(group), UPDATE_RELATIONS_TXN_SIZE):
+            chunk = group[i:i + UPDATE_RELATIONS_TXN_SIZE]
+            if db.IsInTransaction():
+                update_txn(chunk)
+            else:
+                db.RunInTransaction(update_txn, chunk)
+
+    return remaining
+
+
 @CallableTask
 class TaskUpdateSearchIndex(CallableTaskBase):
     """
@@ -2015,6 +2609,9 @@ class TaskUpdateSearchIndex(CallableTaskBase):
 
 
 class RebuildSearchIndex(QueryIter):
+    batchSize = 25
+    timeBudget = 60
+
     @classmethod
     def handleEntry(cls, skel: SkeletonInstance, customData: dict[str, str]):
         skel.refresh()
@@ -1,10 +1,14 @@
 import abc
+import contextvars
 import datetime
 import functools
+import heapq
+import itertools
 import json
 import logging
 import os
 import sys
+import threading
 import time
 import traceback
 import typing as t
@@ -88,6 +92,144 @@ class PermanentTaskFailure(Exception):
     pass
 
 
+class LocalTaskQueue:
+    """
+        In-process emulation of a Cloud Tasks queue, which is used when no task queue is available,
+        e.g. on the local development server.
+
+        Tasks are processed concurrently by a pool of worker threads. A task can be scheduled for a later time,
+        and is retried with exponential backoff when it fails, unless it raises :class:`PermanentTaskFailure`.
+        Like on Cloud Tasks, a task name can only be used once.
+
+        :param name: Name of the queue.
+        :param workers: Number of worker threads.
+        :param max_retries: Number of retries of a failed task.
+    """
+
+    def __init__(self, name: str, workers: int, max_retries: int):
+        super().__init__()
+        self.name = name
+        self.max_retries = max_retries
+        self._heap: list[tuple[float, int, t.Callable, int]] = []  # (schedule time, sequence, task, attempt)
+        self._names: set[str] = set()
+        self._sequence = itertools.count()
+        self._running = 0
+        self._condition = threading.Condition()
+
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"viur-task-{name}-{i}", daemon=True).start()
+
+    def add(self, task: t.Callable, eta: float | None = None, name: str | None = None) -> bool:
+        """
+            Adds a task to the queue. The task runs within a copy of the current context.
+
+            :param task: Callable without arguments.
+            :param eta: Timestamp (like :func:`time.time`) of the earliest execution.
+            :param name: Optional unique name of the task.
+            :returns: False, if a task with the same name was already added; True otherwise.
+        """
+        context = contextvars.copy_context()
+
+        def run():
+            db.currentDbAccessLog.set(None)  # don't log into the access log of the originating request
+            db.request_cache.set(None)  # nor use its identity map, which isn't thread-safe and may be outdated
+            return task()
+
+        with self._condition:
+            if name is not None:
+                if name in self._names:
+                    logging.debug(f"Task {name!r} already exists in queue {self.name!r}")
+                    return False
+
+                self._names.add(name)
+
+            heapq.heappush(self._heap, (eta or time.time(), next(self._sequence), lambda: context.run(run), 0))
+            self._condition.notify_all()
+
+        return True
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap or (delay := self._heap[0][0] - time.time()) > 0:
+                    self._condition.wait(delay if self._heap else None)
+
+                _, _, task, attempt = heapq.heappop(self._heap)
+                self._running += 1
+
+            try:
+                task()
+            except PermanentTaskFailure:
+                logging.exception(f"Task failed permanently in queue {self.name!r}")
+            except Exception:
+                if attempt < self.max_retries:
+                    delay = min(0.1 * 2 ** attempt, 60.0)
+                    logging.exception(f"Task failed in queue {self.name!r}, retrying in {delay}s")
+                    with self._condition:
+                        heapq.heappush(self._heap, (time.time() + delay, next(self._sequence), task, attempt + 1))
+                else:
+                    logging.exception(f"Task failed in queue {self.name!r}, giving up after {attempt} retries")
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    self._condition.notify_all()
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """
+            Blocks until all tasks, including scheduled and retried ones, have been processed.
+
+            :param timeout: Maximum time to wait in seconds.
+            :returns: True if the queue is idle, False if the timeout has been reached.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._heap and not self._running, timeout)
+
+
+_local_queues: dict[str, LocalTaskQueue] = {}
+_local_queues_lock = threading.Lock()
+
+
+def get_local_queue(name: str) -> LocalTaskQueue | None:
+    """
+        Returns the in-process emulation of the queue *name*,
+        or None when the emulation is disabled by `conf.tasks_local_workers`.
+    """
+    if queueRegion or not conf.tasks_local_workers:
+        return None
+
+    with _local_queues_lock:
+        if name not in _local_queues:
+            _local_queues[name] = LocalTaskQueue(name, conf.tasks_local_workers, conf.tasks_local_max_retries)
+
+        return _local_queues[name]
+
+
+def drain_local_queues(timeout: float | None = None) -> bool:
+    """
+        Blocks until all in-process task queues are idle; useful for tests and benchmarks.
+        As tasks may queue further tasks into other queues, all queues are checked until all are idle at once.
+
+        :param timeout: Maximum time to wait in seconds.
+        :returns: True if all queues are idle, False if the timeout has been reached.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    while True:
+        idle = True
+        for queue in list(_local_queues.values()):
+            remaining = max(deadline - time.monotonic(), 0) if deadline is not None else None
+            with queue._condition:
+                busy = queue._heap or queue._running
+
+            if busy:
+                idle = False
+                if not queue.drain(remaining):
+                    return False
+
+        if idle:
+            return True
+
+
 def removePeriodicTask(task: t.Callable) -> None:
     """
     Removes a periodic task from the queue. Useful to unqueue an task
@@ -508,6 +650,21 @@ def CallDeferred(func: t.Callable) -> t.Callable:
         except Exception:  # This will fail for warmup requests
             req = None
 
+        try:
+            if self.__class__.__name__ == "index":
+                funcPath = func.__name__
+            else:
+                funcPath = f"{self.modulePath}/{func.__name__}"
+            command = "rel"
+        except Exception:
+            funcPath = f"{func.__name__}.{func.__module__}"
+            command = "unb"
+
+        if _queue is None:
+            _queue = conf.tasks_default_queues.get(
+                funcPath, conf.tasks_default_queues.get("__default__", "default")
+            )
+
         if not queueRegion:
             # Run tasks inline
             logging.debug(f"{func=} will be executed inline")
@@ -519,7 +676,12 @@ def CallDeferred(func: t.Callable) -> t.Callable:
                 else:
                     return func(self, *args, **kwargs)
 
-            if req:
+            if local_queue := get_local_queue(_queue):
+                if _countdown:
+                    _eta = utils.utcNow() + datetime.timedelta(seconds=_countdown)
+
+                local_queue.add(task, eta=_eta.timestamp() if _eta else None, name=_name)
+            elif req:
                 req.pendingTasks.append(task)  # This property only exists on development server!
             else:
                 # Warmup request or something - we have to call it now as we can't defer it :/
@@ -539,22 +701,8 @@ def CallDeferred(func: t.Callable) -> t.Callable:
             return func(self, *args, **kwargs)
 
         else:
-            try:
-                if self.__class__.__name__ == "index":
-                    funcPath = func.__name__
-                else:
-                    funcPath = f"{self.modulePath}/{func.__name__}"
-                command = "rel"
-            except Exception:
-                funcPath = f"{func.__name__}.{func.__module__}"
-                if self is not __undefinedFlag_:
-                    args = (self,) + args  # Re-append self to args, as this function is (hopefully) unbound
-                command = "unb"
-
-            if _queue is None:
-                _queue = conf.tasks_default_queues.get(
-                    funcPath, conf.tasks_default_queues.get("__default__", "default")
-                )
+            if command == "unb" and self is not __undefinedFlag_:
+                args = (self,) + args  # Re-append self to args, as this function is (hopefully) unbound
 
             # Try to preserve the important data from the current environment
             try:  # We might get called inside a warmup request without session
@@ -724,9 +872,30 @@ class QueryIter(object, metaclass=MetaQueryIter):
 
         To use this class create a subclass, override the classmethods handleEntry and handleFinish and then
         call startIterOnQuery with an instance of a database Query (and possible some custom data to pass along)
+
+        The amount of work done by each deferred step can be tuned by the class attributes
+        :attr:`batchSize`, :attr:`timeBudget` and :attr:`shards`.
     """
     queueName = "default"  # Name of the taskqueue we will run on
 
+    batchSize: int = 5
+    """Number of entries fetched and passed to :meth:`handleBatch` at once (at most 100 for skeleton queries)."""
+
+    timeBudget: float | None = None
+    """
+    If set, a step keeps processing batches for this amount of seconds before the next step is queued.
+    Otherwise, every step processes exactly one batch.
+    """
+
+    shards: int = 1
+    """
+    Number of parallel cursor streams the query is split into by key ranges.
+    Sharding requires a query without sort orders, and is only balanced for kinds using automatic (scattered) ids.
+    :meth:`handleFinish` is called once, after all shards are finished.
+    """
+
+    barrierKind = "viur-queryiter-barrier"  # Kind used to track pending shards
+
     @classmethod
     def startIterOnQuery(cls, query: db.Query, customData: t.Any = None) -> None:
         """
@@ -752,7 +921,69 @@ class QueryIter(object, metaclass=MetaQueryIter):
             "customData": customData,
             "totalCount": 0
         }
-        cls._requeueStep(qryDict)
+
+        if cls.shards > 1:
+            cls._startShards(qryDict)
+        else:
+            cls._requeueStep(qryDict)
+
+    @classmethod
+    def _startShards(cls, qryDict: dict[str, t.Any]) -> None:
+        """
+            Internal use only. Splits the query defined in qryDict into :attr:`shards` key ranges and queues
+            the first step of each of them.
+
+            Automatic ids are scattered between 2^52 and 2^53, so this range is split evenly. The first shard
+            covers everything below, and the last shard everything above, including all keys with names.
+        """
+        assert not qryDict["orders"], "Cannot shard a query with sort orders"
+        assert not any(name.startswith(db.KEY_SPECIAL_PROPERTY) for name in qryDict["filters"]), \
+            "Cannot shard a query with a key filter"
+
+        barrier = db.Entity(db.Key(cls.barrierKind, utils.string.random(16)))
+        barrier["pending"] = cls.shards
+        barrier["totalCount"] = 0
+        barrier["creationdate"] = utils.utcNow()
+        db.Put(barrier)
+
+        lower, upper = 2 ** 52, 2 ** 53
+        step = (upper - lower) // cls.shards
+        for idx in range(cls.shards):
+            filters = dict(qryDict["filters"])
+            if idx > 0:
+                filters[f"{db.KEY_SPECIAL_PROPERTY} >="] = db.Key(qryDict["kind"], lower + idx * step)
+            if idx < cls.shards - 1:
+                filters[f"{db.KEY_SPECIAL_PROPERTY} <"] = db.Key(qryDict["kind"], lower + (idx + 1) * step)
+
+            cls._requeueStep(qryDict | {"filters": filters, "barrier": barrier.key.name})
+
+    @classmethod
+    def _finish(cls, qryDict: dict[str, t.Any]) -> None:
+        """
+            Internal use only. Calls :meth:`handleFinish` when the query is done, or when the last of all shards
+            is done.
+        """
+        if not (barrier_name := qryDict.get("barrier")):
+            cls.handleFinish(qryDict["totalCount"], qryDict["customData"])
+            return
+
+        def txn():
+            if not (barrier := db.Get(db.Key(cls.barrierKind, barrier_name))):
+                # The barrier has been removed, e.g. by a retried shard which already finished the query
+                logging.error(f"Barrier {barrier_name!r} of {cls.__name__} is missing, skipping handleFinish")
+                return None
+
+            barrier["pending"] -= 1
+            barrier["totalCount"] += qryDict["totalCount"]
+            if barrier["pending"] > 0:
+                db.Put(barrier)
+                return None
+
+            db.Delete(barrier.key)
+            return barrier["totalCount"]
+
+        if (totalCount := db.RunInTransaction(txn)) is not None:
+            cls.handleFinish(totalCount, qryDict["customData"])
 
     @classmethod
     def _requeueStep(cls, qryDict: dict[str, t.Any]) -> None:
@@ -763,6 +994,9 @@ class QueryIter(object, metaclass=MetaQueryIter):
         if not queueRegion:  # Run tasks inline - hopefully development server
             req = current.request.get()
             task = lambda *args, **kwargs: cls._qryStep(qryDict)
+            if local_queue := get_local_queue(cls.queueName):
+                local_queue.add(task)
+                return
             if req:
                 req.pendingTasks.append(task)  # < This property will be only exist on development server!
                 return
@@ -783,45 +1017,67 @@ class QueryIter(object, metaclass=MetaQueryIter):
     @classmethod
     def _qryStep(cls, qryDict: dict[str, t.Any]) -> None:
         """
-            Internal use only. Processes one block of five entries from the query defined in qryDict and
-            reschedules the next block.
+            Internal use only. Processes one block of :attr:`batchSize` entries from the query defined in qryDict
+            (or several blocks, when a :attr:`timeBudget` is set) and reschedules the next block.
         """
         from viur.core.skeleton import skeletonByKind
-        qry = db.Query(qryDict["kind"])
-        qry.srcSkel = skeletonByKind(qryDict["srcSkel"])() if qryDict["srcSkel"] else None
-        qry.queries.filters = qryDict["filters"]
-        qry.queries.orders = [(propName, db.SortOrder(sortOrder)) for propName, sortOrder in qryDict["orders"]]
-        qry.setCursor(qryDict["startCursor"], qryDict["endCursor"])
-        qry.origKind = qryDict["origKind"]
-        qry.queries.distinct = qryDict["distinct"]
-        if qry.srcSkel:
-            qryIter = qry.fetch(5)
-        else:
-            qryIter = qry.run(5)
-        for item in qryIter:
+        deadline = time.monotonic() + cls.timeBudget if cls.timeBudget else None
+
+        while True:
+            qry = db.Query(qryDict["kind"])
+            qry.srcSkel = skeletonByKind(qryDict["srcSkel"])() if qryDict["srcSkel"] else None
+            qry.queries.filters = qryDict["filters"]
+            qry.queries.orders = [(propName, db.SortOrder(sortOrder)) for propName, sortOrder in qryDict["orders"]]
+            qry.setCursor(qryDict["startCursor"], qryDict["endCursor"])
+            qry.origKind = qryDict["origKind"]
+            qry.queries.distinct = qryDict["distinct"]
+            if qry.srcSkel:
+                qryIter = qry.fetch(min(cls.batchSize, 100))
+            else:
+                qryIter = qry.run(cls.batchSize)
+            entries = list(qryIter)
+            if not cls.handleBatch(entries, qryDict["customData"]):
+                logging.error(f"Exiting queryIter on cursor {qry.getCursor()!r}")
+                return
+            qryDict["totalCount"] += len(entries)
+            cursor = qry.getCursor()
+            if not cursor:
+                cls._finish(qryDict)
+                return
+
+            qryDict["startCursor"] = cursor
+            if deadline is None or time.monotonic() >= deadline:
+                cls._requeueStep(qryDict)
+                return
+
+    @classmethod
+    def handleBatch(cls, entries: list, customData) -> bool:
+        """
+            Overridable hook to process all entries fetched in one step at once.
+
+            The default implementation calls :meth:`handleEntry` for each entry, retries it once on failure and
+            consults :meth:`handleError` afterward. Subclasses can override it to use multi-key datastore operations.
+
+            :returns: False to exit the queryIter, True to continue.
+        """
+        for entry in entries:
             try:
-                cls.handleEntry(item, qryDict["customData"])
+                cls.handleEntry(entry, customData)
             except:  # First exception - we'll try another time (probably/hopefully transaction collision)
                 time.sleep(5)
                 try:
-                    cls.handleEntry(item, qryDict["customData"])
+                    cls.handleEntry(entry, customData)
                 except Exception as e:  # Second exception - call error_handler
                     try:
-                        doCont = cls.handleError(item, qryDict["customData"], e)
+                        doCont = cls.handleError(entry, customData, e)
                     except Exception as e:
-                        logging.error(f"handleError failed on {item} - bailing out")
+                        logging.error(f"handleError failed on {entry} - bailing out")
                         logging.exception(e)
                         doCont = False
                     if not doCont:
-                        logging.error(f"Exiting queryIter on cursor {qry.getCursor()!r}")
-                        return
-            qryDict["totalCount"] += 1
-        cursor = qry.getCursor()
-        if cursor:
-            qryDict["startCursor"] = cursor
-            cls._requeueStep(qryDict)
-        else:
-            cls.handleFinish(qryDict["totalCount"], qryDict["customData"])
+                        return False
+
+        return True
 
     @classmethod
     def handleEntry(cls, entry, customData):
@@ -861,6 +1117,20 @@ class DeleteEntitiesIter(QueryIter):
         This way the `Skeleton.delete()` method can be used and
         the appropriate post-processing can be done.
     """
+    batchSize = 100
+
+    @classmethod
+    def handleBatch(cls, entries: list, customData) -> bool:
+        from viur.core.skeleton import SkeletonInstance
+        keys = []
+        for entry in entries:
+            if isinstance(entry, SkeletonInstance):
+                entry.delete()
+            else:
+                keys.append(entry.key)
+
+        db.delete_multi(keys)
+        return True
 
     @classmethod
     def handleEntry(cls, entry, customData):
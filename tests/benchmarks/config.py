@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark measuring the cost of accessing the configuration.
+
+Compares the attribute access with the backward compatible access by old dict-keys and aliases,
+which are resolved through the mapping of the nested configs.
+
+Run from the repository root with ``python tests/benchmarks/config.py``.
+"""
+import argparse
+import pathlib
+import sys
+import timeit
+import warnings
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from main import monkey_patch  # noqa: E402
+
+monkey_patch()
+
+from viur.core.config import conf  # noqa: E402
+
+STATEMENTS = (
+    "conf.security.x_frame_options",
+    "conf.i18n.default_language",
+    "conf.debug.trace",
+    "getattr(conf, 'viur.debug.trace')",
+    "getattr(conf, 'viur.defaultLanguage')",
+    "conf.get('viur.security.x_frame_options')",
+    "conf['viur.mainResolver']",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100_000, help="Accesses per measurement")
+    parser.add_argument("--cold", action="store_true", help="Drop the cache of resolved keys before each access")
+    args = parser.parse_args()
+
+    # Deprecation warnings are emitted on each access of an old key, filter them like a production system does
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    setup = "conf._invalidate_paths()" if args.cold else "pass"
+    for statement in STATEMENTS:
+        seconds = min(timeit.repeat(
+            f"{setup}; {statement}",
+            globals={"conf": conf},
+            number=args.number,
+            repeat=5,
+        ))
+        print(f"{statement:<45} {seconds / args.number * 1_000_000_000:>8.0f} ns/access")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark comparing the default and the fast encoder of the json renderer.
+
+Renders and encodes a list of 1000 skeletons with the default encoder and with orjson.
+
+Run from the repository root with ``python tests/benchmarks/render_json.py``.
+"""
+import argparse
+import datetime
+import importlib
+import pathlib
+import sys
+import timeit
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from main import monkey_patch  # noqa: E402
+
+monkey_patch()
+
+from viur.core import conf, current  # noqa: E402
+from viur.core.bones import BooleanBone, DateBone, NumericBone, SelectBone, StringBone  # noqa: E402
+from viur.core.skeleton import SkelList, Skeleton  # noqa: E402
+
+# The module is shadowed by the DefaultRender exported as viur.core.render.json.default
+render_json = importlib.import_module("viur.core.render.json.default")
+
+
+class BenchmarkSkel(Skeleton):
+    name = StringBone()
+    description = StringBone()
+    count = NumericBone()
+    price = NumericBone(precision=2)
+    active = BooleanBone()
+    status = SelectBone(values={"new": "New", "done": "Done"})
+    date = DateBone()
+    tags = StringBone(multiple=True)
+    title = StringBone(languages=["de", "en"])
+
+
+class Entity(dict):
+    key = None
+
+
+def build_skellist(number: int) -> SkelList:
+    now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+    skellist = SkelList(BenchmarkSkel)
+
+    for i in range(number):
+        skel = BenchmarkSkel()
+        skel.setEntity(Entity({
+            "name": f"Product {i}",
+            "description": "Lorem ipsum dolor sit amet, consetetur sadipscing elitr",
+            "count": i,
+            "price": i * 1.25,
+            "active": bool(i % 2),
+            "status": "new",
+            "date": now,
+            "creationdate": now,
+            "changedate": now + datetime.timedelta(seconds=i),
+            "tags": ["a", "b", "c"],
+            "title": {"_viurLanguageWrapper_": True, "de": f"Titel {i}", "en": f"Title {i}"},
+        }))
+        skellist.append(skel)
+
+    return skellist
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=1000, help="Number of entries in the list")
+    parser.add_argument("--number", type=int, default=10, help="Renderings per measurement")
+    args = parser.parse_args()
+
+    skellist = build_skellist(args.entries)
+    render = render_json.DefaultRender()
+    current.request.set(mock.Mock())
+
+    encoders = {"default": False}
+    if render_json.orjson_dependencies:
+        encoders["orjson"] = True
+    else:
+        print("orjson is not installed, install it with `pip install viur-core[orjson]`")
+
+    print(f"{args.entries} skeletons with {len(skellist[0])} bones each")
+    for name, fast in encoders.items():
+        with mock.patch.object(conf, "render_json_fast_encoder", fast):
+            render_seconds = min(timeit.repeat(
+                lambda: [render.renderSkelValues(skel) for skel in skellist], number=args.number, repeat=5
+            ))
+            rendered = {"skellist": [render.renderSkelValues(skel) for skel in skellist]}
+            encode_seconds = min(timeit.repeat(
+                lambda: render_json.dumps(rendered), number=args.number, repeat=5
+            ))
+
+        print(
+            f"{name:<10}"
+            f" render {render_seconds / args.number * 1000:>7.2f} ms"
+            f" encode {encode_seconds / args.number * 1000:>7.2f} ms"
+            f" total {(render_seconds + encode_seconds) / args.number * 1000:>7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark measuring the routing overhead per request across deep module trees.
+
+Compares the former walk through the nested resolver dicts with the compiled routing trie,
+both with a cold and a warm LRU cache.
+
+Run from the repository root with ``python tests/benchmarks/routing.py``.
+"""
+import argparse
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from main import monkey_patch  # noqa: E402
+
+monkey_patch()
+
+from viur.core.module import Method  # noqa: E402
+from viur.core.request import RoutingTrie  # noqa: E402
+
+
+def build_resolver(depth: int, width: int) -> dict:
+    """Builds a resolver of ``width`` modules per level, nested ``depth`` levels deep."""
+
+    def method(name):
+        def func(*args, **kwargs):
+            return name
+
+        func.__name__ = name
+        return Method(func)
+
+    def level(current):
+        node = {name: method(name) for name in ("index", "view", "list", "edit", "add")}
+        if current == 1:
+            node["canAccess"] = lambda: True  # like the vi-renderer does
+        if current < depth:
+            for i in range(width):
+                node[f"module{i}"] = level(current + 1)
+
+        return node
+
+    return level(1)
+
+
+def walk(resolver: dict, path_list: tuple[str, ...]):
+    """The resolution as formerly done by Router._route."""
+    caller = resolver
+    idx = 0
+    for part in path_list:
+        if "canAccess" in caller and not caller["canAccess"]():
+            raise PermissionError()
+
+        idx += 1
+        if part not in caller:
+            part = "index"
+
+        if caller := caller.get(part):
+            if isinstance(caller, Method):
+                if part == "index":
+                    idx -= 1
+                return caller, path_list[idx:], [str(header).lower() for header in caller.cors_allow_headers or ()]
+            elif part == "index":
+                raise LookupError()
+        else:
+            raise LookupError()
+
+    return caller["index"], (), []
+
+
+def dispatch(trie: RoutingTrie, path_list: tuple[str, ...]):
+    route = trie.resolve(path_list)
+    for guard in route.guards:
+        if not guard():
+            raise PermissionError()
+
+    return route.method, path_list[route.offset:], route.cors_headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, default=6, help="Nesting depth of the module tree")
+    parser.add_argument("--width", type=int, default=4, help="Number of sub-modules per module")
+    parser.add_argument("--number", type=int, default=100_000, help="Requests per measurement")
+    args = parser.parse_args()
+
+    resolver = build_resolver(args.depth, args.width)
+    paths = [
+        tuple(f"module{(n + i) % args.width}" for i in range(depth - 1)) + ("view", f"key{n}")
+        for depth in range(1, args.depth + 1)
+        for n in range(args.width)
+    ]
+
+    trie = RoutingTrie(resolver)
+    for path_list in paths:
+        assert dispatch(trie, path_list) == walk(resolver, path_list)[:2] + ((),)
+
+    def cold():
+        trie.resolve.cache_clear()
+        for path_list in paths:
+            dispatch(trie, path_list)
+
+    results = {
+        "resolver walk": lambda: [walk(resolver, path_list) for path_list in paths],
+        "trie (cold cache)": cold,
+        "trie (warm cache)": lambda: [dispatch(trie, path_list) for path_list in paths],
+    }
+
+    print(f"depth={args.depth} width={args.width} paths={len(paths)}")
+    for name, func in results.items():
+        loops = max(1, args.number // len(paths))
+        seconds = min(timeit.repeat(func, number=loops, repeat=5))
+        print(f"{name:<20} {seconds / (loops * len(paths)) * 1_000_000_000:>8.0f} ns/request")
+
+
+if __name__ == "__main__":
+    main()
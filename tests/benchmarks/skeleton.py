@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark measuring the cost of reading skeletons and accessing every bone.
+
+Compares the compiled bone accessor table with unserializing every bone by its own
+:meth:`BaseBone.unserialize`, as it has been done before.
+
+Run from the repository root with ``python tests/benchmarks/skeleton.py``.
+"""
+import argparse
+import pathlib
+import sys
+import timeit
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from main import monkey_patch  # noqa: E402
+
+monkey_patch()
+
+from viur.core.bones import BooleanBone, DateBone, NumericBone, SelectBone, StringBone  # noqa: E402
+from viur.core.skeleton import BoneAccessorTable, Skeleton  # noqa: E402
+
+
+class BenchmarkSkel(Skeleton):
+    name = StringBone()
+    description = StringBone()
+    firstname = StringBone()
+    lastname = StringBone()
+    street = StringBone()
+    city = StringBone()
+    count = NumericBone()
+    price = NumericBone(precision=2)
+    active = BooleanBone()
+    status = SelectBone(values={"new": "New", "done": "Done"})
+    date = DateBone()
+    tags = StringBone(multiple=True)
+    title = StringBone(languages=["de", "en"])
+
+
+class Entity(dict):
+    key = None
+
+
+def legacy_unserialize(self, skel, name, bone):
+    bone.unserialize(skel, name)
+
+
+def read(skel, entities):
+    for entity in entities:
+        skel.setEntity(entity)
+        for name in skel:
+            skel[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=10_000, help="Number of skeletons to read")
+    args = parser.parse_args()
+
+    entities = [
+        Entity({
+            "name": f"name {i}",
+            "description": "description",
+            "firstname": "John",
+            "lastname": "Doe",
+            "street": "Main street",
+            "city": "Springfield",
+            "count": i,
+            "price": i / 3,
+            "active": bool(i % 2),
+            "status": "new",
+            "date": None,
+            "tags": ["a", "b", "c"],
+            "title": {"_viurLanguageWrapper_": True, "de": "Titel", "en": "Title"},
+        })
+        for i in range(args.number)
+    ]
+    skel = BenchmarkSkel()
+
+    with mock.patch.object(BoneAccessorTable, "unserialize", legacy_unserialize):
+        legacy = min(timeit.repeat(lambda: read(skel, entities), number=1, repeat=5))
+
+    compiled = min(timeit.repeat(lambda: read(skel, entities), number=1, repeat=5))
+
+    print(f"{args.number} skeletons with {len(skel)} bones each")
+    for name, seconds in (("bone.unserialize", legacy), ("accessor table", compiled)):
+        print(f"{name:<20} {seconds * 1000:>8.1f} ms {seconds / args.number * 1_000_000:>8.1f} µs/skeleton")
+
+
+if __name__ == "__main__":
+    main()
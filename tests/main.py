@@ -20,7 +20,9 @@ def monkey_patch():
 
     MOCK_MODULES = (
         "google.appengine.api",
+        "google.appengine.api.mail",
         "google.auth.default",
+        "google.auth.transport",
         "google.auth",
         "google.cloud.exceptions",
         "google.cloud.logging_v2",
@@ -66,6 +68,7 @@ def monkey_patch():
         "cache",
         "CollisionError",
         "Count",
+        "currentDbAccessLog",
         "DATASTORE_BASE_TYPES",
         "Delete",
         "endDataAccessLog",
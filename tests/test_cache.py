@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+
+
+class TestMemoryCacheBackend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_get_set(self):
+        from viur.core.cache import MemoryCacheBackend
+        backend = MemoryCacheBackend(max_size=1024 * 1024, ttl=60)
+        self.assertIsNone(backend.get("a"))
+
+        backend.set("a", {"data": "hello"})
+        self.assertEqual(backend.get("a"), {"data": "hello"})
+
+        backend.delete("a")
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.size, 0)
+
+    def test_lru_eviction(self):
+        from viur.core.cache import MemoryCacheBackend
+        entry = {"data": "x" * 100}
+        size = MemoryCacheBackend.sizeof(entry)
+        backend = MemoryCacheBackend(max_size=size * 2, ttl=60)
+
+        backend.set("a", entry)
+        backend.set("b", entry)
+        backend.get("a")  # "b" is now the least recently used entry
+        backend.set("c", entry)
+
+        self.assertIsNotNone(backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertIsNotNone(backend.get("c"))
+        self.assertEqual(backend.size, size * 2)
+
+        # entries exceeding the whole cache are never stored
+        backend.set("d", {"data": "x" * size * 3})
+        self.assertIsNone(backend.get("d"))
+        self.assertEqual(len(backend), 2)
+
+    def test_ttl(self):
+        from viur.core.cache import MemoryCacheBackend
+        backend = MemoryCacheBackend(max_size=1024 * 1024, ttl=10)
+
+        with mock.patch("time.monotonic", return_value=1000.0):
+            backend.set("a", {"data": "hello"})
+
+        with mock.patch("time.monotonic", return_value=1005.0):
+            self.assertIsNotNone(backend.get("a"))
+
+        with mock.patch("time.monotonic", return_value=1011.0):
+            self.assertIsNone(backend.get("a"))
+
+        self.assertEqual(backend.size, 0)
+
+
+class TestCacheGenerations(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_is_current(self):
+        from viur.core import cache
+        current = {"kind:page": 3, "key:abc": 1}
+
+        with mock.patch.object(cache, "get_generations", side_effect=lambda names: {n: current[n] for n in names}):
+            self.assertTrue(cache._is_current({"generations": {"kind:page": 3, "key:abc": 1}}))
+            self.assertTrue(cache._is_current({"generations": {}}))
+            self.assertFalse(cache._is_current({"generations": {"kind:page": 2, "key:abc": 1}}))
+            self.assertFalse(cache._is_current({}))  # entry written without generations
+
+    def test_lru(self):
+        from viur.core import cache, db
+        generations = cache.GenerationCache("test-generation", max_size=2)
+
+        with mock.patch.object(db, "Key", side_effect=lambda kind, name: name), \
+                mock.patch.object(db, "Get", side_effect=lambda keys: [{"generation": 1} for _ in keys]) as get, \
+                mock.patch("time.monotonic", return_value=1000.0):
+            self.assertEqual(generations.get(["a", "b"]), {"a": 1, "b": 1})
+            self.assertEqual(generations.get(["a"]), {"a": 1})  # "b" is now the least recently used name
+            self.assertEqual(get.call_count, 1)
+
+            # Only the least recently used names are dropped
+            generations.get(["c"])
+            self.assertEqual(list(generations._values), ["a", "c"])
+            self.assertEqual(len(generations), 2)
+
+            generations.get(["a", "b"])
+            self.assertEqual(get.call_args.args[0], ["b"])
+
+    def test_purge_generations(self):
+        import datetime
+        from viur.core import cache, conf, db
+        now = datetime.datetime(2024, 1, 2, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+        # Counters are removed only after the stale entries have been purged, and only when they are old enough
+        with mock.patch.object(cache.PurgeGenerationsIter, "startIterOnQuery") as start:
+            cache.PurgeCacheIter.handleFinish(0, None)
+            start.assert_not_called()
+
+            with mock.patch.object(conf, "cache_generation_retention", datetime.timedelta(hours=1)):
+                cache.PurgeCacheIter.handleFinish(0, now)
+
+            start.assert_called_once()
+            self.assertEqual(start.call_args.args[1], now - datetime.timedelta(hours=1))
+
+        class Entity(dict):
+            def __init__(self, key, changedate):
+                super().__init__(changedate=changedate)
+                self.key = key
+
+        old = Entity("old", now - datetime.timedelta(days=2))
+        incremented = Entity("incremented", now)  # incremented after the query has been run
+
+        with mock.patch.object(db, "Get", return_value=[old, incremented, None]), \
+                mock.patch.object(db, "RunInTransaction", side_effect=lambda fn: fn()), \
+                mock.patch.object(db, "Delete") as delete:
+            cache.PurgeGenerationsIter.handleBatch(
+                [old, incremented, Entity("deleted", now)], now - datetime.timedelta(days=1)
+            )
+
+        delete.assert_called_once_with(["old"])
@@ -189,6 +189,25 @@ class TestConfig(unittest.TestCase):
         from viur.core.config import conf
         self.assertEqual(42, conf.get("viur.notexisting", 42))
 
+    def test_resolve_path(self):
+        import warnings
+        from viur.core.config import conf
+        conf._invalidate_paths()
+
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(getattr(conf, "viur.defaultLanguage"), conf.i18n.default_language)
+
+        self.assertEqual(conf._resolved_paths["viur.defaultLanguage"], ("i18n", "default_language"))
+
+        # The deprecation is reported once, further accesses are served from the resolved path
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(getattr(conf, "viur.defaultLanguage"), conf.i18n.default_language)
+
+        # Setting attributes of nested configs invalidates the resolved paths of the parents
+        conf.i18n.default_language = conf.i18n.default_language
+        self.assertEqual(conf._resolved_paths, {})
+
     def tearDown(self):
         from viur.core.config import conf
         conf.strict_mode = False
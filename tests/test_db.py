@@ -0,0 +1,103 @@
+import unittest
+from unittest import mock
+
+
+class TestRequestCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def setUp(self):
+        from viur.core import current, db
+        self.request = mock.Mock(disableCache=False)
+        self.token = current.request.set(self.request)
+        self.cache_token = db.request_cache.set({})
+        self.store = {"a": {"name": "a"}, "b": {"name": "b"}}
+        self.get = mock.Mock(side_effect=lambda keys: [self.store.get(key) for key in keys])
+
+        patches = (
+            mock.patch.object(db, "_Get", self.get),
+            mock.patch.object(db, "_Put"),
+            mock.patch.object(db, "_Delete"),
+            mock.patch.object(db, "IsInTransaction", return_value=False),
+            mock.patch.object(db, "Key", str),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from viur.core import current, db
+        db.request_cache.reset(self.cache_token)
+        current.request.reset(self.token)
+
+    def test_get(self):
+        from viur.core import db
+        self.assertEqual(db.Get(["a", "x"]), [{"name": "a"}, None])
+        self.assertEqual(db.Get(["a", "b", "x"]), [{"name": "a"}, {"name": "b"}, None])
+        self.assertEqual(db.Get("b"), {"name": "b"})
+
+        # Only "b" has been fetched additionally; missing entities are remembered as well
+        self.assertEqual(self.get.call_count, 2)
+        self.assertEqual(self.get.call_args.args[0], ["b"])
+
+        # Modifications by the caller must not leak into the identity map
+        db.Get("a")["name"] = "modified"
+        self.assertEqual(db.Get("a"), {"name": "a"})
+
+    def test_invalidate(self):
+        from viur.core import db
+        db.Get(["a", "b"])
+        db.Delete("a")
+        db.Get(["a", "b"])
+        self.assertEqual(self.get.call_args.args[0], ["a"])
+
+        entity = db.Entity()
+        entity.key = "b"
+        db.Put([entity])
+        db.Get(["a", "b"])
+        self.assertEqual(self.get.call_args.args[0], ["b"])
+        self.assertEqual(self.get.call_count, 3)
+
+    def test_bypass(self):
+        from viur.core import db
+        db.request_cache.set(None)
+        db.Get("a")
+        db.Get("a")
+        self.assertEqual(self.get.call_count, 2)
+
+        db.request_cache.set({})
+        with mock.patch.object(db, "IsInTransaction", return_value=True):
+            db.Get("a")
+        self.assertEqual(db.request_cache.get(), {})
+
+    def test_deferred(self):
+        from viur.core import db
+        from viur.core.request import _iter_in_context
+        from viur.core.tasks import LocalTaskQueue
+        queue = LocalTaskQueue("test", workers=1, max_retries=0)
+        read = []
+
+        def body():
+            read.extend(db.Get(["a"]))
+            yield b""
+
+        db.Get("a")
+        cache = db.request_cache.get()
+
+        # Deferred work captures the context of the request, but doesn't share its identity map
+        stream = _iter_in_context(body())
+        queue.add(lambda: read.extend(db.Get(["a"])))
+
+        entity = db.Entity()
+        entity.key = "a"
+        db.Put(entity)
+        self.store["a"] = {"name": "modified"}
+
+        self.assertTrue(queue.drain(timeout=5))
+        list(stream)
+
+        self.assertEqual(read, [{"name": "modified"}, {"name": "modified"}])
+        self.assertIs(db.request_cache.get(), cache)
+        self.assertEqual(cache, {})
@@ -0,0 +1,127 @@
+import unittest
+from unittest import mock
+
+
+class TestMemoryRateLimitBackend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_sliding_window(self):
+        from viur.core.ratelimit import MemoryRateLimitBackend, RateLimit
+        backend = MemoryRateLimitBackend()
+        rate_limit = RateLimit("login", 3, 1, "ip", backend=backend)
+
+        with mock.patch("time.monotonic", return_value=1000.0):
+            for _ in range(5):
+                backend.decrement_quota(rate_limit, "1.2.3.4")
+
+            # Only maxRate + 1 hits are kept per endpoint
+            self.assertEqual(backend.hits(rate_limit, "1.2.3.4"), 4)
+            self.assertEqual(backend.hits(rate_limit, "5.6.7.8"), 0)
+
+        with mock.patch("time.monotonic", return_value=1030.0):
+            backend.decrement_quota(rate_limit, "1.2.3.4")
+            self.assertEqual(backend.hits(rate_limit, "1.2.3.4"), 4)
+
+        with mock.patch("time.monotonic", return_value=1061.0):
+            self.assertEqual(backend.hits(rate_limit, "1.2.3.4"), 1)
+
+    def test_bounded(self):
+        from viur.core.ratelimit import MemoryRateLimitBackend, RateLimit
+        rate_limit = RateLimit("login", 3, 1, "ip")
+
+        with mock.patch("time.monotonic", return_value=1000.0):
+            backend = MemoryRateLimitBackend(max_entries=2, compact_interval=10)
+            for endpoint in ("a", "b", "c"):
+                backend.decrement_quota(rate_limit, endpoint)
+
+            self.assertEqual(list(backend._entries), ["login-3-1-b", "login-3-1-c"])
+
+        # Endpoints without hits in their time-span are compacted away
+        with mock.patch("time.monotonic", return_value=1061.0):
+            backend.decrement_quota(rate_limit, "d")
+            self.assertEqual(list(backend._entries), ["login-3-1-d"])
+
+    def test_rates(self):
+        from viur.core.ratelimit import MemoryRateLimitBackend, RateLimit
+        backend = MemoryRateLimitBackend()
+        strict = RateLimit("login", 2, 1, "ip")
+        loose = RateLimit("login", 5, 10, "ip")
+
+        # RateLimits on the same resource with another rate or time-span are counted on their own
+        with mock.patch("time.monotonic", return_value=1000.0):
+            for _ in range(4):
+                backend.decrement_quota(loose, "1.2.3.4")
+
+            backend.decrement_quota(strict, "1.2.3.4")
+            self.assertEqual(backend.hits(loose, "1.2.3.4"), 4)
+            self.assertEqual(backend.hits(strict, "1.2.3.4"), 1)
+
+        with mock.patch("time.monotonic", return_value=1061.0):
+            self.assertEqual(backend.hits(loose, "1.2.3.4"), 4)
+            self.assertEqual(backend.hits(strict, "1.2.3.4"), 0)
+
+    def test_store(self):
+        import datetime
+        from viur.core import utils
+        from viur.core.ratelimit import MemoryRateLimitBackend, MemoryRateLimitStore, RateLimit
+        now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+        patch = mock.patch.object(utils, "utcNow", return_value=now)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        store = MemoryRateLimitStore()
+        instance_a = MemoryRateLimitBackend(store=store, sync_interval=1)
+        instance_b = MemoryRateLimitBackend(store=store, sync_interval=1)
+        rate_limit = RateLimit("login", 10, 1, "ip")
+
+        with mock.patch("time.monotonic", return_value=1000.0):
+            for _ in range(3):
+                instance_a.decrement_quota(rate_limit, "1.2.3.4")
+
+            # Hits within the sync interval are written to the store together with the next synchronization
+            self.assertEqual(instance_a.hits(rate_limit, "1.2.3.4"), 3)
+            self.assertEqual(instance_b.hits(rate_limit, "1.2.3.4"), 1)
+
+        with mock.patch("time.monotonic", return_value=1002.0):
+            instance_a.hits(rate_limit, "1.2.3.4")
+
+        with mock.patch("time.monotonic", return_value=1004.0):
+            self.assertEqual(instance_b.hits(rate_limit, "1.2.3.4"), 3)
+
+
+class TestDatastoreRateLimitBackend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_shards(self):
+        import datetime
+        from viur.core import db, utils
+        from viur.core.ratelimit import DatastoreRateLimitBackend, RateLimit
+        now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+        backend = DatastoreRateLimitBackend(shards=4)
+        rate_limit = RateLimit("login", 10, 15, "ip", backend=backend)
+        entities = {}
+
+        def increment(func, name):
+            entity = entities.setdefault(name, {"value": 0, "expires": now + datetime.timedelta(minutes=30)})
+            entity["value"] += 1
+
+        with mock.patch.object(utils, "utcNow", return_value=now), \
+                mock.patch.object(db, "Key", side_effect=lambda kind, name: name), \
+                mock.patch.object(db, "RunInTransaction", side_effect=increment), \
+                mock.patch.object(db, "Get", side_effect=lambda keys: [entities.get(key) for key in keys]) as get:
+            for shard in (0, 3, 3):
+                with mock.patch("random.randrange", return_value=shard):
+                    backend.decrement_quota(rate_limit, "1.2.3.4")
+
+            self.assertEqual(sorted(entities), ["login-1.2.3.4-2024-01-01-240", "login-1.2.3.4-2024-01-01-240-3"])
+            self.assertEqual(backend.hits(rate_limit, "1.2.3.4"), 3)
+
+            # All shards of all steps are read at once
+            get.assert_called_once()
+            self.assertEqual(len(get.call_args.args[0]), rate_limit.steps * 4)
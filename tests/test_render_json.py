@@ -0,0 +1,250 @@
+import json
+import unittest
+from unittest import mock
+
+
+class TestStreamList(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def setUp(self):
+        from viur.core import current
+        self.request = mock.Mock()
+        self.request.response.headers = {}
+        self.token = current.request.set(self.request)
+
+    def tearDown(self):
+        from viur.core import current
+        current.request.reset(self.token)
+
+    def test_stream_list(self):
+        from viur.core import conf
+        from viur.core.render.json.default import DefaultRender
+        render = DefaultRender()
+        render.stream_chunk_size = 64
+        skellist = [{"name": f"entry {i}", "sortindex": i} for i in range(10)]
+
+        expected = json.loads(render.list(skellist, params={"limit": 10}))
+
+        with mock.patch.object(conf, "render_json_stream_lists", True):
+            chunks = list(render.list(skellist, params={"limit": 10}))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+        self.assertEqual(json.loads(b"".join(chunks)), expected)
+        self.assertEqual(self.request.response.headers["Content-Type"], "application/json")
+
+    def test_lazy(self):
+        from viur.core.render.json.default import DefaultRender
+        render = DefaultRender()
+        render.stream_chunk_size = 1
+        rendered = []
+
+        def entries():
+            for i in range(3):
+                rendered.append(i)
+                yield {"name": f"entry {i}"}
+
+        stream = render.stream_list(entries(), {"action": "list", "cursor": "abc"})
+
+        # The envelope is emitted with the first entry, the remaining entries are rendered on demand
+        self.assertEqual(next(stream), b'{"action": "list", "cursor": "abc", "skellist": [{"name": "entry 0"}')
+        self.assertEqual(rendered, [0])
+        self.assertEqual(b"".join(stream), b', {"name": "entry 1"}, {"name": "entry 2"}]}')
+
+
+class TestDumps(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_fast_encoder(self):
+        import datetime
+        import enum
+        import importlib
+        from viur.core import conf
+        render_json = importlib.import_module("viur.core.render.json.default")
+        if not render_json.orjson_dependencies:
+            self.skipTest("orjson is not installed")
+
+        class Color(enum.Enum):
+            RED = "red"
+
+        value = {
+            "name": "Übersicht",
+            "date": datetime.datetime(2024, 1, 1, 12, 0, 0, 5, tzinfo=datetime.timezone.utc),
+            "color": Color.RED,
+            "tags": {"a"},
+            1: [1.5, None, True],
+        }
+
+        expected = render_json.dumps(value)
+        with mock.patch.object(conf, "render_json_fast_encoder", True):
+            encoded = render_json.dumps(value)
+
+        self.assertNotEqual(encoded, expected)
+        self.assertEqual(json.loads(encoded), json.loads(expected))
+
+
+class TestRenderPlan(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import NumericBone, PasswordBone, StringBone
+        from viur.core.skeleton import Skeleton
+
+        class RenderTestSkel(Skeleton):
+            name = StringBone()
+            tags = StringBone(multiple=True)
+            title = StringBone(languages=["de", "en"])
+            keywords = StringBone(multiple=True, languages=["de", "en"])
+            count = NumericBone()
+            password = PasswordBone()
+
+        class Entity(dict):
+            key = None
+
+        cls.skel_cls = RenderTestSkel
+        cls.entity_cls = Entity
+
+    def setUp(self):
+        from viur.core import current
+        self.token = current.request.set(mock.Mock())
+
+    def tearDown(self):
+        from viur.core import current
+        current.request.reset(self.token)
+
+    def test_render(self):
+        from viur.core.render.json.default import DefaultRender
+        render = DefaultRender()
+
+        for entity in (
+            {
+                "name": "foo",
+                "tags": ["a", "b"],
+                "title": {"_viurLanguageWrapper_": True, "de": "Titel", "en": "Title"},
+                "keywords": {"_viurLanguageWrapper_": True, "de": ["a"], "en": []},
+                "count": 42,
+                "password": "secret",
+            },
+            {"title": {"_viurLanguageWrapper_": True, "de": "Titel"}},
+            {},
+        ):
+            with self.subTest(entity=entity):
+                skel = self.skel_cls()
+                skel.setEntity(self.entity_cls(entity))
+
+                expected = {name: render.renderBoneValue(bone, skel, name) for name, bone in skel.items()}
+                self.assertEqual(render.renderSkelValues(skel), expected)
+
+    def test_recompile(self):
+        from viur.core.render.json.default import DefaultRender
+        render = DefaultRender()
+
+        plan = render._get_render_plan(self.skel_cls())
+        self.assertIs(render._get_render_plan(self.skel_cls()), plan)
+
+        # Bone subsets get a plan of their own, cloned bones cause a re-compilation
+        subskel = self.skel_cls(bones=("name", ))
+        self.assertEqual([name for name, _ in render._get_render_plan(subskel)], ["key", "name"])
+
+        skel = self.skel_cls().clone()
+        skel.tags.multiple = False
+        skel.setEntity(self.entity_cls({"tags": "a"}))
+        self.assertIsNot(render._get_render_plan(skel), plan)
+        self.assertEqual(render.renderSkelValues(skel)["tags"], "a")
+
+    def test_custom_render(self):
+        from viur.core.render.json.default import DefaultRender
+
+        class CustomRender(DefaultRender):
+            def renderSingleBoneValue(self, value, bone, skel, key):
+                return f"{key}: {value}"
+
+        skel = self.skel_cls()
+        skel.setEntity(self.entity_cls({"name": "foo", "tags": ["a"]}))
+
+        res = CustomRender().renderSkelValues(skel)
+        self.assertEqual(res["name"], "name: foo")
+        self.assertEqual(res["tags"], ["tags: a"])
+
+
+class TestStructureCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import SelectBone, StringBone
+        from viur.core.skeleton import Skeleton
+
+        class StructureTestSkel(Skeleton):
+            name = StringBone()
+            status = SelectBone(values={"new": "New", "done": "Done"})
+
+        class DynamicStructureTestSkel(Skeleton):
+            name = StringBone()
+            status = SelectBone(values=lambda: {"new": "New"})
+
+        cls.skel_cls = StructureTestSkel
+        cls.dynamic_skel_cls = DynamicStructureTestSkel
+
+    def setUp(self):
+        from viur.core import conf, current
+        self.token = current.language.set("en")
+
+        patch = mock.patch.object(conf, "compatibility", [])
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from viur.core import current
+        current.language.reset(self.token)
+
+    def test_cache(self):
+        from viur.core import conf, current
+        from viur.core.render.json.default import DefaultRender
+
+        rendered = DefaultRender.render_skel_structure(self.skel_cls())
+        self.assertIn("name", rendered.structure)
+        self.assertEqual(rendered.structure["status"]["values"], {"new": "New", "done": "Done"})
+        self.assertEqual(json.loads(json.dumps(rendered.structure)), rendered.structure)
+        self.assertIs(DefaultRender.render_skel_structure(self.skel_cls()), rendered)
+
+        # Bone subsets, languages and compatibility flags are cached separately
+        subskel = DefaultRender.render_skel_structure(self.skel_cls(bones=("name", )))
+        self.assertEqual(list(subskel.structure), ["key", "name"])
+        self.assertNotEqual(subskel.etag, rendered.etag)
+
+        current.language.set("de")
+        self.assertIsNot(DefaultRender.render_skel_structure(self.skel_cls()), rendered)
+
+        current.language.set("en")
+        with mock.patch.object(conf, "compatibility", ["json.bone.structure.keytuples"]):
+            keytuples = DefaultRender.render_skel_structure(self.skel_cls())
+            self.assertIsInstance(keytuples.structure, list)
+            self.assertIs(DefaultRender.render_skel_structure(self.skel_cls()), keytuples)
+
+        self.assertIs(DefaultRender.render_skel_structure(self.skel_cls()), rendered)
+
+    def test_not_cached(self):
+        from viur.core.render.json.default import DefaultRender
+
+        # Cloned skeletons can be modified at runtime
+        skel = self.skel_cls().clone()
+        skel.name.readOnly = True
+        rendered = DefaultRender.render_skel_structure(skel)
+        self.assertTrue(rendered.structure["name"]["readonly"])
+        self.assertFalse(DefaultRender.render_skel_structure(self.skel_cls()).structure["name"]["readonly"])
+        self.assertIsNot(DefaultRender.render_skel_structure(skel), rendered)
+        self.assertEqual(DefaultRender.render_skel_structure(skel).etag, rendered.etag)
+
+        # Select values provided by a function can change on every call
+        skel = self.dynamic_skel_cls()
+        self.assertIsNot(DefaultRender.render_skel_structure(skel), DefaultRender.render_skel_structure(skel))
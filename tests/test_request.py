@@ -0,0 +1,216 @@
+import unittest
+from unittest import mock
+
+
+class TestRoutingTrie(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def setUp(self):
+        from viur.core.module import Method
+
+        def method(name):
+            def func(*args, **kwargs):
+                return name
+
+            func.__name__ = name
+            return Method(func)
+
+        self.methods = {name: method(name) for name in ("index", "view", "list", "vi_index", "vi_view")}
+        self.allowed = True
+        self.resolver = {
+            "index": self.methods["index"],
+            "user": {
+                "view": self.methods["view"],
+                "list": self.methods["list"],
+                "empty": {},
+            },
+            "vi": {
+                "canAccess": lambda: self.allowed,
+                "index": self.methods["vi_index"],
+                "user": {
+                    "view": self.methods["vi_view"],
+                },
+            },
+        }
+
+    def test_resolve(self):
+        from viur.core.request import RoutingTrie
+        trie = RoutingTrie(self.resolver)
+
+        for path_list, name, args in (
+            ((), "index", ()),
+            (("",), "index", ("",)),
+            (("user", "view", "abc"), "view", ("abc",)),
+            (("user", "list"), "list", ()),
+            (("unknown", "abc"), "index", ("unknown", "abc")),
+            (("vi",), "vi_index", ()),
+            (("vi", "user", "view", "abc", "def"), "vi_view", ("abc", "def")),
+        ):
+            with self.subTest(path_list=path_list):
+                route = trie.resolve(path_list)
+                self.assertIsNone(route.error)
+                self.assertIs(route.method, self.methods[name])
+                self.assertEqual(path_list[route.offset:], args)
+
+        self.assertEqual(trie.resolve(("user", "view")).allow, "GET, HEAD, OPTIONS, POST")
+        self.assertEqual(trie.resolve.cache_info().currsize, 8)
+
+    def test_errors(self):
+        from viur.core import errors
+        from viur.core.request import RoutingTrie
+        trie = RoutingTrie(self.resolver)
+
+        self.assertIs(trie.resolve(("user",)).error, errors.MethodNotAllowed)
+        self.assertIs(trie.resolve(("user", "empty")).error, errors.NotFound)
+
+        route = trie.resolve(("user", "unknown"))
+        self.assertIs(route.error, errors.NotFound)
+        self.assertEqual(route.offset, 2)
+
+    def test_guards(self):
+        from viur.core.request import RoutingTrie
+        trie = RoutingTrie(self.resolver)
+
+        self.assertEqual(trie.resolve(("user", "view")).guards, ())
+
+        # Guards are resolved once, but evaluated on every request
+        guards = trie.resolve(("vi", "user", "view")).guards
+        self.assertEqual(len(guards), 1)
+        self.assertTrue(all(guard() for guard in guards))
+        self.allowed = False
+        self.assertFalse(all(guard() for guard in trie.resolve(("vi", "user", "view")).guards))
+
+    def test_immutable(self):
+        from viur.core.request import RoutingTrie
+        trie = RoutingTrie(self.resolver)
+
+        with self.assertRaises(AttributeError):
+            trie.root.index = None
+
+        with self.assertRaises(TypeError):
+            trie.root.children["admin"] = {}
+
+
+class TestStreamedResponse(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_iter_in_context(self):
+        from viur.core import current
+        from viur.core.request import _iter_in_context
+        closed = []
+
+        def body():
+            try:
+                for _ in range(3):
+                    yield current.language.get().encode()
+            finally:
+                closed.append(current.language.get())
+
+        token = current.language.set("de")
+        stream = _iter_in_context(body())
+        current.language.reset(token)
+
+        # The stream is consumed after the request has reset its context
+        self.assertEqual(next(stream), b"de")
+        stream.close()
+        self.assertEqual(closed, ["de"])
+
+
+class TestConditional(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def conditional(self, method: str = "get", headers: dict = {}, internal: bool = False, **kwargs):
+        import webob
+        from viur.core.request import Router
+        router = mock.Mock(method=method, request=webob.Request.blank("/", headers=headers), internalRequest=internal)
+        router.response = webob.Response()
+        Router.conditional(router, **kwargs)
+        return router.response
+
+    def test_etag(self):
+        from viur.core import errors
+
+        for method, headers, not_modified in (
+            ("get", {}, False),
+            ("get", {"If-None-Match": '"abc"'}, True),
+            ("head", {"If-None-Match": 'W/"xyz", "abc"'}, True),
+            ("get", {"If-None-Match": '"xyz"'}, False),
+            ("post", {"If-None-Match": '"abc"'}, False),
+        ):
+            with self.subTest(method=method, headers=headers):
+                if not_modified:
+                    with self.assertRaises(errors.NotModified):
+                        self.conditional(method, headers, etag="abc")
+                else:
+                    response = self.conditional(method, headers, etag="abc")
+                    self.assertEqual(response.headers["ETag"], '"abc"')
+                    self.assertEqual(response.headers["Cache-Control"], "private, no-cache")
+
+        # Validators only apply to the outer request
+        response = self.conditional(headers={"If-None-Match": '"abc"'}, internal=True, etag="abc")
+        self.assertNotIn("ETag", response.headers)
+
+    def test_last_modified(self):
+        import datetime
+        from viur.core import errors
+        last_modified = datetime.datetime(2024, 1, 1, 12, 0, 0, 500, tzinfo=datetime.timezone.utc)
+
+        for headers, not_modified in (
+            ({"If-Modified-Since": "Mon, 01 Jan 2024 12:00:00 GMT"}, True),
+            ({"If-Modified-Since": "Mon, 01 Jan 2024 11:59:59 GMT"}, False),
+            # The ETag takes precedence
+            ({"If-Modified-Since": "Mon, 01 Jan 2024 12:00:00 GMT", "If-None-Match": '"xyz"'}, False),
+        ):
+            with self.subTest(headers=headers):
+                if not_modified:
+                    with self.assertRaises(errors.NotModified):
+                        self.conditional(headers=headers, etag="abc", last_modified=last_modified)
+                else:
+                    response = self.conditional(headers=headers, etag="abc", last_modified=last_modified)
+                    self.assertEqual(response.headers["Last-Modified"], "Mon, 01 Jan 2024 12:00:00 GMT")
+
+        # Naive datetimes are interpreted as UTC
+        with self.assertRaises(errors.NotModified):
+            self.conditional(
+                headers={"If-Modified-Since": "Mon, 01 Jan 2024 12:00:00 GMT"},
+                last_modified=datetime.datetime(2024, 1, 1, 12, 0, 0),
+            )
+
+    def test_cache_control(self):
+        import datetime
+        from viur.core.decorators import cache_control, exposed
+        from viur.core.request import RoutingTrie
+
+        @exposed
+        @cache_control(max_age=datetime.timedelta(minutes=5), public=True, stale_while_revalidate=30)
+        def news():
+            pass
+
+        @exposed
+        @cache_control(no_cache=True)
+        def view():
+            pass
+
+        self.assertEqual(news.cache_control, "public, max-age=300, stale-while-revalidate=30")
+        self.assertEqual(view.cache_control, "private, no-cache")
+
+        trie = RoutingTrie({"news": news, "view": view, "index": view})
+        self.assertEqual(trie.resolve(("news", )).cache_control, news.cache_control)
+        self.assertEqual(trie.resolve(("view", "abc")).cache_control, view.cache_control)
+
+        # A policy set for the method is kept
+        import webob
+        from viur.core.request import Router
+        router = mock.Mock(method="get", request=webob.Request.blank("/"), internalRequest=False)
+        router.response = webob.Response(headers={"Cache-Control": news.cache_control})
+        Router.conditional(router, etag="abc")
+        self.assertEqual(router.response.headers["Cache-Control"], news.cache_control)
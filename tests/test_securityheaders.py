@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+
+class TestSecurityHeaders(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def setUp(self):
+        from viur.core import conf, securityheaders
+        patches = (
+            mock.patch.object(conf, "main_app", None),
+            mock.patch.object(conf.security, "content_security_policy", {"_headerCache": {}}),
+            mock.patch.object(conf.security, "permissions_policy", {"autoplay": ["self"]}),
+            mock.patch.object(conf.security, "strict_transport_security", "max-age=60"),
+            mock.patch.object(conf.security, "x_frame_options", ("sameorigin", None)),
+            mock.patch.object(conf.security, "x_xss_protection", True),
+            mock.patch.object(conf.security, "referrer_policy", "strict-origin"),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        securityheaders.invalidate_security_headers()
+        self.addCleanup(securityheaders.invalidate_security_headers)
+
+    def test_headers(self):
+        from viur.core import securityheaders
+        securityheaders.addCspRule("default-src", "self", "enforce")
+        securityheaders._rebuildCspHeaderCache()
+        securityheaders._rebuildPermissionHeaderCache()
+
+        headers = dict(securityheaders.get_security_headers(True))
+        self.assertEqual(headers["Content-Security-Policy"], "default-src 'self'; ")
+        self.assertEqual(headers["Strict-Transport-Security"], "max-age=60")
+        self.assertEqual(headers["X-Frame-Options"], "sameorigin")
+        self.assertEqual(headers["X-XSS-Protection"], "1; mode=block")
+        self.assertEqual(headers["Permissions-Policy"], "autoplay=(self)")
+
+        # Strict-Transport-Security is only emitted on secure channels
+        self.assertNotIn("Strict-Transport-Security", dict(securityheaders.get_security_headers(False)))
+
+    def test_invalidate(self):
+        from viur.core import conf, securityheaders
+        headers = securityheaders.get_security_headers(True)
+        self.assertIs(securityheaders.get_security_headers(True), headers)
+
+        # Direct changes are not picked up...
+        conf.security.referrer_policy = "no-referrer"
+        self.assertIn(("Referrer-Policy", "strict-origin"), securityheaders.get_security_headers(True))
+
+        # ...but the setters invalidate the precomputed headers
+        securityheaders.setXFrameOptions("deny")
+        securityheaders.setXXssProtection(False)
+        headers = securityheaders.get_security_headers(True)
+        self.assertIn(("Referrer-Policy", "no-referrer"), headers)
+        self.assertIn(("X-Frame-Options", "deny"), headers)
+        self.assertIn(("X-XSS-Protection", "0"), headers)
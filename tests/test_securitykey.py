@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+
+class TestStatelessSecurityKey(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def setUp(self):
+        from viur.core import conf, current, securitykey
+        self.session = mock.Mock(loaded=True, cookie_key="session-a")
+        self.token = current.session.set(self.session)
+
+        patches = (
+            mock.patch.object(conf, "file_hmac_key", b"secret"),
+            mock.patch.object(conf.security, "skey_stateless", True),
+            mock.patch.object(securitykey, "_replay_cache", None),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from viur.core import current
+        current.session.reset(self.token)
+
+    def test_create_validate(self):
+        from viur.core import db, securitykey
+        with mock.patch.object(db, "Put") as put:
+            key = securitykey.create()
+            put.assert_not_called()
+
+        self.assertTrue(securitykey.validate(key))
+        self.assertFalse(securitykey.validate(key))  # can't be replayed
+
+    def test_invalid(self):
+        from viur.core import securitykey
+        key = securitykey.create()
+        until, nonce, signature = key.split(".")
+
+        self.assertFalse(securitykey.validate(f"{int(until) + 60}.{nonce}.{signature}"))
+        self.assertFalse(securitykey.validate(f"{until}.{nonce}x.{signature}"))
+        self.assertFalse(securitykey.validate(f"{until}.{nonce}"))
+        self.assertFalse(securitykey.validate(key, session_bound=False))
+
+        # Key of another session
+        self.session.cookie_key = "session-b"
+        self.assertFalse(securitykey.validate(key))
+
+    def test_expired(self):
+        from viur.core import securitykey
+        with mock.patch("time.time", return_value=1000.0):
+            key = securitykey.create(duration=60)
+
+        with mock.patch("time.time", return_value=1061.0):
+            self.assertFalse(securitykey.validate(key))
+
+    def test_custom_data(self):
+        from viur.core import db, securitykey
+        with mock.patch.object(db, "Put") as put, mock.patch.object(db, "Entity"):
+            key = securitykey.create(session_bound=False, user_key="abc")
+            put.assert_called_once()
+
+        self.assertNotIn(".", key)
@@ -0,0 +1,188 @@
+import unittest
+from unittest import mock
+
+
+class TestTieredSessionBackend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def setUp(self):
+        from viur.core import db
+
+        # Generation counters are kept in this dict instead of the datastore
+        self.generations = {}
+
+        class Entity(dict):
+            def __init__(self, key):
+                super().__init__()
+                self.key = key
+
+        def get(keys):
+            return [self.generations.get(key) for key in keys]
+
+        def put(entities):
+            self.generations.update({entity.key: entity for entity in entities})
+
+        patcher = mock.patch.multiple(
+            db,
+            Key=lambda kind, name: (kind, name),
+            Entity=Entity,
+            Get=get,
+            Put=put,
+            RunInTransaction=lambda fn, *args: fn(*args),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_save_delete(self):
+        from viur.core.cache import MemoryCacheBackend
+        from viur.core.session import SessionBackend, TieredSessionBackend
+
+        backend = mock.Mock(spec=SessionBackend)
+        backend.load.return_value = {"data": {"language": "de"}, "lastseen": 1.0}
+        tiered = TieredSessionBackend(MemoryCacheBackend(max_size=1024 * 1024, ttl=60), backend)
+
+        # The first load is served by the backend, further ones from the cache tier
+        self.assertEqual(tiered.load("abc"), {"data": {"language": "de"}, "lastseen": 1.0})
+        entry = tiered.load("abc")
+        self.assertEqual(entry, {"data": {"language": "de"}, "lastseen": 1.0})
+        self.assertEqual(backend.load.call_count, 1)
+
+        # Modifications of a loaded session must not leak into the cache tier
+        entry["data"]["language"] = "en"
+        self.assertEqual(tiered.load("abc")["data"], {"language": "de"})
+
+        # Sessions are written through
+        tiered.save("abc", {"data": {"language": "en"}, "lastseen": 2.0})
+        backend.save.assert_called_once_with("abc", {"data": {"language": "en"}, "lastseen": 2.0})
+        self.assertEqual(tiered.load("abc")["data"], {"language": "en"})
+        self.assertEqual(backend.load.call_count, 1)
+
+        tiered.delete("abc")
+        backend.delete.assert_called_once_with("abc")
+        backend.load.return_value = None
+        self.assertIsNone(tiered.load("abc"))
+
+    def test_evict(self):
+        from viur.core.cache import MemoryCacheBackend
+        from viur.core.session import SessionBackend, TieredSessionBackend
+
+        backend = mock.Mock(spec=SessionBackend)
+        tiered = TieredSessionBackend(MemoryCacheBackend(max_size=1024 * 1024, ttl=60), backend)
+        tiered.save("abc", {"data": {}, "lastseen": 1.0})
+
+        backend.load.return_value = None
+        tiered.evict("abc")
+        self.assertIsNone(tiered.load("abc"))
+        backend.evict.assert_called_once_with("abc")
+        backend.delete.assert_not_called()
+
+        # Evicting a session doesn't touch its generation counter
+        self.assertEqual(self.generations, {})
+
+    def test_revocation(self):
+        from viur.core import conf
+        from viur.core.cache import MemoryCacheBackend
+        from viur.core.session import SESSION_GENERATION_KIND, SessionBackend, TieredSessionBackend
+
+        backend = mock.Mock(spec=SessionBackend)
+        backend.load.return_value = {"data": {"language": "de"}, "lastseen": 1.0}
+
+        # Two instances, each with its own in-process cache tier
+        first = TieredSessionBackend(MemoryCacheBackend(max_size=1024 * 1024, ttl=60), backend)
+        second = TieredSessionBackend(MemoryCacheBackend(max_size=1024 * 1024, ttl=60), backend)
+        self.assertFalse(first.shared)
+
+        for cookie_key in ("abc", "def"):
+            self.assertIsNotNone(first.load(cookie_key))
+            self.assertIsNotNone(second.load(cookie_key))
+
+        self.assertEqual(backend.load.call_count, 4)
+
+        # The sessions are killed on the first instance, the second one only notices by their generation counters
+        with mock.patch("viur.core.db.RunInTransaction", wraps=lambda fn, *args: fn(*args)) as run_in_transaction:
+            first.revoke(["abc", "def"])
+
+        run_in_transaction.assert_called_once()
+        backend.revoke.assert_called_once_with(["abc", "def"])
+        self.assertEqual(
+            {key: entity["generation"] for key, entity in self.generations.items()},
+            {(SESSION_GENERATION_KIND, "abc"): 1, (SESSION_GENERATION_KIND, "def"): 1},
+        )
+
+        backend.load.return_value = None
+        self.assertIsNotNone(second.load("abc"))  # until the counter is checked again
+
+        with mock.patch.object(conf, "cache_generation_check_interval", 0):
+            self.assertIsNone(second.load("abc"))
+            self.assertIsNone(second.load("def"))
+
+        self.assertIsNone(first.load("abc"))
+
+        # Explicitly deleted sessions are revoked as well
+        backend.load.return_value = {"data": {}, "lastseen": 1.0}
+        self.assertIsNotNone(second.load("ghi"))
+        first.delete("ghi")
+        backend.load.return_value = None
+
+        with mock.patch.object(conf, "cache_generation_check_interval", 0):
+            self.assertIsNone(second.load("ghi"))
+
+        # Shared tiers don't need generation counters
+        self.generations.clear()
+        shared = TieredSessionBackend(MemoryCacheBackend(max_size=1024 * 1024, ttl=60), backend, shared=True)
+        shared.save("abc", {"data": {}, "lastseen": 1.0})
+        shared.delete("abc")
+        shared.revoke(["abc"])
+        self.assertEqual(self.generations, {})
+
+    def test_delete_sessions_iter(self):
+        from viur.core import db
+        from viur.core.session import DeleteSessionsIter, Session
+
+        entries = [mock.Mock(key=mock.Mock(id_or_name=name)) for name in ("abc", "def")]
+        backend = mock.Mock()
+
+        with (
+            mock.patch.object(db, "delete_multi"),
+            mock.patch("viur.core.session.get_backend", return_value=backend),
+            mock.patch.object(Session, "dispatch_on_delete"),
+        ):
+            # Expired sessions are only evicted
+            DeleteSessionsIter.handleBatch(entries, None)
+            self.assertEqual(backend.evict.call_count, 2)
+            backend.revoke.assert_not_called()
+
+            # Killed sessions are revoked with one call per batch
+            backend.reset_mock()
+            DeleteSessionsIter.handleBatch(entries, {"revoke": True})
+            backend.revoke.assert_called_once_with(["abc", "def"])
+            backend.evict.assert_not_called()
+
+
+class TestStatelessSession(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_seal(self):
+        from viur.core import conf, session
+        with mock.patch.object(conf, "file_hmac_key", b"secret"):
+            value = session.seal(b'{"data":{"lang":"de"}}')
+            self.assertNotIn(";", value)
+            self.assertEqual(session.unseal(value), b'{"data":{"lang":"de"}}')
+
+            # Any modification invalidates the value
+            mode, payload, signature = value.split(".")
+            forged = session._b64encode(b'{"data":{"lang":"en"}}')
+            self.assertIsNone(session.unseal(f"{mode}.{forged}.{signature}"))
+            self.assertIsNone(session.unseal(f"{mode}.{payload}.{signature[:-2]}"))
+            self.assertIsNone(session.unseal(f"{mode}.{payload}"))
+            self.assertIsNone(session.unseal("abcdefg"))
+
+        # Values sealed by another instance secret are rejected
+        with mock.patch.object(conf, "file_hmac_key", b"other"):
+            self.assertIsNone(session.unseal(value))
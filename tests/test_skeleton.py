@@ -0,0 +1,709 @@
+import copy
+import dataclasses
+import unittest
+from unittest import mock
+
+
+@dataclasses.dataclass(frozen=True)
+class FakeKey:
+    kind: str
+    id_or_name: str | int | None = None
+
+    @property
+    def is_partial(self):
+        return self.id_or_name is None
+
+
+class FakeEntity(dict):
+    def __init__(self, key=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.key = key
+        self.exclude_from_indexes = set()
+
+
+class FakeDatastore:
+    """
+        In-memory replacement for the datastore functions used when writing skeletons.
+        Transactions are emulated by restoring the stored entities when the transactional function fails.
+    """
+
+    def __init__(self):
+        self.entities = {}
+        self.calls = []
+        self.lookups = []
+        self.ids = 0
+
+    def patch(self):
+        from viur.core import db
+
+        return mock.patch.multiple(
+            db,
+            Entity=FakeEntity,
+            Key=FakeKey,
+            keyHelper=lambda key, kind: key if isinstance(key, FakeKey) else FakeKey(kind, key),
+            AllocateIDs=self.allocate_ids,
+            Get=self.get,
+            Put=self.put,
+            Delete=self.delete,
+            IsInTransaction=mock.Mock(return_value=False),
+            RunInTransaction=self.run_in_transaction,
+        )
+
+    def allocate_ids(self, keys):
+        self.calls.append("AllocateIDs")
+        res = []
+        for key in keys:
+            self.ids += 1
+            res.append(FakeKey(key.kind, self.ids))
+
+        return res
+
+    def get(self, keys):
+        self.calls.append("Get")
+        self.lookups.append(keys)
+        if isinstance(keys, list):
+            return [copy.deepcopy(self.entities.get(key)) for key in keys]
+
+        return copy.deepcopy(self.entities.get(keys))
+
+    def put(self, entities):
+        self.calls.append("Put")
+        for entity in entities if isinstance(entities, list) else [entities]:
+            self.entities[entity.key] = copy.deepcopy(entity)
+
+    def delete(self, keys):
+        self.calls.append("Delete")
+        for key in keys if isinstance(keys, list) else [keys]:
+            self.entities.pop(key, None)
+
+    def run_in_transaction(self, fn, *args, **kwargs):
+        self.calls.append("RunInTransaction")
+        backup = copy.deepcopy(self.entities)
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            self.entities = backup
+            raise
+
+    def kind(self, kind):
+        return {key.id_or_name: entity for key, entity in self.entities.items() if key.kind == kind}
+
+
+class TestBoneAccessorTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import BooleanBone, NumericBone, StringBone
+        from viur.core.skeleton import Skeleton
+
+        class AccessorTestSkel(Skeleton):
+            name = StringBone()
+            tags = StringBone(multiple=True)
+            title = StringBone(languages=["de", "en"])
+            count = NumericBone()
+            flag = BooleanBone()
+
+        class Entity(dict):
+            key = None
+
+        cls.skel_cls = AccessorTestSkel
+        cls.entity_cls = Entity
+
+    def test_compiled(self):
+        from viur.core.bones import BaseBone
+        unserializers = self.skel_cls.__boneAccessors__.unserializers
+
+        # Fast path for bones which are not multiple and have no languages
+        for name in ("name", "count", "flag"):
+            with self.subTest(name=name):
+                self.assertNotIsInstance(getattr(unserializers[name][1], "__self__", None), BaseBone)
+
+        for name in ("key", "tags", "title"):
+            with self.subTest(name=name):
+                self.assertIs(unserializers[name][1].__self__, unserializers[name][0])
+
+    def test_unserialize(self):
+        for entity in (
+            {"name": "foo", "count": 42, "flag": True, "tags": ["a", "b"], "title": "bar"},
+            {"name": ["foo", "bar"], "count": None, "tags": "a"},
+            {"name": {"_viurLanguageWrapper_": True, "de": "foo", "en": "bar"}},
+            {},
+        ):
+            with self.subTest(entity=entity):
+                skel = self.skel_cls()
+                skel.setEntity(self.entity_cls(entity))
+
+                # A cloned skeleton doesn't use the compiled unserializers
+                cloned = self.skel_cls().clone()
+                cloned.setEntity(self.entity_cls(entity))
+
+                self.assertEqual(dict(skel), dict(cloned))
+
+        skel = self.skel_cls()
+        skel.setEntity(self.entity_cls({"name": ["foo", "bar"], "count": 42}))
+        self.assertEqual(skel["name"], "foo")
+        self.assertEqual(skel["count"], 42)
+        self.assertIsNone(skel["flag"])
+
+    def test_class_attributes(self):
+        skel = self.skel_cls()
+        _ = skel.write  # caches the attribute of the skeleton class
+
+        # Modifications of the skeleton class or its bases invalidate cached attributes
+        with mock.patch.object(self.skel_cls, "write") as write:
+            skel.write()
+            write.assert_called_once_with(skel)
+
+        with mock.patch.object(self.skel_cls.__mro__[1], "refresh") as refresh:
+            skel.refresh()
+            refresh.assert_called_once_with(skel)
+
+        self.assertEqual(skel.write.func, self.skel_cls.write)
+
+
+class TestUpdateRelationsBulk(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import RelationalBone, StringBone
+        from viur.core.skeleton import DatabaseAdapter, Skeleton
+
+        class Entity(dict):
+            def __init__(self, key=None, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.key = key
+                self.exclude_from_indexes = set()
+
+        class Key(str):
+            def __new__(cls, kind, id_or_name=None):
+                key = super().__new__(cls, f"{kind}/{id_or_name}")
+                key.kind = kind
+                key.id_or_name = id_or_name
+                key.is_partial = id_or_name is None
+                return key
+
+        class BulkDestSkel(Skeleton):
+            kindName = "bulkdest"
+            name = StringBone()
+
+        class BulkSrcSkel(Skeleton):
+            kindName = "bulksrc"
+            ref = RelationalBone(kind="bulkdest", refKeys=["key", "name"])
+
+        class BulkHookedSkel(Skeleton):
+            kindName = "bulkhooked"
+            ref = RelationalBone(kind="bulkdest", refKeys=["key", "name"])
+
+            @classmethod
+            def postSavedHandler(cls, skel, key, dbObj):
+                pass
+
+        class BulkAdapterSkel(Skeleton):
+            kindName = "bulkadapter"
+            database_adapters = DatabaseAdapter()
+            ref = RelationalBone(kind="bulkdest", refKeys=["key", "name"])
+
+        BulkSrcSkel.setSystemInitialized()
+
+        cls.entity_cls = Entity
+        cls.key_cls = Key
+        cls.skel_classes = (BulkSrcSkel, BulkHookedSkel, BulkAdapterSkel)
+
+    def setUp(self):
+        from viur.core import db
+
+        patcher = mock.patch.multiple(
+            db,
+            Entity=self.entity_cls,
+            Get=mock.DEFAULT,
+            Put=mock.DEFAULT,
+            IsInTransaction=mock.Mock(return_value=True),
+        )
+        self.db = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _relation(self, kind, dest_key):
+        src_entity = self.entity_cls(self.key_cls(kind, 1), {
+            "ref": {"dest": self.entity_cls(dest_key, {"name": "old"}), "rel": None},
+            "changedate": None,
+        })
+
+        relation = self.entity_cls(self.key_cls("viur-relations", 1), {
+            "src": self.entity_cls(src_entity.key),
+            "dest": self.entity_cls(dest_key, {"name": "old"}),
+            "viur_src_kind": kind,
+            "viur_src_property": "ref",
+        })
+
+        return src_entity, relation
+
+    def test_can_update(self):
+        from viur.core.skeleton import _can_update_relations_bulk
+
+        src_skel, hooked_skel, adapter_skel = self.skel_classes
+        self.assertTrue(_can_update_relations_bulk(src_skel, src_skel.ref, "bulkdest"))
+        self.assertFalse(_can_update_relations_bulk(src_skel, src_skel.ref, "other"))
+        self.assertFalse(_can_update_relations_bulk(src_skel, src_skel.changedate, "bulkdest"))
+        self.assertFalse(_can_update_relations_bulk(hooked_skel, hooked_skel.ref, "bulkdest"))
+        self.assertFalse(_can_update_relations_bulk(adapter_skel, adapter_skel.ref, "bulkdest"))
+
+    def test_source_entity(self):
+        from viur.core.skeleton import _update_relations_bulk
+
+        dest_entity = self.entity_cls(self.key_cls("bulkdest", 1), {"name": "new"})
+        src_entity, relation = self._relation("bulksrc", dest_entity.key)
+        relation_entity = self.entity_cls(relation.key, relation)
+        self.db["Get"].return_value = [src_entity, relation_entity]
+
+        self.assertEqual(_update_relations_bulk(dest_entity, [relation]), [])
+
+        self.db["Get"].assert_called_once_with([src_entity.key, relation.key])
+        self.db["Put"].assert_called_once_with([src_entity, relation_entity])
+
+        # The referencing entity mirrors the new values, and has been changed like on a full write
+        self.assertEqual(src_entity["ref"]["dest"].key, dest_entity.key)
+        self.assertEqual(src_entity["ref"]["dest"]["name"], "new")
+        self.assertIsNotNone(src_entity["changedate"])
+        self.assertEqual(relation_entity["dest"]["name"], "new")
+
+    def test_fallback(self):
+        from viur.core.skeleton import _update_relations_bulk
+
+        dest_entity = self.entity_cls(self.key_cls("bulkdest", 1), {"name": "new"})
+        relations = [self._relation(kind, dest_entity.key)[1] for kind in ("bulkhooked", "bulkadapter")]
+
+        # These skeletons require a full write
+        self.assertEqual(_update_relations_bulk(dest_entity, relations), relations)
+        self.db["Get"].assert_not_called()
+        self.db["Put"].assert_not_called()
+
+
+class TestWriteMulti(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import StringBone, UniqueLockMethod, UniqueValue
+        from viur.core.skeleton import Skeleton
+
+        class WriteMultiSkel(Skeleton):
+            kindName = "writemulti"
+            name = StringBone(unique=UniqueValue(UniqueLockMethod.SameValue, False, "Name taken"))
+
+        cls.skel_cls = WriteMultiSkel
+        cls.lock_kind = "writemulti_name_uniquePropertyIndex"
+
+    def setUp(self):
+        self.db = FakeDatastore()
+        patcher = self.db.patch()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def lock(self, value):
+        return self.skel_cls.name._hashValueForUniquePropertyIndex(value)[0]
+
+    def skel(self, name, key=None):
+        skel = self.skel_cls()
+        skel["key"] = key
+        skel["name"] = name
+        return skel
+
+    def write_multi(self, skels, **kwargs):
+        self.db.calls.clear()
+        return self.skel_cls.write_multi(skels, update_relations=False, **kwargs)
+
+    def test_unique_locks(self):
+        skels = self.write_multi([self.skel("foo"), self.skel("bar")])
+        ids = [skel["key"].id_or_name for skel in skels]
+
+        self.assertEqual(
+            {lock: entity["references"] for lock, entity in self.db.kind(self.lock_kind).items()},
+            {self.lock("foo"): ids[0], self.lock("bar"): ids[1]},
+        )
+
+        # One chunk, one transaction: Allocate, fetch the locks, and put everything at once
+        self.assertEqual(self.db.calls, ["RunInTransaction", "AllocateIDs", "Get", "Put"])
+
+        # Swapping values within one chunk releases the old locks before claiming them again
+        self.write_multi([self.skel("bar", skels[0]["key"]), self.skel("baz", skels[1]["key"])])
+
+        self.assertEqual(
+            {lock: entity["references"] for lock, entity in self.db.kind(self.lock_kind).items()},
+            {self.lock("bar"): ids[0], self.lock("baz"): ids[1]},
+        )
+        self.assertEqual(self.db.calls, ["RunInTransaction", "Get", "Get", "Put", "Delete"])
+
+    def test_unique_conflict(self):
+        existing, = self.write_multi([self.skel("foo")])
+        entities = copy.deepcopy(self.db.entities)
+
+        # Two new skeletons claiming the same value within one chunk
+        with self.assertRaises(ValueError):
+            self.write_multi([self.skel("bar"), self.skel("bar")])
+
+        # A failure partway through the chunk rolls back all of its locks and entities
+        with self.assertRaises(ValueError):
+            self.write_multi([self.skel("baz"), self.skel("foo")])
+
+        self.assertEqual(self.db.entities, entities)
+        self.assertNotIn("Put", self.db.calls)
+
+        # Re-writing the value held by the same entity is fine
+        self.write_multi([self.skel("foo", existing["key"])])
+        self.assertEqual(self.db.kind(self.lock_kind)[self.lock("foo")]["references"], existing["key"].id_or_name)
+
+    def test_blob_locks(self):
+        skel, = self.write_multi([self.skel("foo")])
+        blob_lock_key = FakeKey("viur-blob-locks", skel["key"].id_or_name)
+
+        self.assertEqual(self.db.entities[blob_lock_key], {
+            "active_blob_references": [],
+            "old_blob_references": [],
+            "has_old_blob_references": False,
+            "is_stale": False,
+        })
+
+        with mock.patch.object(self.skel_cls, "preProcessBlobLocks", side_effect=lambda skel, locks: {"a", "b"}):
+            self.write_multi([self.skel("foo", skel["key"])])
+
+        self.assertEqual(sorted(self.db.entities[blob_lock_key]["active_blob_references"]), ["a", "b"])
+
+        # Blobs which are not referenced anymore are tracked as old references
+        with mock.patch.object(self.skel_cls, "preProcessBlobLocks", side_effect=lambda skel, locks: {"b"}):
+            self.write_multi([self.skel("foo", skel["key"])])
+
+        blob_lock = self.db.entities[blob_lock_key]
+        self.assertEqual(blob_lock["active_blob_references"], ["b"])
+        self.assertEqual(blob_lock["old_blob_references"], ["a"])
+        self.assertTrue(blob_lock["has_old_blob_references"])
+
+    def test_mixed_keys(self):
+        existing, = self.write_multi([self.skel("foo")])
+        skels = self.write_multi([self.skel("bar"), self.skel("foo", existing["key"]), self.skel("baz")])
+
+        self.assertEqual(skels[1]["key"], existing["key"])
+        self.assertEqual(len({skel["key"] for skel in skels}), 3)
+        self.assertEqual(
+            {entity["name"] for entity in self.db.kind("writemulti").values()},
+            {"foo", "bar", "baz"},
+        )
+
+        # New keys are allocated at once, the existing entities are fetched at once
+        self.assertEqual(self.db.calls, ["RunInTransaction", "AllocateIDs", "Get", "Get", "Put"])
+
+    def test_duplicate_keys(self):
+        existing, = self.write_multi([self.skel("foo")])
+        entities = copy.deepcopy(self.db.entities)
+
+        with self.assertRaises(ValueError):
+            self.write_multi([self.skel("bar", existing["key"]), self.skel("baz", existing["key"])])
+
+        self.assertEqual(self.db.entities, entities)
+
+    def test_chunk_size(self):
+        for count, transactions in ((0, 0), (2, 1), (3, 2), (4, 2), (5, 3)):
+            with self.subTest(count=count):
+                self.write_multi([self.skel(f"{count}-{i}") for i in range(count)], chunk_size=2)
+                self.assertEqual(self.db.calls.count("RunInTransaction"), transactions)
+                self.assertEqual(self.db.calls.count("Put"), transactions)
+
+        self.assertEqual(len(self.db.kind("writemulti")), 14)
+
+        # Within a transaction, all chunks are written into that transaction
+        from viur.core import db
+        with mock.patch.object(db, "IsInTransaction", return_value=True):
+            self.write_multi([self.skel(f"txn-{i}") for i in range(5)], chunk_size=2)
+
+        self.assertEqual(self.db.calls.count("RunInTransaction"), 0)
+        self.assertEqual(self.db.calls.count("Put"), 3)
+
+
+class TestWrite(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import StringBone, UniqueLockMethod, UniqueValue
+        from viur.core.skeleton import Skeleton
+
+        class WriteSkel(Skeleton):
+            kindName = "writeskel"
+            name = StringBone(unique=UniqueValue(UniqueLockMethod.SameValue, False, "Name taken"))
+            tags = StringBone(multiple=True, unique=UniqueValue(UniqueLockMethod.SameValue, False, "Tag taken"))
+
+        cls.skel_cls = WriteSkel
+
+    def setUp(self):
+        self.db = FakeDatastore()
+        patcher = self.db.patch()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, name, tags, key=None, **kwargs):
+        skel = self.skel_cls()
+        skel["key"] = key
+        skel["name"] = name
+        skel["tags"] = tags
+
+        self.db.calls.clear()
+        return skel.write(**kwargs)
+
+    def test_datastore_calls(self):
+        skel = self.write("foo", ["a", "b", "c"], update_relations=False)
+        self.assertEqual(self.db.calls, ["RunInTransaction", "AllocateIDs", "Get", "Put"])
+
+        # The number of calls doesn't depend on the number of unique bones and values
+        self.write("bar", ["c", "d", "e", "f"], skel["key"], update_relations=False)
+        self.assertEqual(self.db.calls, ["RunInTransaction", "Get", "Get", "Put", "Delete"])
+
+        self.assertEqual(len(self.db.kind("writeskel_name_uniquePropertyIndex")), 1)
+        self.assertEqual(len(self.db.kind("writeskel_tags_uniquePropertyIndex")), 4)
+
+    def test_unique_conflict(self):
+        self.write("foo", ["a"], update_relations=False)
+        entities = copy.deepcopy(self.db.entities)
+
+        with self.assertRaises(ValueError):
+            self.write("bar", ["b", "a"], update_relations=False)
+
+        self.assertEqual(self.db.entities, entities)
+        self.assertNotIn("Put", self.db.calls)
+
+    def test_post_write(self):
+        from viur.core import conf
+
+        with (
+            mock.patch.object(self.skel_cls, "postSavedHandler") as post_saved_handler,
+            mock.patch("viur.core.skeleton.updateRelations") as update_relations,
+            mock.patch.object(conf, "skeleton_update_relations_debounce", 0),
+        ):
+            skel = self.write("foo", ["a"])
+            post_saved_handler.assert_called_once()
+            update_relations.assert_not_called()  # nothing can reference a new entity
+
+            self.write("bar", ["a"], skel["key"])
+            self.assertEqual(post_saved_handler.call_count, 2)
+            self.assertEqual(post_saved_handler.call_args.args[1], skel["key"])
+            update_relations.assert_called_once()
+            self.assertEqual(update_relations.call_args.args[0], skel["key"])
+
+            # Changes without update_relations don't trigger relation updates
+            self.write("baz", ["a"], skel["key"], update_relations=False)
+            self.assertEqual(post_saved_handler.call_count, 3)
+            update_relations.assert_called_once()
+
+
+class TestScheduleUpdateRelations(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.skeleton import processPendingRelationUpdates
+        cls.process = staticmethod(processPendingRelationUpdates)
+
+    def setUp(self):
+        from viur.core import conf
+
+        self.db = FakeDatastore()
+        self.dest_key = FakeKey("dest", 1)
+        self.marker_key = FakeKey("viur-relations-pending", str(self.dest_key))
+
+        for patcher in (
+            self.db.patch(),
+            mock.patch.object(conf, "skeleton_update_relations_debounce", 10),
+            mock.patch("viur.core.skeleton.processPendingRelationUpdates"),
+            mock.patch("viur.core.skeleton.updateRelations"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_disabled(self):
+        from viur.core.config import Conf
+        self.assertIsNone(Conf.skeleton_update_relations_debounce)
+
+    def test_merge(self):
+        from viur.core.skeleton import _schedule_update_relations, processPendingRelationUpdates
+
+        _schedule_update_relations(self.dest_key, ["name"])
+        processPendingRelationUpdates.assert_called_once_with(self.dest_key, _countdown=10)
+        self.assertEqual(self.db.entities[self.marker_key]["bones"], ["name"])
+
+        # Further edits are merged into the pending marker, without scheduling another task
+        _schedule_update_relations(self.dest_key, ["descr", "name"])
+        self.assertEqual(self.db.entities[self.marker_key]["bones"], ["descr", "name"])
+        self.assertFalse(self.db.entities[self.marker_key]["all"])
+
+        _schedule_update_relations(self.dest_key, [])
+        self.assertTrue(self.db.entities[self.marker_key]["all"])
+
+        _schedule_update_relations(self.dest_key, ["other"])
+        self.assertTrue(self.db.entities[self.marker_key]["all"])
+        processPendingRelationUpdates.assert_called_once()
+
+    def test_orphaned(self):
+        import time
+        from viur.core.skeleton import _schedule_update_relations, processPendingRelationUpdates
+
+        _schedule_update_relations(self.dest_key, ["name"])
+
+        # The task of a marker scheduled long ago has failed; the marker is replaced and the task scheduled again
+        self.db.entities[self.marker_key]["scheduled"] = time.time() - 10 - 601
+        _schedule_update_relations(self.dest_key, ["descr"])
+
+        self.assertEqual(processPendingRelationUpdates.call_count, 2)
+        self.assertEqual(self.db.entities[self.marker_key]["bones"], ["descr"])
+        self.assertGreater(self.db.entities[self.marker_key]["scheduled"], time.time() - 10)
+
+    def test_process(self):
+        from viur.core.skeleton import _schedule_update_relations, updateRelations
+
+        _schedule_update_relations(self.dest_key, ["name", "descr"])
+        self.process(self.dest_key)
+
+        # The marker is consumed, and each of the changed bones is updated
+        self.assertNotIn(self.marker_key, self.db.entities)
+        self.assertEqual([call.args[2] for call in updateRelations.call_args_list], ["name", "descr"])
+
+        # Without a marker, there's nothing to do
+        updateRelations.reset_mock()
+        self.process(self.dest_key)
+        updateRelations.assert_not_called()
+
+        # Edits of all or many bones update all relations at once
+        _schedule_update_relations(self.dest_key, [])
+        self.process(self.dest_key)
+        updateRelations.assert_called_once()
+        self.assertIsNone(updateRelations.call_args.args[2])
+
+
+class TestReadMulti(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import RelationalBone, StringBone
+        from viur.core.skeleton import Skeleton
+
+        class ReadMultiSkel(Skeleton):
+            kindName = "readmulti"
+            name = StringBone()
+
+        class ReadMultiCustomSkel(Skeleton):
+            kindName = "readmulticustom"
+            name = StringBone()
+
+            reads = []
+
+            @classmethod
+            def read(cls, skel, key=None, **kwargs):
+                cls.reads.append(key)
+                return super().read(skel, key, **kwargs)
+
+        class ReadMultiRelSkel(Skeleton):
+            kindName = "readmultirel"
+            ref = RelationalBone(kind="readmulti", refKeys=["key", "name"], multiple=True)
+
+        ReadMultiRelSkel.setSystemInitialized()
+
+        cls.skel_cls = ReadMultiSkel
+        cls.custom_skel_cls = ReadMultiCustomSkel
+        cls.rel_skel_cls = ReadMultiRelSkel
+
+    def setUp(self):
+        self.db = FakeDatastore()
+        patcher = self.db.patch()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for i, name in enumerate(("foo", "bar", "baz"), 1):
+            self.db.entities[FakeKey("readmulti", i)] = FakeEntity(FakeKey("readmulti", i), name=name)
+            self.db.entities[FakeKey("readmulticustom", i)] = FakeEntity(FakeKey("readmulticustom", i), name=name)
+
+    def test_order(self):
+        from viur.core.skeleton import SkelList
+
+        keys = [FakeKey("readmulti", 3), FakeKey("readmulti", 4), 1, FakeKey("readmulti", 3)]
+
+        for res in (self.skel_cls().read_multi(keys), SkelList.from_keys(self.skel_cls(), keys)):
+            with self.subTest(res=res):
+                self.assertEqual([skel["name"] for skel in res], ["baz", "foo", "baz"])
+                self.assertEqual(res.missing_keys, [FakeKey("readmulti", 4)])
+
+        # Duplicate keys are looked up only once, all at once
+        self.assertEqual(self.db.lookups[-1], [FakeKey("readmulti", i) for i in (3, 4, 1)])
+        self.assertEqual(self.db.calls, ["Get", "Get"])
+
+    def test_invalid_keys(self):
+        from viur.core import db
+
+        with mock.patch.object(db, "keyHelper", side_effect=ValueError):
+            res = self.skel_cls().read_multi(["invalid"])
+
+        self.assertEqual(list(res), [])
+        self.assertEqual(res.missing_keys, ["invalid"])
+        self.assertEqual(self.db.calls, [])
+
+    def test_custom_read(self):
+        self.custom_skel_cls.reads.clear()
+        res = self.custom_skel_cls().read_multi([2, 4, 1])
+
+        # Skeletons with a custom read() are read one by one
+        self.assertEqual(self.custom_skel_cls.reads, [2, 4, 1])
+        self.assertEqual([skel["name"] for skel in res], ["bar", "foo"])
+        self.assertEqual(res.missing_keys, [4])
+
+    def test_removed_relations(self):
+        from viur.core import db
+        from viur.core.bones import RelationalConsistency
+        from viur.core.skeleton import processRemovedRelations
+
+        removed_key = FakeKey("readmulti", 1)
+        src_keys = [FakeKey("readmultirel", i) for i in (1, 2)]
+
+        for src_key in src_keys:
+            self.db.entities[src_key] = FakeEntity(src_key, ref=[
+                {"dest": FakeEntity(FakeKey("readmulti", i), name="old"), "rel": None} for i in (1, 2)
+            ])
+
+        relations = [
+            FakeEntity(
+                FakeKey("viur-relations", i),
+                src=FakeEntity(src_key),
+                viur_src_kind="readmultirel",
+                viur_relational_consistency=RelationalConsistency.SetNull.value,
+            )
+            for i, src_key in enumerate(src_keys)
+        ]
+
+        query = mock.MagicMock()
+        query.filter.return_value = query.setCursor.return_value = query
+        query.run.return_value = relations
+
+        with (
+            mock.patch.object(db, "Query", return_value=query),
+            mock.patch.object(self.rel_skel_cls, "write") as write,
+        ):
+            processRemovedRelations(removed_key)
+
+        # All referencing skeletons are read at once and the removed relation is dropped
+        self.assertEqual(self.db.lookups, [src_keys])
+        self.assertEqual(write.call_count, 2)
+        for call in write.call_args_list:
+            self.assertEqual([value["dest"]["key"] for value in call.args[0]["ref"]], [FakeKey("readmulti", 2)])
+
+        # Missing referencing entities are an inconsistency
+        del self.db.entities[src_keys[1]]
+        with (
+            mock.patch.object(db, "Query", return_value=query),
+            mock.patch.object(self.rel_skel_cls, "write"),
+            self.assertRaises(ValueError),
+        ):
+            processRemovedRelations(removed_key)
@@ -0,0 +1,131 @@
+import unittest
+from unittest import mock
+
+
+class TestConditionalGet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+        from viur.core.bones import RelationalBone, StringBone
+        from viur.core.skeleton import Skeleton
+
+        class ConditionalTestSkel(Skeleton):
+            kindName = "conditionaltestskel"
+            name = StringBone()
+
+        class ConditionalRelSkel(Skeleton):
+            kindName = "conditionalrelskel"
+            ref = RelationalBone(kind="conditionaltestskel", refKeys=["key", "name"])
+
+        class Entity(dict):
+            key = None
+
+        ConditionalRelSkel.setSystemInitialized()
+
+        cls.skel_cls = ConditionalTestSkel
+        cls.rel_skel_cls = ConditionalRelSkel
+        cls.entity_cls = Entity
+
+    def setUp(self):
+        from viur.core import current
+        self.request = mock.Mock()
+        self.token = current.request.set(self.request)
+        self.module = mock.Mock()
+        self.module.render.kind = "json"
+
+    def tearDown(self):
+        from viur.core import current
+        current.request.reset(self.token)
+
+    def skel(self, key: str, changedate, **kwargs):
+        skel = self.skel_cls()
+        entity = self.entity_cls(changedate=changedate, **kwargs)
+        entity.key = key
+        skel.setEntity(entity)
+        return skel
+
+    def conditional(self, skels):
+        from viur.core.prototypes.skelmodule import SkelModule
+        self.request.conditional.reset_mock()
+        SkelModule._conditional_get(self.module, skels)
+        return self.request.conditional.call_args.args if self.request.conditional.called else None
+
+    def test_view(self):
+        import datetime
+        now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+        etag, last_modified = self.conditional(self.skel("a", now))
+        self.assertEqual(last_modified, now)
+        self.assertEqual(self.conditional(self.skel("a", now)), (etag, now))
+
+        # Any change to the entity or its relations produces another version
+        self.assertNotEqual(self.conditional(self.skel("b", now))[0], etag)
+        self.assertNotEqual(self.conditional(self.skel("a", now + datetime.timedelta(seconds=1)))[0], etag)
+        self.assertNotEqual(self.conditional(self.skel("a", now, viur={"delayedUpdateTag": 1.0}))[0], etag)
+
+        self.module.render.kind = "html"
+        self.assertIsNone(self.conditional(self.skel("a", now)))
+
+    def test_list(self):
+        import datetime
+        from viur.core.skeleton import SkelList
+        now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+        def skellist(*skels, cursor=None):
+            res = SkelList(self.skel_cls())
+            res.extend(skels)
+            res.getCursor = lambda: cursor
+            return res
+
+        later = now + datetime.timedelta(minutes=5)
+        etag, last_modified = self.conditional(skellist(self.skel("a", later), self.skel("b", now)))
+        self.assertEqual(last_modified, later)
+
+        self.assertNotEqual(self.conditional(skellist(self.skel("a", later)))[0], etag)
+        self.assertNotEqual(
+            self.conditional(skellist(self.skel("a", later), self.skel("b", now), cursor="abc"))[0], etag
+        )
+        self.assertEqual(self.conditional(skellist())[1], None)
+
+    def test_relation_update(self):
+        import datetime
+        from viur.core import db
+        from viur.core.skeleton import _update_relations_bulk
+        now = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
+
+        class Entity(dict):
+            def __init__(self, key=None, **kwargs):
+                super().__init__(**kwargs)
+                self.key = key
+                self.exclude_from_indexes = set()
+
+        class Key(str):
+            kind = "conditionaltestskel"
+            id_or_name = "a"
+            is_partial = False
+
+        dest_key = Key("a")
+        src_entity = Entity("b", changedate=now, ref={"dest": Entity(dest_key, name="old"), "rel": None})
+        relation = Entity("c", src=Entity("b"), viur_src_kind="conditionalrelskel", viur_src_property="ref")
+
+        def skel():
+            skel = self.rel_skel_cls()
+            skel.setEntity(src_entity)
+            return skel
+
+        etag, _ = self.conditional(skel())
+
+        with mock.patch.multiple(
+            db,
+            Entity=Entity,
+            Get=mock.Mock(return_value=[src_entity, relation]),
+            Put=mock.DEFAULT,
+            IsInTransaction=mock.Mock(return_value=True),
+        ):
+            _update_relations_bulk(Entity(dest_key, name="new"), [relation])
+
+        # The values mirrored from the referenced entity have changed, and so has the version of the response
+        self.assertEqual(src_entity["ref"]["dest"]["name"], "new")
+        self.assertNotEqual(self.conditional(skel())[0], etag)
@@ -0,0 +1,156 @@
+import unittest
+from unittest import mock
+
+
+class TestQueryIter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_handle_batch(self):
+        from viur.core import tasks
+
+        class CollectingIter(tasks.QueryIter):
+            handled = []
+
+            @classmethod
+            def handleEntry(cls, entry, customData):
+                if entry == "fail":
+                    raise ValueError(entry)
+                cls.handled.append(entry)
+
+            @classmethod
+            def handleError(cls, entry, customData, exception) -> bool:
+                return False
+
+        with mock.patch("time.sleep"):
+            self.assertTrue(CollectingIter.handleBatch(["a", "b"], None))
+            self.assertFalse(CollectingIter.handleBatch(["c", "fail", "d"], None))
+
+        self.assertEqual(CollectingIter.handled, ["a", "b", "c"])
+
+    def test_batch_size_and_time_budget(self):
+        from viur.core import db, tasks
+
+        class CountingIter(tasks.QueryIter):
+            batchSize = 3
+            timeBudget = 60
+            batches = []
+
+            @classmethod
+            def handleBatch(cls, entries, customData) -> bool:
+                cls.batches.append(len(entries))
+                return True
+
+        query = mock.Mock()
+        query.run.side_effect = lambda limit: ["entry"] * limit
+        query.getCursor.side_effect = ["c1", "c2", None]
+        qry_dict = {
+            "kind": "test", "srcSkel": None, "filters": {}, "orders": [], "startCursor": None, "endCursor": None,
+            "origKind": "test", "distinct": None, "classID": CountingIter.__classID__, "customData": None,
+            "totalCount": 0,
+        }
+
+        # viur.core.skeleton can't be imported within the test environment
+        with mock.patch.dict("sys.modules", {"viur.core.skeleton": mock.Mock()}), \
+                mock.patch.object(db, "Query", return_value=query), \
+                mock.patch.object(CountingIter, "_requeueStep") as requeue, \
+                mock.patch.object(CountingIter, "handleFinish") as finish:
+            CountingIter._qryStep(qry_dict)
+
+        # all three batches are processed within one step
+        self.assertEqual(CountingIter.batches, [3, 3, 3])
+        requeue.assert_not_called()
+        finish.assert_called_once_with(9, None)
+
+    def test_finish_shards(self):
+        from viur.core import db, tasks
+
+        class Entity(dict):
+            key = "b"
+
+        barriers = {"b": Entity(pending=2, totalCount=0)}
+        qry_dict = {"barrier": "b", "totalCount": 3, "customData": None}
+
+        with mock.patch.object(db, "Key", side_effect=lambda kind, name: name), \
+                mock.patch.object(db, "Get", side_effect=barriers.get), \
+                mock.patch.object(db, "Put"), \
+                mock.patch.object(db, "Delete", side_effect=barriers.pop), \
+                mock.patch.object(db, "RunInTransaction", side_effect=lambda fn: fn()), \
+                mock.patch.object(tasks.QueryIter, "handleFinish") as finish:
+            # The last shard to finish calls handleFinish with the total count of all shards
+            tasks.QueryIter._finish(qry_dict)
+            finish.assert_not_called()
+            tasks.QueryIter._finish(qry_dict | {"totalCount": 4})
+            finish.assert_called_once_with(7, None)
+
+            # A missing barrier, e.g. when a shard has been retried, is skipped
+            finish.reset_mock()
+            with self.assertLogs(level="ERROR"):
+                tasks.QueryIter._finish(qry_dict)
+
+            finish.assert_not_called()
+
+    def test_delete_multi(self):
+        from viur.core import db
+
+        with mock.patch.object(db, "Delete") as delete:
+            db.delete_multi(range(700))
+            self.assertEqual([len(call.args[0]) for call in delete.call_args_list], [300, 300, 100])
+
+            delete.reset_mock()
+            db.delete_multi([])
+            delete.assert_not_called()
+
+
+class TestLocalTaskQueue(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        from main import monkey_patch
+        monkey_patch()
+
+    def test_schedule_and_drain(self):
+        import time
+        from viur.core.tasks import LocalTaskQueue
+        queue = LocalTaskQueue("test", workers=2, max_retries=0)
+        done = []
+
+        queue.add(lambda: done.append("later"), eta=time.time() + 0.2)
+        queue.add(lambda: done.append("now"))
+
+        self.assertTrue(queue.drain(timeout=5))
+        self.assertEqual(done, ["now", "later"])
+
+    def test_named_tasks(self):
+        from viur.core.tasks import LocalTaskQueue
+        queue = LocalTaskQueue("test", workers=1, max_retries=0)
+        done = []
+
+        self.assertTrue(queue.add(lambda: done.append(1), name="unique"))
+        self.assertFalse(queue.add(lambda: done.append(2), name="unique"))
+
+        self.assertTrue(queue.drain(timeout=5))
+        self.assertEqual(done, [1])
+
+    def test_retry(self):
+        from viur.core.tasks import LocalTaskQueue, PermanentTaskFailure
+        queue = LocalTaskQueue("test", workers=1, max_retries=2)
+        attempts = []
+
+        def flaky():
+            attempts.append("flaky")
+            if len(attempts) < 3:
+                raise ValueError()
+
+        def broken():
+            attempts.append("broken")
+            raise PermanentTaskFailure()
+
+        with self.assertLogs(level="ERROR"):
+            queue.add(flaky)
+            self.assertTrue(queue.drain(timeout=5))
+            queue.add(broken)
+            self.assertTrue(queue.drain(timeout=5))
+
+        self.assertEqual(attempts, ["flaky", "flaky", "flaky", "broken"])